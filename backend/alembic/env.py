@@ -18,8 +18,11 @@ from app.models import (  # noqa: F401
     Annotation,
     ChatMessage,
     Document,
+    IngestionJob,
     ReadingSession,
     User,
+    UserDailyStats,
+    UserDocumentStats,
 )
 
 # this is the Alembic Config object, which provides
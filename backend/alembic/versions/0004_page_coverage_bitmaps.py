@@ -0,0 +1,105 @@
+"""page coverage bitmaps
+
+Moves page coverage from the per-session reading_sessions.pages_read JSON
+lists into one bitmap per (user, document) on user_document_stats. Existing
+lists are OR-ed into the bitmaps before the column is dropped; downgrading
+restores the column empty (per-session page lists are not recoverable).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 23:21:08.533310
+
+"""
+import json
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.utils.page_bitmap import bitmap_count, bitmap_or, pages_to_bitmap
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+reading_sessions = sa.table(
+    'reading_sessions',
+    sa.column('user_id', sa.String),
+    sa.column('document_id', sa.String),
+    sa.column('pages_read', sa.JSON),
+)
+
+user_document_stats = sa.table(
+    'user_document_stats',
+    sa.column('user_id', sa.String),
+    sa.column('document_id', sa.String),
+    sa.column('reading_seconds', sa.Integer),
+    sa.column('sessions', sa.Integer),
+    sa.column('scroll_events', sa.Integer),
+    sa.column('annotations_made', sa.Integer),
+    sa.column('questions_asked', sa.Integer),
+    sa.column('page_bitmap', sa.LargeBinary),
+    sa.column('pages_read', sa.Integer),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+    sa.column('updated_at', sa.DateTime(timezone=True)),
+)
+
+
+def _fold_session_pages() -> None:
+    """OR every session's pages_read list into its (user, document) bitmap"""
+    conn = op.get_bind()
+    bitmaps: dict[tuple[str, str], bytes] = {}
+    rows = conn.execute(
+        sa.select(
+            reading_sessions.c.user_id,
+            reading_sessions.c.document_id,
+            reading_sessions.c.pages_read,
+        ).where(reading_sessions.c.pages_read.is_not(None))
+    )
+    for user_id, document_id, pages in rows:
+        if isinstance(pages, str):
+            pages = json.loads(pages)
+        if pages:
+            key = (user_id, document_id)
+            bitmaps[key] = bitmap_or(bitmaps.get(key, b""), pages_to_bitmap(pages))
+
+    now = datetime.now(timezone.utc)
+    for (user_id, document_id), bitmap in bitmaps.items():
+        values = {"page_bitmap": bitmap, "pages_read": bitmap_count(bitmap), "updated_at": now}
+        updated = conn.execute(
+            user_document_stats.update()
+            .where(user_document_stats.c.user_id == user_id)
+            .where(user_document_stats.c.document_id == document_id)
+            .values(**values)
+        )
+        if updated.rowcount == 0:
+            conn.execute(user_document_stats.insert().values(
+                user_id=user_id,
+                document_id=document_id,
+                reading_seconds=0,
+                sessions=0,
+                scroll_events=0,
+                annotations_made=0,
+                questions_asked=0,
+                created_at=now,
+                **values,
+            ))
+
+
+def upgrade() -> None:
+    op.add_column('user_document_stats', sa.Column('page_bitmap', sa.LargeBinary(), server_default=sa.text("''"), nullable=False))
+    op.add_column('user_document_stats', sa.Column('pages_read', sa.Integer(), server_default='0', nullable=False))
+    _fold_session_pages()
+    with op.batch_alter_table('reading_sessions') as batch_op:
+        batch_op.drop_column('pages_read')
+
+
+def downgrade() -> None:
+    op.add_column('reading_sessions', sa.Column('pages_read', sa.JSON(), nullable=True))
+    with op.batch_alter_table('user_document_stats') as batch_op:
+        batch_op.drop_column('pages_read')
+        batch_op.drop_column('page_bitmap')
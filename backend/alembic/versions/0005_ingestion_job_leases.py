@@ -0,0 +1,32 @@
+"""ingestion job leases
+
+Adds ingestion_jobs.heartbeat_at, refreshed while a worker runs the job.
+Recovery only re-queues processing jobs whose heartbeat is older than
+INGESTION_LEASE_SECONDS, so a runner starting in one process no longer
+steals jobs that another live process is running.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 10:12:37.402518
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ingestion_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('ingestion_jobs') as batch_op:
+        batch_op.drop_column('heartbeat_at')
@@ -0,0 +1,54 @@
+"""API Dependencies"""
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.models import User
+from app.utils.security import decode_access_token
+
+security = HTTPBearer()
+
+
+def get_token_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> str:
+    """
+    Dependency resolving the user ID of a Bearer token, without a database query.
+
+    Only verifies the token; endpoints that answer from the cache alone
+    (e.g. 304 Not Modified) use it and call load_active_user() otherwise.
+
+    Raises:
+        HTTPException: 401 if the token is invalid
+    """
+    payload = decode_access_token(credentials.credentials)
+    if not payload or "user_id" not in payload:
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+    return str(payload["user_id"])
+
+
+async def load_active_user(db: AsyncSession, user_id: str) -> User:
+    """
+    Load an active user.
+
+    Raises:
+        HTTPException: 401 if the user doesn't exist or is inactive
+    """
+    user = await db.get(User, user_id)
+    if user is None or not user.is_active:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
+
+
+async def get_current_user(
+    user_id: str = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Dependency resolving the authenticated user from a Bearer token.
+
+    Raises:
+        HTTPException: 401 if the token is invalid or the user doesn't exist
+    """
+    return await load_active_user(db, user_id)
@@ -0,0 +1,13 @@
+"""API v1 Routers"""
+from fastapi import APIRouter
+
+from app.api.v1 import annotations, chat, documents, reading, stats, sync, users
+
+api_router = APIRouter()
+api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
+api_router.include_router(annotations.router, prefix="/annotations", tags=["annotations"])
+api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
+api_router.include_router(reading.router, prefix="/reading", tags=["reading"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
+api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
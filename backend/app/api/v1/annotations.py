@@ -0,0 +1,154 @@
+"""Annotation API Endpoints"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.deps import get_current_user
+from app.api.v1.documents import get_owned_document
+from app.core.conditional import (
+    REVALIDATE,
+    cache_headers,
+    check_not_modified,
+    make_etag,
+    not_modified,
+)
+from app.core.responses import model_serializer, stream_json_list
+from app.db.pagination import MAX_PAGE_SIZE, InvalidCursorError
+from app.db.session import get_db, get_read_db, get_read_session_maker
+from app.models import User
+from app.schemas.annotation import (
+    AnnotationBulkImport,
+    AnnotationBulkImportResponse,
+    AnnotationCreateRequest,
+    AnnotationImportError,
+    AnnotationPage,
+    AnnotationResponse,
+    AnnotationUpdate,
+)
+from app.services.annotation_service import (
+    annotation_state,
+    create_annotation,
+    delete_annotation,
+    export_annotations,
+    import_annotations,
+    list_annotations,
+    update_annotation,
+)
+from app.services.document_sync import sync_publisher
+
+router = APIRouter()
+
+_serialize_annotation = model_serializer(AnnotationResponse)
+
+
+@router.get("", response_model=AnnotationPage)
+async def get_annotations(
+    document_id: str,
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List the current user's annotations on a document, paginated by cursor"""
+    state = await annotation_state(db, user.id, document_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    count, last_modified = state
+    etag = make_etag("annotations", count, last_modified, cursor, limit, order)
+    matched = check_not_modified(request, etag, last_modified)
+    if matched:
+        return not_modified(matched, REVALIDATE, last_modified)
+
+    try:
+        page = await list_annotations(db, user.id, document_id, cursor, limit, order == "desc")
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    return stream_json_list(
+        page.items,
+        _serialize_annotation,
+        headers=cache_headers(etag, REVALIDATE, last_modified),
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.post("", response_model=AnnotationResponse, status_code=201)
+async def add_annotation(
+    request: AnnotationCreateRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create an annotation"""
+    await get_owned_document(db, request.document_id, user)
+    annotation = await create_annotation(db, user.id, request.document_id, request)
+    response = AnnotationResponse.model_validate(annotation)
+    sync_publisher.annotations_changed(user.id, annotation.document_id, [response.model_dump(mode="json")])
+    return response
+
+
+@router.patch("/{annotation_id}", response_model=AnnotationResponse)
+async def edit_annotation(
+    annotation_id: str,
+    changes: AnnotationUpdate,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Update an annotation's note, color, tags, type or position"""
+    annotation = await update_annotation(db, user.id, annotation_id, changes)
+    if annotation is None:
+        raise HTTPException(status_code=404, detail="Annotation not found")
+    response = AnnotationResponse.model_validate(annotation)
+    sync_publisher.annotations_changed(user.id, annotation.document_id, [response.model_dump(mode="json")])
+    return response
+
+
+@router.delete("/{annotation_id}", status_code=204)
+async def remove_annotation(
+    annotation_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delete an annotation"""
+    document_id = await delete_annotation(db, user.id, annotation_id)
+    if document_id is None:
+        raise HTTPException(status_code=404, detail="Annotation not found")
+    sync_publisher.annotations_changed(user.id, document_id, deleted=[annotation_id])
+
+
+@router.post("/bulk", response_model=AnnotationBulkImportResponse)
+async def bulk_import_annotations(
+    request: AnnotationBulkImport,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Import many annotations at once; invalid items are reported, not fatal"""
+    await get_owned_document(db, request.document_id, user)
+    result = await import_annotations(db, user.id, request.document_id, request.items)
+    if result.imported:
+        sync_publisher.annotations_reloaded(user.id, request.document_id)
+    return AnnotationBulkImportResponse(
+        imported=result.imported,
+        ids=result.ids,
+        errors=[AnnotationImportError(index=i, error=e) for i, e in result.errors],
+    )
+
+
+@router.get("/export")
+async def export_annotations_ndjson(
+    document_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_session_maker),
+):
+    """Stream the current user's annotations on a document as NDJSON"""
+    document = await get_owned_document(db, document_id, user)
+    filename = f"{document.id}-annotations.ndjson"
+    return StreamingResponse(
+        export_annotations(session_maker, user.id, document_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,37 @@
+"""Chat API Endpoints"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.api.v1.documents import get_owned_document
+from app.core.responses import model_serializer, stream_json_list
+from app.db.pagination import MAX_PAGE_SIZE, InvalidCursorError
+from app.db.session import get_read_db
+from app.models import User
+from app.schemas.chat import ChatHistoryPage, ChatMessageResponse
+from app.services.chat_service import list_chat_history
+
+router = APIRouter()
+
+_serialize_message = model_serializer(ChatMessageResponse)
+
+
+@router.get("/history", response_model=ChatHistoryPage)
+async def get_chat_history(
+    document_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List the current user's chat history on a document, newest first by default"""
+    await get_owned_document(db, document_id, user)
+    try:
+        page = await list_chat_history(db, document_id, user.id, cursor, limit, order == "desc")
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    return stream_json_list(page.items, _serialize_message, next_cursor=page.next_cursor)
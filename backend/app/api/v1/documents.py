@@ -0,0 +1,429 @@
+"""Document API Endpoints"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_token_user_id, load_active_user
+from app.core.cache import CacheManager, get_cache
+from app.core.conditional import (
+    IMMUTABLE,
+    NO_STORE,
+    REVALIDATE,
+    cache_headers,
+    check_not_modified,
+    get_cached_content_version,
+    make_etag,
+    match_etag,
+    not_modified,
+    remember_content_version,
+)
+from app.core.config import settings
+from app.core.responses import model_serializer, stream_json_list
+from app.db.loading import load_profile
+from app.db.pagination import MAX_PAGE_SIZE, InvalidCursorError, keyset_paginate
+from app.db.session import get_db, get_read_db
+from app.models import AISummary, Annotation, Document, User
+from app.models.document import content_version
+from app.schemas.document import (
+    DocumentCard,
+    DocumentCardPage,
+    DocumentDetail,
+    DocumentPages,
+    DocumentStatusResponse,
+    DocumentUploadResponse,
+    ProcessingProgress,
+    SummaryResponse,
+)
+from app.tasks.progress import TERMINAL_STATUSES, progress_channel, progress_key
+from app.tasks.queue import enqueue_document_processing
+from app.utils.file_storage import file_storage
+from app.utils.file_validation import TEXT_EXTENSIONS, sanitize_filename, validate_file
+from app.utils.ids import generate_id
+from app.utils.text_encoding import TextEncodingError, TextNormalizer
+
+router = APIRouter()
+
+_serialize_summary = model_serializer(SummaryResponse)
+
+
+async def get_owned_document(
+    db: AsyncSession,
+    document_id: str,
+    user: User,
+    profile: str = "document_card",
+) -> Document:
+    """
+    Load a document owned by the user.
+
+    Args:
+        db: Database session
+        document_id: Document ID
+        user: Current user
+        profile: Load profile (see app.db.loading); the default skips parsed_content
+
+    Raises:
+        HTTPException: 404 if the document doesn't exist or belongs to another user
+    """
+    document = await db.scalar(
+        select(Document)
+        .where(Document.id == document_id, Document.user_id == user.id)
+        .options(*load_profile(profile))
+    )
+    if document is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return document
+
+
+@router.get("", response_model=DocumentCardPage)
+async def list_documents(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List the current user's documents, most recently active first"""
+    stmt = (
+        select(Document)
+        .where(Document.user_id == user.id)
+        .options(*load_profile("document_card"))
+    )
+    try:
+        page = await keyset_paginate(
+            db, stmt, [Document.updated_at, Document.id], cursor, limit, descending=True
+        )
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    return DocumentCardPage(
+        items=[DocumentCard.model_validate(d) for d in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.post("", response_model=DocumentUploadResponse, status_code=202)
+async def upload_document(
+    file: UploadFile = File(...),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Upload a document; parsing and indexing run in the background"""
+    info = await validate_file(file)
+    # Text is stored as canonical UTF-8 (transcoded while it is written)
+    normalizer = TextNormalizer() if info["extension"] in TEXT_EXTENSIONS else None
+    try:
+        stored = await file_storage.save_file(file, normalizer)
+    except TextEncodingError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    document = Document(
+        id=generate_id("doc"),
+        user_id=user.id,
+        title=Path(sanitize_filename(info["filename"])).stem,
+        file_path=stored["file_path"],
+        file_hash=stored["file_hash"],
+        file_size=stored["file_size"],
+        file_type=info["extension"].lstrip("."),
+        processing_status="pending",
+    )
+    db.add(document)
+    await db.commit()
+
+    try:
+        task_id = await enqueue_document_processing(document.id)
+    except Exception as error:
+        document.processing_status = "failed"
+        document.processing_error = f"Failed to queue document for processing: {error}"
+        await db.commit()
+        raise HTTPException(status_code=503, detail="Document processing is unavailable")
+
+    return DocumentUploadResponse(
+        document_id=document.id,
+        title=document.title,
+        file_hash=document.file_hash,
+        status=document.processing_status,
+        task_id=task_id,
+    )
+
+
+def _reader_validators(
+    updated_at: datetime,
+    annotations: int,
+    annotations_updated: Optional[datetime],
+    summaries: int,
+    summaries_updated: Optional[datetime],
+) -> tuple[str, datetime]:
+    """ETag and Last-Modified of the reader view of a document"""
+    etag = make_etag(
+        "document", updated_at, annotations, annotations_updated, summaries, summaries_updated
+    )
+    last_modified = max(t for t in (updated_at, annotations_updated, summaries_updated) if t)
+    return etag, last_modified
+
+
+async def _reader_state(db: AsyncSession, document_id: str, user: User) -> tuple[str, datetime]:
+    """Validators of the reader view in one aggregate query, without loading it"""
+    def aggregate(model, column):
+        return (
+            select(column)
+            .where(model.document_id == Document.id)
+            .correlate(Document)
+            .scalar_subquery()
+        )
+
+    state = (await db.execute(
+        select(
+            Document.updated_at,
+            aggregate(Annotation, func.count(Annotation.id)),
+            aggregate(Annotation, func.max(Annotation.updated_at)),
+            aggregate(AISummary, func.count(AISummary.id)),
+            aggregate(AISummary, func.max(AISummary.updated_at)),
+        ).where(Document.id == document_id, Document.user_id == user.id)
+    )).one_or_none()
+    if state is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return _reader_validators(*state)
+
+
+@router.get("/{document_id}", response_model=DocumentDetail)
+async def get_document(
+    document_id: str,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Open a document in the reader, with its annotations and summaries"""
+    if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+        etag, last_modified = await _reader_state(db, document_id, user)
+        matched = check_not_modified(request, etag, last_modified)
+        if matched:
+            return not_modified(matched, REVALIDATE, last_modified)
+
+    document = await get_owned_document(db, document_id, user, profile="document_reader")
+    etag, last_modified = _reader_validators(
+        document.updated_at,
+        len(document.annotations),
+        max((a.updated_at for a in document.annotations), default=None),
+        len(document.ai_summaries),
+        max((s.updated_at for s in document.ai_summaries), default=None),
+    )
+    return Response(
+        DocumentDetail.model_validate(document).model_dump_json(),
+        media_type="application/json",
+        headers=cache_headers(etag, REVALIDATE, last_modified),
+    )
+
+
+async def _content_not_modified(
+    request: Request,
+    cache: CacheManager,
+    document_id: str,
+    user_id: str,
+    version: Optional[str],
+    *etag_parts,
+) -> Optional[Response]:
+    """
+    Answer a conditional request for versioned content from the cache alone.
+
+    Content version and owner are cached in Redis when the content is first
+    served, so a matching If-None-Match costs no database query.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    current = await get_cached_content_version(cache, document_id, user_id)
+    if current is None or version not in (None, current):
+        return None
+    matched = match_etag(if_none_match, make_etag(*etag_parts, current))
+    if matched:
+        return not_modified(matched, IMMUTABLE if version else REVALIDATE)
+    return None
+
+
+async def _content_headers(
+    request: Request,
+    cache: CacheManager,
+    document: Any,
+    user_id: str,
+    version: Optional[str],
+    *etag_parts,
+) -> tuple[Optional[Response], dict[str, str]]:
+    """
+    Validate the requested content version and build caching headers.
+
+    Returns:
+        (304 response or None, headers for the full response)
+
+    Raises:
+        HTTPException: 409 if the requested version is no longer current
+    """
+    current = content_version(document.file_hash, document.parse_version, document.processing_status)
+    if version is not None and version != current:
+        raise HTTPException(status_code=409, detail="Content version is no longer current")
+    if current is None:
+        return None, {"Cache-Control": NO_STORE}
+
+    await remember_content_version(cache, document.id, user_id, current)
+    etag = make_etag(*etag_parts, current)
+    cache_control = IMMUTABLE if version else REVALIDATE
+    matched = match_etag(request.headers.get("if-none-match"), etag)
+    if matched:
+        return not_modified(matched, cache_control), {}
+    return None, cache_headers(etag, cache_control)
+
+
+@router.get("/{document_id}/pages", response_model=DocumentPages)
+async def get_document_pages(
+    document_id: str,
+    request: Request,
+    start: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    version: Optional[str] = Query(None, description="content_version; makes the response immutable"),
+    user_id: str = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_read_db),
+    cache: CacheManager = Depends(get_cache),
+):
+    """Read a range of parsed pages, starting at page `start` (1-based)"""
+    cached = await _content_not_modified(request, cache, document_id, user_id, version, "pages", start, limit)
+    if cached is not None:
+        return cached
+
+    user = await load_active_user(db, user_id)
+    document = (await db.execute(
+        select(
+            Document.id,
+            Document.file_hash,
+            Document.parse_version,
+            Document.processing_status,
+            Document.parsed_content,
+        ).where(Document.id == document_id, Document.user_id == user.id)
+    )).one_or_none()
+    if document is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if document.parsed_content is None:
+        raise HTTPException(status_code=409, detail="Document has not been processed yet")
+
+    response, headers = await _content_headers(
+        request, cache, document, user_id, version, "pages", start, limit
+    )
+    if response is not None:
+        return response
+
+    pages = document.parsed_content.get("pages", [])
+    end = min(start - 1 + limit, len(pages))
+    return stream_json_list(
+        ({"number": number, "text": pages[number - 1]} for number in range(start, end + 1)),
+        headers=headers,
+        document_id=document_id,
+        page_count=len(pages),
+        next_start=end + 1 if end < len(pages) else None,
+    )
+
+
+@router.get("/{document_id}/summaries", response_model=list[SummaryResponse])
+async def list_document_summaries(
+    document_id: str,
+    request: Request,
+    version: Optional[str] = Query(None, description="content_version; makes the response immutable"),
+    user_id: str = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_read_db),
+    cache: CacheManager = Depends(get_cache),
+):
+    """List the AI summaries of a document with their structured content"""
+    cached = await _content_not_modified(request, cache, document_id, user_id, version, "summaries")
+    if cached is not None:
+        return cached
+
+    user = await load_active_user(db, user_id)
+    document = await get_owned_document(db, document_id, user)
+    response, headers = await _content_headers(request, cache, document, user_id, version, "summaries")
+    if response is not None:
+        return response
+
+    summaries = (await db.scalars(
+        select(AISummary)
+        .where(AISummary.document_id == document_id)
+        .order_by(AISummary.created_at, AISummary.id)
+    )).all()
+    return stream_json_list(summaries, _serialize_summary, key=None, headers=headers)
+
+
+@router.get("/{document_id}/status", response_model=DocumentStatusResponse)
+async def get_document_status(
+    document_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: CacheManager = Depends(get_cache),
+):
+    """Get the processing status and latest progress of a document"""
+    document = await get_owned_document(db, document_id, user)
+
+    progress = None
+    if document.processing_status == "processing":
+        event = await cache.get_json(progress_key(document_id))
+        if event:
+            progress = ProcessingProgress(**event)
+
+    return DocumentStatusResponse(
+        document_id=document.id,
+        status=document.processing_status,
+        error=document.processing_error,
+        page_count=document.page_count,
+        is_indexed=document.is_indexed,
+        progress=progress,
+    )
+
+
+@router.get("/{document_id}/progress")
+async def stream_document_progress(
+    document_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: CacheManager = Depends(get_cache),
+):
+    """Stream ingestion progress as Server-Sent Events until processing ends"""
+    document = await get_owned_document(db, document_id, user)
+    status = document.processing_status
+    error = document.processing_error
+
+    async def events():
+        if status in TERMINAL_STATUSES:
+            event = {"document_id": document_id, "status": status, "message": error}
+            yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+            return
+
+        pubsub = cache.redis.pubsub()
+        # Subscribe before reading the snapshot so no event falls in between
+        await pubsub.subscribe(progress_channel(document_id))
+        try:
+            snapshot = await cache.get(progress_key(document_id))
+            if snapshot:
+                yield f"data: {snapshot}\n\n"
+                if json.loads(snapshot).get("status") in TERMINAL_STATUSES:
+                    return
+
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=settings.SSE_KEEPALIVE_INTERVAL,
+                )
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {message['data']}\n\n"
+                if json.loads(message["data"]).get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
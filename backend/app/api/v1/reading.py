@@ -0,0 +1,64 @@
+"""Reading Progress API Endpoints"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.api.v1.documents import get_owned_document
+from app.db.session import get_db
+from app.models import User
+from app.schemas.reading import ProgressUpdate, ReadingSessionResponse, ReadingSessionStart
+from app.services import reading_service
+from app.services.document_sync import sync_publisher
+from app.services.progress_buffer import progress_buffer
+
+router = APIRouter()
+
+
+@router.post("/sessions", response_model=ReadingSessionResponse, status_code=201)
+async def start_reading_session(
+    request: ReadingSessionStart,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Start a reading session for a document"""
+    await get_owned_document(db, request.document_id, user)
+    return await reading_service.start_session(db, user.id, request.document_id)
+
+
+@router.post("/sessions/{session_id}/end", response_model=ReadingSessionResponse)
+async def end_reading_session(
+    session_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """End a reading session; its buffered progress is written before returning"""
+    session = await reading_service.end_session(db, user.id, session_id, progress_buffer)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Reading session not found")
+    return session
+
+
+@router.post("/progress", status_code=202)
+async def report_progress(
+    update: ProgressUpdate,
+    user: User = Depends(get_current_user),
+):
+    """
+    Report the reading position.
+
+    Updates are buffered and written in batches (see ProgressBuffer); writes
+    for documents or sessions the user doesn't own are dropped at flush time.
+    The position is also pushed to the reader's other devices (sync channels
+    are per user, so an unowned document ID reaches no one else).
+    """
+    await progress_buffer.record(
+        user.id,
+        update.document_id,
+        update.current_page,
+        scroll_position=update.scroll_position,
+        session_id=update.session_id,
+        scroll_events=update.scroll_events,
+        pages=update.pages,
+    )
+    sync_publisher.page_changed(user.id, update.document_id, update.current_page)
+    return {"status": "buffered"}
@@ -0,0 +1,40 @@
+"""Learning Statistics API Endpoints"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.api.v1.documents import get_owned_document
+from app.db.session import get_read_db
+from app.models import User
+from app.schemas.stats import DashboardResponse, PageCoverageResponse
+from app.services.stats_service import get_dashboard, get_page_coverage
+
+router = APIRouter()
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_learning_dashboard(
+    days: int = Query(30, ge=1, le=366),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get the current user's reading statistics from the rollup tables"""
+    return await get_dashboard(db, user, days)
+
+
+@router.get("/documents/{document_id}/coverage", response_model=PageCoverageResponse)
+async def get_document_coverage(
+    document_id: str,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get which pages of a document the current user has read"""
+    document = await get_owned_document(db, document_id, user)
+    coverage = await get_page_coverage(db, user.id, document)
+    return PageCoverageResponse(
+        document_id=document.id,
+        pages_read=coverage.pages_read,
+        page_count=coverage.page_count,
+        coverage=coverage.fraction,
+        unread=coverage.unread,
+    )
@@ -0,0 +1,174 @@
+"""Real-time Sync WebSocket Endpoint"""
+import asyncio
+import json
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.cache import CacheManager, get_cache
+from app.core.config import settings
+from app.db.session import get_read_session_maker
+from app.models import Document, User
+from app.services.document_sync import (
+    Subscription,
+    SyncDelta,
+    delta_frame,
+    latest_cursor,
+    parse_cursor,
+    replay,
+    sync_hub,
+)
+from app.utils.security import decode_access_token
+
+router = APIRouter()
+
+
+def _token_user_id(websocket: WebSocket, token: Optional[str]) -> Optional[str]:
+    """User ID of the socket's token (query parameter, or Authorization header)"""
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    payload = decode_access_token(token) if token else None
+    return payload.get("user_id") if payload else None
+
+
+async def _owns_document(
+    session_maker: async_sessionmaker[AsyncSession], user_id: str, document_id: str
+) -> bool:
+    async with session_maker() as db:
+        owner = await db.scalar(
+            select(Document.id)
+            .join(User, User.id == Document.user_id)
+            .where(Document.id == document_id, User.id == user_id, User.is_active.is_(True))
+        )
+    return owner is not None
+
+
+class _SocketStream:
+    """Frames of one socket, never repeated or reordered across replay and live delivery"""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        cache: CacheManager,
+        subscription: Subscription,
+        user_id: str,
+        document_id: str,
+        cursor: str,
+    ):
+        self.websocket = websocket
+        self.cache = cache
+        self.subscription = subscription
+        self.user_id = user_id
+        self.document_id = document_id
+        self.cursor = cursor
+
+    async def _send(self, frame: dict[str, Any]) -> None:
+        await self.websocket.send_text(json.dumps(frame, ensure_ascii=False))
+
+    async def resume(self, cursor: Optional[str]) -> None:
+        """Send what the client missed since its cursor (or tell it to reload)"""
+        if cursor is None:
+            await self._send({"type": "hello", "cursor": self.cursor})
+            return
+        replayed = await replay(self.cache, self.user_id, self.document_id, cursor)
+        if replayed is None:
+            # Frames since the cursor are gone: the client reloads over REST,
+            # and only frames newer than that reload are forwarded
+            self.cursor = await latest_cursor(self.cache, self.user_id, self.document_id)
+            await self._send({"type": "reset", "cursor": self.cursor})
+            return
+        self.cursor, delta = replayed
+        await self._send(delta_frame(self.cursor, delta) if delta else {"type": "hello", "cursor": self.cursor})
+
+    async def pump(self) -> None:
+        """Forward live frames, merging any that queued up into one"""
+        queue = self.subscription.queue
+        while True:
+            try:
+                frames = [await asyncio.wait_for(queue.get(), settings.SYNC_KEEPALIVE_INTERVAL)]
+            except TimeoutError:
+                frames = []
+            while not queue.empty():
+                frames.append(queue.get_nowait())
+
+            if self.subscription.overflowed:
+                # Frames were dropped: the stream has them all, in order
+                self.subscription.overflowed = False
+                await self.resume(self.cursor)
+                continue
+            if not frames:
+                await self._send({"type": "keepalive", "cursor": self.cursor})
+                continue
+
+            delta, seen = SyncDelta(), parse_cursor(self.cursor) or (0, 0)
+            for frame in frames:
+                position = parse_cursor(frame["cursor"])
+                # Malformed, or already sent by the replay that started this socket
+                if position is None or position <= seen:
+                    continue
+                delta.merge(SyncDelta.from_dict(frame))
+                self.cursor, seen = frame["cursor"], position
+            if delta:
+                await self._send(delta_frame(self.cursor, delta))
+
+
+@router.websocket("/{document_id}")
+async def sync_document(
+    websocket: WebSocket,
+    document_id: str,
+    token: Optional[str] = None,
+    cursor: Optional[str] = None,
+    cache: CacheManager = Depends(get_cache),
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_read_session_maker),
+):
+    """
+    Push a reader's annotation changes and reading position for a document.
+
+    Browsers cannot set headers on WebSockets, so the access token may be
+    passed as ?token=. Frames are JSON objects with a type:
+
+    - hello: {"cursor"} - connected; nothing to replay
+    - delta: {"cursor", "annotations", "deleted", "current_page", "reload"} -
+      changes since the previous frame (annotations as in AnnotationResponse;
+      reload: refetch the annotation list, e.g. after a bulk import)
+    - reset: {"cursor"} - frames since ?cursor= are gone; reload over REST
+    - keepalive: {"cursor"} - sent on idle connections
+
+    Reconnect with ?cursor=<last cursor> to receive the changes missed in
+    between as one delta. Messages from the client are ignored.
+    """
+    user_id = _token_user_id(websocket, token)
+    if user_id is None or not await _owns_document(session_maker, user_id, document_id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    # Subscribe before reading the stream so no frame falls in between;
+    # frames covered by the replay are skipped by cursor
+    subscription = await sync_hub.subscribe(user_id, document_id)
+    try:
+        stream = _SocketStream(
+            websocket, cache, subscription, user_id, document_id,
+            await latest_cursor(cache, user_id, document_id),
+        )
+        await stream.resume(cursor)
+
+        pump = asyncio.create_task(stream.pump())
+        receive = asyncio.create_task(_until_disconnect(websocket))
+        done, pending = await asyncio.wait({pump, receive}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        error = pump.exception() if pump in done else None
+        if error is not None and not isinstance(error, WebSocketDisconnect):
+            raise error
+    finally:
+        await sync_hub.unsubscribe(subscription)
+
+
+async def _until_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
@@ -0,0 +1,25 @@
+"""User API Endpoints"""
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.db.loading import load_profile
+from app.db.session import get_db
+from app.models import User
+from app.schemas.user import UserProfile
+
+router = APIRouter()
+
+
+@router.get("/me", response_model=UserProfile)
+async def get_me(
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the current user with reading counters and document cards"""
+    # Same session as get_current_user: the identity-mapped user gets its documents loaded
+    profile = await db.scalar(
+        select(User).where(User.id == user.id).options(*load_profile("user_dashboard"))
+    )
+    return UserProfile.model_validate(profile)
@@ -0,0 +1,303 @@
+"""Token-Budget-Aware Context Assembly for RAG Prompts"""
+import hashlib
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Sequence
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]")
+_WORD_RE = re.compile(r"[A-Za-z0-9_]+|[^\sA-Za-z0-9_]")
+
+# Tokens kept back when truncating a message, so the cut-off marker fits
+_MIN_TRUNCATED_TOKENS = 32
+
+context_tokens = metrics_registry.counter(
+    "readpilot_context_tokens",
+    "Tokens of candidate context that were packed into prompts or left out",
+    ["outcome"],
+)
+
+_encoding: Any = None
+
+
+def _load_encoding() -> Any:
+    """Load a tiktoken encoding if available (optional dependency)"""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding(settings.CONTEXT_TOKENIZER_ENCODING)
+        except Exception:
+            _encoding = False
+    return _encoding
+
+
+def preload_tokenizer() -> bool:
+    """
+    Load the tokenizer now rather than on the first prompt.
+
+    Returns:
+        True if tiktoken is available, False if token counts are estimated
+    """
+    return bool(_load_encoding())
+
+
+@lru_cache(maxsize=65536)
+def count_tokens(text: str) -> int:
+    """
+    Count prompt tokens in a text.
+
+    Uses tiktoken when installed. Otherwise estimates: one token per CJK
+    character and roughly 4/3 tokens per Latin word or punctuation mark.
+    Results are cached, so repeated chunks cost one dict lookup.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Token count
+    """
+    if not text:
+        return 0
+    encoding = _load_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    cjk = len(_CJK_RE.findall(text))
+    others = len(_WORD_RE.findall(_CJK_RE.sub(" ", text)))
+    return cjk + (others * 4 + 2) // 3
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut a text down to roughly max_tokens, keeping its beginning.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+
+    Returns:
+        Text that fits the budget, suffixed with an ellipsis if it was cut
+    """
+    total = count_tokens(text)
+    if total <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    keep = int(len(text) * max_tokens / total)
+    while keep > 0 and count_tokens(text[:keep]) + 1 > max_tokens:
+        keep = int(keep * 0.9)
+    return text[:keep].rstrip() + "…"
+
+
+@dataclass
+class ContextChunk:
+    """Candidate piece of context (document chunk or annotation)"""
+
+    id: str
+    text: str
+    score: float
+    page: Optional[int] = None
+    start: Optional[int] = None
+    end: Optional[int] = None
+    kind: str = "chunk"  # chunk, annotation
+    token_count: Optional[int] = None
+
+    @property
+    def tokens(self) -> int:
+        if self.token_count is None:
+            self.token_count = count_tokens(self.text)
+        return self.token_count
+
+
+@dataclass
+class HistoryTurn:
+    """Chat turn included in a prompt"""
+
+    id: str
+    role: str
+    content: str
+
+
+@dataclass
+class BuiltContext:
+    """Result of context assembly"""
+
+    chunks: list[ContextChunk] = field(default_factory=list)
+    history: list[HistoryTurn] = field(default_factory=list)
+    tokens_used: int = 0
+    tokens_candidate: int = 0
+    budget: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Candidate tokens that were left out of the prompt"""
+        return max(0, self.tokens_candidate - self.tokens_used)
+
+    def render_sources(self) -> str:
+        """Render selected chunks as numbered source blocks"""
+        blocks = []
+        for index, chunk in enumerate(self.chunks, start=1):
+            label = f"[{index}]"
+            if chunk.page is not None:
+                label += f" (page {chunk.page})"
+            if chunk.kind == "annotation":
+                label += " (reader note)"
+            blocks.append(f"{label}\n{chunk.text}")
+        return "\n\n".join(blocks)
+
+
+def thread_history(messages: Iterable[Any], leaf_id: Optional[str] = None) -> list[Any]:
+    """
+    Extract one conversation thread by following ChatMessage.parent_id links.
+
+    Args:
+        messages: ChatMessage rows (or objects with id/parent_id) of a document
+        leaf_id: Message to walk back from (defaults to the last message)
+
+    Returns:
+        Messages from the thread root to the leaf, oldest first
+    """
+    by_id = {message.id: message for message in messages}
+    if not by_id:
+        return []
+    if leaf_id is None:
+        leaf_id = list(by_id)[-1]
+
+    thread = []
+    seen = set()
+    current = by_id.get(leaf_id)
+    while current is not None and current.id not in seen:
+        seen.add(current.id)
+        thread.append(current)
+        current = by_id.get(current.parent_id) if current.parent_id else None
+    thread.reverse()
+    return thread
+
+
+def _overlap_ratio(a: ContextChunk, b: ContextChunk) -> float:
+    """Fraction of the shorter chunk covered by the other (same page only)"""
+    if a.page != b.page:
+        return 0.0
+    a_start, a_end, b_start, b_end = a.start, a.end, b.start, b.end
+    if a_start is None or a_end is None or b_start is None or b_end is None:
+        return 0.0
+    overlap = min(a_end, b_end) - max(a_start, b_start)
+    shorter = min(a_end - a_start, b_end - b_start)
+    if overlap <= 0 or shorter <= 0:
+        return 0.0
+    return overlap / shorter
+
+
+class ContextBuilder:
+    """
+    Pack chunks, annotations and chat history into a prompt token budget.
+
+    History gets up to a share of the budget, newest turns first. Chunks are
+    deduplicated (identical text or overlapping ranges on the same page) and
+    then chosen greedily by relevance per token until the budget is spent.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = settings.CONTEXT_MAX_TOKENS,
+        reserved_tokens: int = settings.CONTEXT_RESERVED_TOKENS,
+        history_ratio: float = settings.CONTEXT_HISTORY_RATIO,
+        overlap_threshold: float = 0.5,
+    ):
+        self.max_tokens = max_tokens
+        self.reserved_tokens = reserved_tokens
+        self.history_ratio = history_ratio
+        self.overlap_threshold = overlap_threshold
+
+    def _dedupe(self, chunks: Sequence[ContextChunk]) -> list[ContextChunk]:
+        kept: list[ContextChunk] = []
+        seen_text: set[str] = set()
+        for chunk in sorted(chunks, key=lambda c: c.score, reverse=True):
+            digest = hashlib.sha1(" ".join(chunk.text.split()).encode("utf-8")).hexdigest()
+            if digest in seen_text:
+                continue
+            if any(_overlap_ratio(chunk, other) > self.overlap_threshold for other in kept):
+                continue
+            seen_text.add(digest)
+            kept.append(chunk)
+        return kept
+
+    def _select_history(self, turns: Sequence[Any], budget: int) -> tuple[list[HistoryTurn], int]:
+        selected: list[HistoryTurn] = []
+        used = 0
+        for turn in reversed(turns):
+            tokens = count_tokens(turn.content)
+            if used + tokens <= budget:
+                selected.append(HistoryTurn(turn.id, turn.role, turn.content))
+                used += tokens
+                continue
+            remaining = budget - used
+            if remaining >= _MIN_TRUNCATED_TOKENS:
+                content = truncate_to_tokens(turn.content, remaining)
+                selected.append(HistoryTurn(turn.id, turn.role, content))
+                used += count_tokens(content)
+            break
+        selected.reverse()
+        return selected, used
+
+    def build(
+        self,
+        question: str,
+        chunks: Sequence[ContextChunk] = (),
+        history: Sequence[Any] = (),
+        annotations: Sequence[ContextChunk] = (),
+        system_prompt: str = "",
+    ) -> BuiltContext:
+        """
+        Assemble prompt context within the token budget.
+
+        Args:
+            question: Current user question (always included)
+            chunks: Retrieved document chunks with relevance scores
+            history: Prior turns of the thread, oldest first (see thread_history)
+            annotations: Reader annotations as chunks with relevance scores
+            system_prompt: Fixed instructions included in every prompt
+
+        Returns:
+            BuiltContext with the selected chunks and history
+        """
+        fixed = count_tokens(question) + count_tokens(system_prompt)
+        budget = max(0, self.max_tokens - self.reserved_tokens - fixed)
+
+        candidates = list(chunks) + list(annotations)
+        candidate_tokens = fixed + sum(c.tokens for c in candidates)
+        candidate_tokens += sum(count_tokens(turn.content) for turn in history)
+
+        selected_history, history_used = self._select_history(
+            history, int(budget * self.history_ratio)
+        )
+
+        remaining = budget - history_used
+        selected: list[ContextChunk] = []
+        for chunk in sorted(
+            self._dedupe(candidates),
+            key=lambda c: c.score / max(1, c.tokens),
+            reverse=True,
+        ):
+            if chunk.tokens <= remaining:
+                selected.append(chunk)
+                remaining -= chunk.tokens
+
+        # Present sources in reading order rather than selection order
+        selected.sort(key=lambda c: (c.kind != "chunk", c.page or 0, c.start or 0))
+
+        result = BuiltContext(
+            chunks=selected,
+            history=selected_history,
+            tokens_used=fixed + history_used + sum(c.tokens for c in selected),
+            tokens_candidate=candidate_tokens,
+            budget=self.max_tokens - self.reserved_tokens,
+        )
+        context_tokens.labels(outcome="used").inc(result.tokens_used)
+        context_tokens.labels(outcome="saved").inc(result.tokens_saved)
+        return result
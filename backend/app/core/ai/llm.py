@@ -0,0 +1,132 @@
+"""LLM Provider Gateway"""
+from typing import Any, Optional
+
+import httpx
+
+from app.core.config import settings
+
+ANTHROPIC_BASE_URL = "https://api.anthropic.com/v1"
+ANTHROPIC_VERSION = "2023-06-01"
+
+
+class LLMError(Exception):
+    """Provider request failure, carrying what the scheduler's retry policy reads"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+class LLMClient:
+    """
+    Completion and embedding calls against the configured providers.
+
+    OpenAI and Ollama are called through the OpenAI-compatible REST API,
+    Anthropic through its Messages API (it has no embedding endpoint). Calls
+    are not scheduled here; callers submit them to the LLMScheduler.
+    """
+
+    def __init__(
+        self,
+        provider: str = settings.LLM_PROVIDER,
+        model: str = settings.LLM_MODEL,
+        embedding_provider: str = settings.EMBEDDING_PROVIDER,
+        embedding_model: str = settings.EMBEDDING_MODEL,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Raises:
+            RuntimeError: If a provider is unknown or its API key is not set
+        """
+        self.provider = provider
+        self.model = model
+        self.embedding_provider = embedding_provider
+        self.embedding_model = embedding_model
+        self.http = http_client or httpx.AsyncClient(timeout=settings.LLM_REQUEST_TIMEOUT)
+        # Fail at build time, not on the first document
+        self._endpoint(provider)
+        if embedding_provider == "anthropic":
+            raise RuntimeError("Anthropic has no embedding API; set EMBEDDING_PROVIDER")
+        self._endpoint(embedding_provider)
+
+    @staticmethod
+    def _endpoint(provider: str) -> tuple[str, dict[str, str]]:
+        """Base URL and auth headers of a provider"""
+        if provider == "openai":
+            if not settings.OPENAI_API_KEY:
+                raise RuntimeError("OPENAI_API_KEY is not set")
+            return settings.OPENAI_BASE_URL, {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+        if provider == "anthropic":
+            if not settings.ANTHROPIC_API_KEY:
+                raise RuntimeError("ANTHROPIC_API_KEY is not set")
+            return ANTHROPIC_BASE_URL, {
+                "x-api-key": settings.ANTHROPIC_API_KEY,
+                "anthropic-version": ANTHROPIC_VERSION,
+            }
+        if provider == "ollama":
+            return settings.OLLAMA_BASE_URL, {}
+        raise RuntimeError(f"Unknown LLM provider: {provider}")
+
+    async def _post(self, provider: str, path: str, body: dict[str, Any]) -> Any:
+        base_url, headers = self._endpoint(provider)
+        response = await self.http.post(f"{base_url}{path}", json=body, headers=headers)
+        if response.status_code >= 400:
+            raise LLMError(response.status_code, response.text[:500], _retry_after(response))
+        return response.json()
+
+    async def complete(self, prompt: str) -> str:
+        """
+        Complete a single-turn prompt.
+
+        Args:
+            prompt: User prompt
+
+        Returns:
+            Completion text
+
+        Raises:
+            LLMError: If the provider rejects the request
+        """
+        messages = [{"role": "user", "content": prompt}]
+        if self.provider == "anthropic":
+            data = await self._post(self.provider, "/messages", {
+                "model": self.model,
+                "max_tokens": settings.LLM_MAX_OUTPUT_TOKENS,
+                "messages": messages,
+            })
+            return "".join(block.get("text", "") for block in data["content"])
+
+        data = await self._post(self.provider, "/chat/completions", {
+            "model": self.model,
+            "max_tokens": settings.LLM_MAX_OUTPUT_TOKENS,
+            "messages": messages,
+        })
+        return str(data["choices"][0]["message"]["content"] or "")
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed texts with the embedding model.
+
+        Args:
+            texts: Texts to embed (one request)
+
+        Returns:
+            One vector per text, in order
+
+        Raises:
+            LLMError: If the provider rejects the request
+        """
+        data = await self._post(self.embedding_provider, "/embeddings", {
+            "model": self.embedding_model,
+            "input": texts,
+        })
+        rows = sorted(data["data"], key=lambda row: row["index"])
+        return [[float(x) for x in row["embedding"]] for row in rows]
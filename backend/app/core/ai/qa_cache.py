@@ -0,0 +1,327 @@
+"""Semantic Answer Cache for Document Q&A"""
+import hashlib
+import json
+import math
+import re
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional, Sequence, cast
+
+from app.core.cache import CacheManager
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+# Async function turning a question into an embedding vector
+EmbedFunc = Callable[[str], Awaitable[Sequence[float]]]
+
+# Async function producing (answer, sources) on a cache miss
+ComputeFunc = Callable[[], Awaitable[tuple[str, list]]]
+
+_TRAILING_PUNCTUATION = "?？!！.。,，;；:：~～ "
+_WHITESPACE_RE = re.compile(r"\s+")
+
+qa_cache_lookups = metrics_registry.counter(
+    "readpilot_qa_cache_lookups",
+    "Semantic Q&A cache lookups by result",
+    ["result"],
+)
+qa_cache_similarity = metrics_registry.histogram(
+    "readpilot_qa_cache_similarity",
+    "Best cosine similarity seen on semantic Q&A cache lookups",
+    buckets=(0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.92, 0.95, 0.98, 1.0),
+)
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question so trivially different phrasings share a key.
+
+    Args:
+        question: Raw user question
+
+    Returns:
+        Case-folded, whitespace-collapsed question without trailing punctuation
+    """
+    text = unicodedata.normalize("NFKC", question).casefold()
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return text.rstrip(_TRAILING_PUNCTUATION)
+
+
+def _unit_vector(vector: Sequence[float]) -> list[float]:
+    """Scale a vector to unit length so cosine similarity is a dot product"""
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return [0.0] * len(vector)
+    return [x / norm for x in vector]
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+@dataclass
+class CachedAnswer:
+    """Answer served from the semantic cache"""
+
+    answer: str
+    sources: list = field(default_factory=list)
+    question: str = ""
+    similarity: float = 1.0
+
+
+@dataclass
+class QACacheStats:
+    """Hit/miss counters for a cache instance"""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SemanticAnswerCache:
+    """
+    Q&A cache keyed by (document file hash, parse version, question embedding).
+
+    Entries for one document parse version live in a single Redis hash. A
+    lookup first fetches the field of the normalized question (an exact match
+    skips the embedding call entirely), then on a miss reads the whole hash
+    for an in-process similarity scan: at most two round trips. A sorted set
+    beside the hash records when each entry was last served, and inserting
+    past max_entries drops the least recently used ones, so the scan is
+    bounded by max_entries however many questions a document gets.
+    """
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        embed: EmbedFunc,
+        threshold: float = settings.QA_CACHE_SIMILARITY_THRESHOLD,
+        expire: int = settings.QA_CACHE_TTL,
+        max_entries: int = settings.QA_CACHE_MAX_ENTRIES,
+        enabled: bool = settings.QA_CACHE_ENABLED,
+    ):
+        self.cache = cache
+        self.embed = embed
+        self.threshold = threshold
+        self.expire = expire
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.stats = QACacheStats()
+
+    @staticmethod
+    def _entries_key(file_hash: str, parse_version: int) -> str:
+        return f"qa:{file_hash}:v{parse_version}"
+
+    @staticmethod
+    def _usage_key(entries_key: str) -> str:
+        return f"{entries_key}:lru"
+
+    @staticmethod
+    def _version_key(file_hash: str) -> str:
+        return f"qa:{file_hash}:version"
+
+    @staticmethod
+    def _field(normalized_question: str) -> str:
+        return hashlib.sha1(normalized_question.encode("utf-8")).hexdigest()
+
+    async def _touch(self, key: str, field: str) -> None:
+        """Mark an entry as just served (only if it is still tracked)"""
+        await self.cache.redis.zadd(self._usage_key(key), {field: time.time()}, xx=True)
+
+    def _record(self, hit: bool, similarity: Optional[float] = None) -> None:
+        if hit:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        qa_cache_lookups.labels(result="hit" if hit else "miss").inc()
+        if similarity is not None:
+            qa_cache_similarity.observe(similarity)
+
+    async def lookup(
+        self,
+        file_hash: str,
+        parse_version: int,
+        question: str,
+        embedding: Optional[Sequence[float]] = None,
+    ) -> Optional[CachedAnswer]:
+        """
+        Find a cached answer for a question about a document.
+
+        Args:
+            file_hash: SHA-256 hash of the document file
+            parse_version: Document parse version the answer was derived from
+            question: User question
+            embedding: Precomputed question embedding (computed if omitted)
+
+        Returns:
+            CachedAnswer if a similar enough question was answered before, else None
+        """
+        if not self.enabled:
+            return None
+        cached, _ = await self._lookup(file_hash, parse_version, question, embedding)
+        return cached
+
+    async def _lookup(
+        self,
+        file_hash: str,
+        parse_version: int,
+        question: str,
+        embedding: Optional[Sequence[float]] = None,
+    ) -> tuple[Optional[CachedAnswer], Optional[Sequence[float]]]:
+        """Look up a question, also returning the embedding if one was computed"""
+        key = self._entries_key(file_hash, parse_version)
+        normalized = normalize_question(question)
+
+        # Exact match on the normalized question: no embedding needed
+        exact_field = self._field(normalized)
+        raw = await self.cache.redis.hget(key, exact_field)
+        if raw is not None:
+            entry = json.loads(raw)
+            await self._touch(key, exact_field)
+            self._record(True, 1.0)
+            return CachedAnswer(entry["a"], entry.get("s") or [], entry["q"], 1.0), embedding
+
+        entries = await self.cache.redis.hgetall(key)
+        if not entries:
+            self._record(False)
+            return None, embedding
+
+        if embedding is None:
+            embedding = await self.embed(normalized)
+        vector = _unit_vector(embedding)
+
+        best: Optional[dict] = None
+        best_field = ""
+        best_score = -1.0
+        for name, raw in entries.items():
+            entry = json.loads(raw)
+            score = _dot(vector, entry["e"])
+            if score > best_score:
+                best, best_field, best_score = entry, str(name), score
+
+        if best is None or best_score < self.threshold:
+            self._record(False, best_score if best is not None else None)
+            return None, embedding
+
+        await self._touch(key, best_field)
+        self._record(True, best_score)
+        return CachedAnswer(best["a"], best.get("s") or [], best["q"], best_score), embedding
+
+    async def store(
+        self,
+        file_hash: str,
+        parse_version: int,
+        question: str,
+        answer: str,
+        sources: Optional[list] = None,
+        embedding: Optional[Sequence[float]] = None,
+    ) -> None:
+        """
+        Store an answer for a question about a document.
+
+        Storing under a new parse version drops all entries of the previous
+        one; storing past max_entries drops the least recently used entries.
+
+        Args:
+            file_hash: SHA-256 hash of the document file
+            parse_version: Document parse version the answer was derived from
+            question: User question
+            answer: LLM answer text
+            sources: Source references attached to the answer
+            embedding: Precomputed question embedding (computed if omitted)
+        """
+        if not self.enabled:
+            return
+
+        normalized = normalize_question(question)
+        if embedding is None:
+            embedding = await self.embed(normalized)
+
+        key = self._entries_key(file_hash, parse_version)
+        usage_key = self._usage_key(key)
+        version_key = self._version_key(file_hash)
+
+        previous = await self.cache.get(version_key)
+        if previous is not None and previous != str(parse_version):
+            previous_key = self._entries_key(file_hash, int(previous))
+            await self.cache.redis.delete(previous_key, self._usage_key(previous_key))
+
+        now = time.time()
+        entry = {
+            "q": question,
+            "e": _unit_vector(embedding),
+            "a": answer,
+            "s": sources or [],
+            "t": now,
+        }
+
+        field_name = self._field(normalized)
+        async with self.cache.redis.pipeline() as pipe:
+            pipe.hset(key, field_name, json.dumps(entry, ensure_ascii=False))
+            pipe.zadd(usage_key, {field_name: now})
+            pipe.expire(key, self.expire)
+            pipe.expire(usage_key, self.expire)
+            pipe.setex(version_key, self.expire, str(parse_version))
+            pipe.zcard(usage_key)
+            results = await pipe.execute()
+
+        overflow = results[-1] - self.max_entries
+        if overflow > 0:
+            await self._evict_least_recent(key, overflow)
+
+    async def _evict_least_recent(self, key: str, count: int) -> None:
+        """Drop the least recently served entries of a document"""
+        # (member, score) pairs; the client decodes responses to str
+        popped = cast(
+            list[tuple[str, float]],
+            await self.cache.redis.zpopmin(self._usage_key(key), count),
+        )
+        stale = [name for name, _ in popped]
+        if stale:
+            await self.cache.redis.hdel(key, *stale)
+
+    async def get_or_compute(
+        self,
+        file_hash: str,
+        parse_version: int,
+        question: str,
+        compute: ComputeFunc,
+    ) -> tuple[CachedAnswer, bool]:
+        """
+        Serve an answer from cache, or compute and cache it on a miss.
+
+        Args:
+            file_hash: SHA-256 hash of the document file
+            parse_version: Document parse version
+            question: User question
+            compute: Async function calling the LLM, returning (answer, sources)
+
+        Returns:
+            Tuple of (answer, cache_hit)
+        """
+        embedding = None
+        if self.enabled:
+            cached, embedding = await self._lookup(file_hash, parse_version, question)
+            if cached is not None:
+                return cached, True
+
+        answer, sources = await compute()
+        await self.store(file_hash, parse_version, question, answer, sources, embedding)
+        return CachedAnswer(answer, sources or [], question, 1.0), False
+
+    async def invalidate(self, file_hash: str) -> int:
+        """
+        Drop every cached answer for a document.
+
+        Args:
+            file_hash: SHA-256 hash of the document file
+
+        Returns:
+            Number of keys deleted
+        """
+        return await self.cache.clear_pattern(f"qa:{file_hash}:*")
@@ -0,0 +1,350 @@
+"""LLM Request Scheduler"""
+import asyncio
+import hashlib
+import heapq
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying (rate limited / transient server errors)
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+llm_queue_wait = metrics_registry.histogram(
+    "readpilot_llm_queue_wait_seconds",
+    "Time LLM requests spend waiting for a concurrency slot and rate limit budget",
+    ["provider", "priority"],
+)
+llm_queue_depth = metrics_registry.gauge(
+    "readpilot_llm_queue_depth",
+    "LLM requests waiting for a concurrency slot",
+    ["provider"],
+)
+llm_requests = metrics_registry.counter(
+    "readpilot_llm_requests",
+    "LLM requests by outcome (success, error, retry, coalesced)",
+    ["provider", "outcome"],
+)
+
+
+class Priority(IntEnum):
+    """Scheduling lanes; lower values are served first"""
+
+    INTERACTIVE = 0  # chat / Q&A with a user waiting
+    BACKGROUND = 1  # ingestion-time AISummary generation
+
+
+@dataclass
+class ProviderLimits:
+    """Rate and concurrency limits for one LLM provider"""
+
+    requests_per_minute: int = settings.LLM_REQUESTS_PER_MINUTE
+    tokens_per_minute: int = settings.LLM_TOKENS_PER_MINUTE
+    max_concurrency: int = settings.LLM_MAX_CONCURRENCY
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+
+    Waiters are served by priority, then in arrival order: only the first in
+    line takes tokens, so large requests are not starved by small ones and
+    interactive requests never queue behind background ones.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(rate_per_minute)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int]] = []  # heap of (priority, arrival)
+        self._counter = itertools.count()
+        self._head_changed = asyncio.Event()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _leave(self, ticket: tuple[int, int]) -> None:
+        was_head = self._waiters[0] == ticket
+        self._waiters.remove(ticket)
+        heapq.heapify(self._waiters)
+        if was_head:
+            # Wake the others so the next in line starts waiting for its tokens
+            self._head_changed.set()
+            self._head_changed = asyncio.Event()
+
+    async def acquire(self, amount: float = 1.0, priority: int = 0) -> None:
+        """
+        Wait until the bucket holds enough tokens, then take them.
+
+        Args:
+            amount: Number of tokens to take (capped at bucket capacity)
+            priority: Lower values are served first (see Priority)
+        """
+        if self.rate <= 0 or amount <= 0:
+            return
+        amount = min(amount, self.capacity)
+
+        ticket = (int(priority), next(self._counter))
+        heapq.heappush(self._waiters, ticket)
+        try:
+            while True:
+                self._refill()
+                if self._waiters[0] != ticket:
+                    await self._head_changed.wait()
+                    continue
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                # A higher priority arrival may take the head while we sleep
+                try:
+                    await asyncio.wait_for(
+                        self._head_changed.wait(), (amount - self.tokens) / self.rate
+                    )
+                except TimeoutError:
+                    pass
+        finally:
+            self._leave(ticket)
+
+
+class _PriorityGate:
+    """Concurrency limiter that hands out free slots by priority, then FIFO"""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: Priority) -> None:
+        if self.active < self.max_concurrency and not self.waiting:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Slot was granted just before cancellation: pass it on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+                return
+
+
+class _ProviderLane:
+    """Concurrency gate and rate limit buckets of one provider"""
+
+    def __init__(self, limits: ProviderLimits):
+        self.gate = _PriorityGate(limits.max_concurrency)
+        self.requests = TokenBucket(limits.requests_per_minute)
+        self.tokens = TokenBucket(limits.tokens_per_minute)
+
+
+@dataclass
+class _SharedCall:
+    """In-flight call shared by requests with the same coalescing key"""
+
+    task: asyncio.Task
+    waiters: int = 0
+
+
+def prompt_key(model: str, prompt: str, **params) -> str:
+    """
+    Build a coalescing key for an LLM prompt.
+
+    Args:
+        model: Model name
+        prompt: Full prompt text
+        params: Generation parameters that change the output (temperature, ...)
+
+    Returns:
+        SHA-256 hex digest identifying the request
+    """
+    material = "\x00".join([model, prompt, *(f"{k}={params[k]}" for k in sorted(params))])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Decide whether an LLM call failure is worth retrying.
+
+    Provider SDK errors expose an HTTP ``status_code``; network failures and
+    timeouts are always retried.
+    """
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code in RETRYABLE_STATUS_CODES
+
+
+class LLMScheduler:
+    """
+    Async scheduler for outbound LLM requests.
+
+    Each provider gets a concurrency gate with priority lanes plus token
+    buckets for requests and tokens per minute. Identical in-flight prompts
+    are coalesced into a single provider call, and transient failures are
+    retried with full-jitter exponential backoff.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[dict[str, ProviderLimits]] = None,
+        max_retries: int = settings.LLM_MAX_RETRIES,
+        retry_base_delay: float = settings.LLM_RETRY_BASE_DELAY,
+        retry_max_delay: float = settings.LLM_RETRY_MAX_DELAY,
+    ):
+        self.limits = limits or {}
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._lanes: dict[str, _ProviderLane] = {}
+        self._inflight: dict[str, _SharedCall] = {}
+
+    def _lane(self, provider: str) -> _ProviderLane:
+        lane = self._lanes.get(provider)
+        if lane is None:
+            lane = _ProviderLane(self.limits.get(provider) or ProviderLimits())
+            self._lanes[provider] = lane
+        return lane
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if isinstance(retry_after, (int, float)) and retry_after > 0:
+            return min(float(retry_after), self.retry_max_delay)
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def submit(
+        self,
+        call: Callable[[], Awaitable[T]],
+        *,
+        provider: str = settings.LLM_PROVIDER,
+        priority: Priority = Priority.BACKGROUND,
+        estimated_tokens: int = 0,
+        coalesce_key: Optional[str] = None,
+    ) -> T:
+        """
+        Run an LLM call under the provider's limits.
+
+        Args:
+            call: Zero-argument async function performing the provider request
+            provider: Provider name used for limits and metrics
+            priority: Scheduling lane
+            estimated_tokens: Prompt + completion tokens charged against the TPM budget
+            coalesce_key: Requests sharing a key while in flight share one call
+                (see prompt_key)
+
+        Returns:
+            Result of the call
+
+        Raises:
+            Exception: The last error once retries are exhausted or it is not retryable
+        """
+        if coalesce_key is None:
+            return await self._run(call, provider, priority, estimated_tokens)
+
+        shared = self._inflight.get(coalesce_key)
+        if shared is None:
+            # The call runs in its own task, so a caller that goes away
+            # (e.g. its client disconnected) doesn't cancel it for the others
+            shared = _SharedCall(asyncio.create_task(
+                self._run(call, provider, priority, estimated_tokens)
+            ))
+            self._inflight[coalesce_key] = shared
+            shared.task.add_done_callback(lambda _: self._forget(coalesce_key, shared))
+        else:
+            llm_requests.labels(provider=provider, outcome="coalesced").inc()
+
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        except asyncio.CancelledError:
+            if shared.waiters == 1 and not shared.task.done():
+                # Nobody else is waiting for the result
+                shared.task.cancel()
+            raise
+        finally:
+            shared.waiters -= 1
+
+    def _forget(self, coalesce_key: str, shared: "_SharedCall") -> None:
+        if self._inflight.get(coalesce_key) is shared:
+            del self._inflight[coalesce_key]
+        if not shared.task.cancelled():
+            # Mark a failure retrieved even if every caller has gone away
+            shared.task.exception()
+
+    async def _run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        provider: str,
+        priority: Priority,
+        estimated_tokens: int,
+    ) -> T:
+        lane = self._lane(provider)
+        attempt = 0
+
+        while True:
+            queued_at = time.perf_counter()
+            # Rate budget first: a request waiting for budget must not hold a
+            # concurrency slot that an interactive request could use
+            await lane.requests.acquire(1, priority)
+            await lane.tokens.acquire(estimated_tokens, priority)
+
+            llm_queue_depth.labels(provider=provider).inc()
+            try:
+                await lane.gate.acquire(priority)
+            finally:
+                llm_queue_depth.labels(provider=provider).dec()
+
+            try:
+                llm_queue_wait.labels(provider=provider, priority=priority.name.lower()).observe(
+                    time.perf_counter() - queued_at
+                )
+                result = await call()
+            except Exception as error:
+                if attempt >= self.max_retries or not is_retryable(error):
+                    llm_requests.labels(provider=provider, outcome="error").inc()
+                    raise
+                delay = self._backoff(attempt, error)
+            else:
+                llm_requests.labels(provider=provider, outcome="success").inc()
+                return result
+            finally:
+                lane.gate.release()
+
+            llm_requests.labels(provider=provider, outcome="retry").inc()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def queue_depth(self, provider: str = settings.LLM_PROVIDER) -> int:
+        """Number of requests waiting for a concurrency slot"""
+        lane = self._lanes.get(provider)
+        return lane.gate.waiting if lane else 0
+
+
+# Global scheduler instance
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,289 @@
+"""Hierarchical Map-Reduce Summarizer"""
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from app.core.ai.scheduler import LLMScheduler, Priority, llm_scheduler, prompt_key
+from app.core.cache import CacheManager
+from app.core.config import settings
+
+# Async function sending a prompt to the LLM and returning its text completion
+CompleteFunc = Callable[[str], Awaitable[str]]
+
+# Bump when prompts change so cached summaries are regenerated
+PROMPT_VERSION = "1"
+
+# A chunk ends after a paragraph whose hash is divisible by this (once it
+# holds a quarter of max_chunk_chars): boundaries depend on content, not
+# offsets, so an edit only changes the chunks around it
+CHUNK_BOUNDARY_MODULUS = 4
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?。！？])\s+")
+
+MAP_PROMPT = (
+    "Summarize the following section of a document. Keep the key arguments, "
+    "facts and conclusions; drop examples and repetition.\n\n"
+    "Section: {title}\n\n{text}\n\nSummary:"
+)
+
+REDUCE_PROMPT = (
+    "The following are summaries of consecutive parts of \"{title}\". "
+    "Combine them into one coherent summary that preserves the overall structure "
+    "and the most important points.\n\n{text}\n\nCombined summary:"
+)
+
+
+@dataclass
+class Section:
+    """Node of a document outline (book -> chapters -> sections)"""
+
+    title: str
+    text: str = ""
+    children: list["Section"] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Section":
+        """
+        Build a section tree from parsed content.
+
+        Args:
+            data: {"title": str, "text": str, "children": [...]}
+
+        Returns:
+            Section tree
+        """
+        return cls(
+            title=data.get("title") or "",
+            text=data.get("text") or "",
+            children=[cls.from_dict(child) for child in data.get("children") or []],
+        )
+
+    def find(self, title: str) -> Optional["Section"]:
+        """Find a descendant section (or self) by title, depth first"""
+        if self.title == title:
+            return self
+        for child in self.children:
+            found = child.find(title)
+            if found is not None:
+                return found
+        return None
+
+
+@dataclass
+class SummaryResult:
+    """Summary of one section tree"""
+
+    text: str
+    key: str
+    llm_calls: int = 0
+    cache_hits: int = 0
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+class HierarchicalSummarizer:
+    """
+    Summarize section trees with map-reduce and content-addressed caching.
+
+    Leaves are summarized in parallel (map) and their summaries are combined
+    level by level (reduce). Every node is cached under a Merkle-style key
+    derived from its own text and its children's keys, so a chapter summary
+    reuses cached section summaries, a full summary reuses chapter summaries,
+    and an edit only recomputes the path from the changed section to the root.
+    """
+
+    def __init__(
+        self,
+        complete: CompleteFunc,
+        cache: Optional[CacheManager] = None,
+        scheduler: LLMScheduler = llm_scheduler,
+        model: str = settings.LLM_MODEL,
+        priority: Priority = Priority.BACKGROUND,
+        max_chunk_chars: int = settings.SUMMARY_MAX_CHUNK_CHARS,
+        reduce_fan_in: int = settings.SUMMARY_REDUCE_FAN_IN,
+        expire: int = settings.SUMMARY_CACHE_TTL,
+    ):
+        self.complete = complete
+        self.cache = cache
+        self.scheduler = scheduler
+        self.model = model
+        self.priority = priority
+        self.max_chunk_chars = max_chunk_chars
+        self.reduce_fan_in = max(2, reduce_fan_in)
+        self.expire = expire
+
+    def _pieces(self, text: str) -> list[str]:
+        """Paragraphs, with those too long for one prompt cut at sentence ends"""
+        pieces: list[str] = []
+        for paragraph in _PARAGRAPH_RE.split(text):
+            paragraph = paragraph.strip()
+            if len(paragraph) <= self.max_chunk_chars:
+                pieces.extend([paragraph] if paragraph else [])
+                continue
+            for sentence in _SENTENCE_END_RE.split(paragraph):
+                # Hard cut only for a single sentence longer than a prompt
+                for start in range(0, len(sentence), self.max_chunk_chars):
+                    pieces.append(sentence[start:start + self.max_chunk_chars])
+        return pieces
+
+    def _chunks(self, text: str) -> list[str]:
+        """Pack paragraphs into chunks of at most max_chunk_chars, cut where content decides"""
+        chunks: list[str] = []
+        current: list[str] = []
+        size = 0
+        for piece in self._pieces(text):
+            # Joined with blank lines, so a chunk never exceeds max_chunk_chars
+            added = len(piece) + (2 if current else 0)
+            if current and size + added > self.max_chunk_chars:
+                chunks.append("\n\n".join(current))
+                current, size, added = [], 0, len(piece)
+            current.append(piece)
+            size += added
+            boundary = int(hashlib.sha1(piece.encode("utf-8")).hexdigest()[:8], 16)
+            if size >= self.max_chunk_chars // 4 and boundary % CHUNK_BOUNDARY_MODULUS == 0:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+
+    def _split(self, section: Section) -> list[Section]:
+        """Turn a section into the list of parts that are summarized and reduced"""
+        parts: list[Section] = []
+        text = section.text.strip()
+        if text and (section.children or len(text) > self.max_chunk_chars):
+            # Own text becomes leading leaf parts that fit in one prompt
+            parts = [Section(section.title, chunk) for chunk in self._chunks(text)]
+        return parts + section.children
+
+    def node_key(self, section: Section, _keys: Optional[dict[int, tuple[Section, str]]] = None) -> str:
+        """
+        Compute the cache key of a section.
+
+        Args:
+            section: Section tree
+
+        Returns:
+            Hex digest that changes iff the section or any descendant changes
+        """
+        # Keys of subtrees already computed in this pass (the section is held
+        # so its id can't be reused); each node is hashed once, not per level
+        keys = {} if _keys is None else _keys
+        known = keys.get(id(section))
+        if known is not None:
+            return known[1]
+
+        parts = self._split(section)
+        if not parts:
+            key = _digest("leaf", PROMPT_VERSION, self.model, section.title, section.text)
+        else:
+            key = _digest(
+                "node", PROMPT_VERSION, self.model, section.title,
+                *(self.node_key(p, keys) for p in parts),
+            )
+        keys[id(section)] = (section, key)
+        return key
+
+    async def _llm(self, prompt: str) -> str:
+        return await self.scheduler.submit(
+            lambda: self.complete(prompt),
+            priority=self.priority,
+            estimated_tokens=len(prompt) // 4 + 512,
+            coalesce_key=prompt_key(self.model, prompt),
+        )
+
+    async def _cached(self, key: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        value = await self.cache.get_json(f"summary:section:{key}")
+        return value.get("text") if isinstance(value, dict) else None
+
+    async def _store(self, key: str, text: str) -> None:
+        if self.cache is not None:
+            await self.cache.set_json(f"summary:section:{key}", {"text": text}, self.expire)
+
+    async def summarize(self, section: Section) -> SummaryResult:
+        """
+        Summarize a section tree.
+
+        Args:
+            section: Root of the tree (whole book, a chapter or a single section)
+
+        Returns:
+            SummaryResult with the summary and LLM call / cache hit counts
+        """
+        return await self._summarize(section, {})
+
+    async def _summarize(self, section: Section, keys: dict[int, tuple[Section, str]]) -> SummaryResult:
+        key = self.node_key(section, keys)
+        parts = self._split(section)
+        if not parts and not section.text.strip():
+            # Nothing to summarize (e.g. a heading directly followed by another)
+            return SummaryResult("", key)
+
+        cached = await self._cached(key)
+        if cached is not None:
+            return SummaryResult(cached, key, cache_hits=1)
+
+        if not parts:
+            text = await self._llm(MAP_PROMPT.format(title=section.title, text=section.text))
+            await self._store(key, text)
+            return SummaryResult(text, key, llm_calls=1)
+
+        # Map: summarize every part concurrently (the scheduler bounds concurrency)
+        children = await asyncio.gather(*(self._summarize(part, keys) for part in parts))
+        llm_calls = sum(child.llm_calls for child in children)
+        cache_hits = sum(child.cache_hits for child in children)
+
+        # Reduce: combine in groups of reduce_fan_in until one summary remains
+        summaries = [child.text for child in children if child.text]
+        while len(summaries) > 1:
+            groups = [
+                summaries[i:i + self.reduce_fan_in]
+                for i in range(0, len(summaries), self.reduce_fan_in)
+            ]
+            summaries = await asyncio.gather(*(
+                self._llm(REDUCE_PROMPT.format(title=section.title, text="\n\n".join(group)))
+                for group in groups
+            ))
+            llm_calls += len(groups)
+
+        text = summaries[0] if summaries else ""
+        await self._store(key, text)
+        return SummaryResult(text, key, llm_calls=llm_calls, cache_hits=cache_hits)
+
+    async def summarize_document(
+        self,
+        outline: Section,
+        summary_type: str = "full",
+        target_section: Optional[str] = None,
+    ) -> SummaryResult:
+        """
+        Summarize a document at the granularity of an AISummary.
+
+        Args:
+            outline: Root section of the document
+            summary_type: full, chapter or section
+            target_section: Title of the chapter/section to summarize
+
+        Returns:
+            SummaryResult for the requested part of the document
+
+        Raises:
+            ValueError: If target_section is missing or not found
+        """
+        if summary_type == "full":
+            return await self.summarize(outline)
+
+        if not target_section:
+            raise ValueError(f"target_section is required for {summary_type} summaries")
+
+        section = outline.find(target_section)
+        if section is None:
+            raise ValueError(f"Section '{target_section}' not found in document")
+        return await self.summarize(section)
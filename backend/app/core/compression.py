@@ -0,0 +1,140 @@
+"""HTTP Response Compression Codecs"""
+import zlib
+from functools import lru_cache
+from typing import Callable, Optional, Protocol, cast
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Levels tuned for dynamic responses: most of the size reduction for a small
+# fraction of the CPU of the maximum levels
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# Content types worth compressing (text-like); everything else passes through
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class StreamCompressor(Protocol):
+    """Incremental compressor for one response body"""
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress a chunk and flush it, so the client can decode it right away"""
+
+    def finish(self) -> bytes:
+        """End the compressed stream"""
+
+
+class _GzipStream:
+    def __init__(self):
+        self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return cast(bytes, self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH))
+
+    def finish(self) -> bytes:
+        return cast(bytes, self._zlib.flush(zlib.Z_FINISH))
+
+
+class _BrotliStream:
+    def __init__(self):
+        self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return cast(bytes, self._brotli.process(chunk) + self._brotli.flush())
+
+    def finish(self) -> bytes:
+        return cast(bytes, self._brotli.finish())
+
+
+class _ZstdStream:
+    def __init__(self):
+        self._zstd = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return cast(bytes, self._zstd.compress(chunk) + self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+
+    def finish(self) -> bytes:
+        return cast(bytes, self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH))
+
+
+def _compress_gzip(data: bytes) -> bytes:
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    return compressor.compress(data) + compressor.flush()
+
+
+_STREAMS: dict[str, Callable[[], StreamCompressor]] = {"gzip": _GzipStream}
+_ONE_SHOT: dict[str, Callable[[bytes], bytes]] = {"gzip": _compress_gzip}
+if brotli is not None:
+    _STREAMS["br"] = _BrotliStream
+    _ONE_SHOT["br"] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+if zstandard is not None:
+    _STREAMS["zstd"] = _ZstdStream
+    _ONE_SHOT["zstd"] = lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+# Installed codecs, best first (used to break ties between equal q-values)
+AVAILABLE_ENCODINGS: tuple[str, ...] = tuple(e for e in ("zstd", "br", "gzip") if e in _STREAMS)
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(
+    accept_encoding: str, available: tuple[str, ...] = AVAILABLE_ENCODINGS
+) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, deflate, br;q=0.9"
+        available: Supported codings in server preference order
+
+    Returns:
+        Coding with the highest q-value (server order breaks ties), or None
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """Whether a response of this content type is worth compressing"""
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a complete body"""
+    return _ONE_SHOT[encoding](data)
+
+
+def stream_compressor(encoding: str) -> StreamCompressor:
+    """Create an incremental compressor for a streamed body"""
+    return _STREAMS[encoding]()
@@ -0,0 +1,191 @@
+"""Conditional GET (ETag / Last-Modified)"""
+import hashlib
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.cache import CacheManager
+from app.core.compression import AVAILABLE_ENCODINGS
+
+logger = logging.getLogger(__name__)
+
+# Versioned content URLs (?version=...) never change: browsers may keep them
+# for a year without revalidating
+IMMUTABLE = "private, max-age=31536000, immutable"
+# Everything else may be cached but must be revalidated (cheap with a 304)
+REVALIDATE = "private, no-cache"
+# Content still being produced (document not fully processed)
+NO_STORE = "no-store"
+
+# Suffixes the compression middleware appends to strong ETags of compressed
+# representations ("abc" -> "abc-gzip"); they validate the same content
+_ENCODING_SUFFIXES = tuple(f"-{encoding}" for encoding in ("gzip", "br", "zstd"))
+
+CONTENT_VERSION_TTL = 24 * 3600
+
+
+def _part(value: Any) -> str:
+    if isinstance(value, datetime):
+        moment: datetime = value
+        # SQLite returns naive datetimes; they are stored in UTC
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.astimezone(timezone.utc).isoformat()
+    return "" if value is None else str(value)
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values a representation is derived from.
+
+    Args:
+        parts: Resource name, versions, timestamps, query parameters...
+
+    Returns:
+        Quoted ETag
+    """
+    digest = hashlib.sha256("\x1f".join(map(_part, parts)).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _strip_encoding(tag: str) -> str:
+    if tag.endswith('"'):
+        for suffix in _ENCODING_SUFFIXES:
+            if tag.endswith(suffix + '"'):
+                return tag[: -len(suffix) - 1] + '"'
+    return tag
+
+
+def match_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    Check an If-None-Match header against the current ETag.
+
+    Uses the weak comparison If-None-Match calls for, and treats tags of
+    compressed representations as equal to the uncompressed one.
+
+    Args:
+        if_none_match: Header value (may list several tags, or be "*")
+        etag: Current ETag of the resource
+
+    Returns:
+        The client's matching tag (to echo in the 304), or None
+    """
+    if not if_none_match:
+        return None
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return etag
+        if _strip_encoding(tag.removeprefix("W/")) == etag:
+            return tag
+    return None
+
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp for Last-Modified"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def check_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> Optional[str]:
+    """
+    Decide whether a conditional GET can be answered with 304.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the client sent no entity tags (RFC 9110, 13.2.2).
+
+    Args:
+        request: Incoming request
+        etag: Current ETag
+        last_modified: Current modification time, if known
+
+    Returns:
+        ETag to send with the 304, or None to send the full response
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return match_etag(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is None:
+            # "-0000" and zone-less dates parse naive; HTTP dates are GMT
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        if last_modified.replace(microsecond=0) <= since:
+            return etag
+    return None
+
+
+def cache_headers(
+    etag: str, cache_control: str, last_modified: Optional[datetime] = None
+) -> dict[str, str]:
+    """Validator and caching headers of a full (200) response"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, cache_control: str, last_modified: Optional[datetime] = None) -> Response:
+    """Build a 304 Not Modified response"""
+    headers = cache_headers(etag, cache_control, last_modified)
+    if AVAILABLE_ENCODINGS:
+        headers["Vary"] = "Accept-Encoding"
+    return Response(status_code=304, headers=headers)
+
+
+def _content_version_key(document_id: str) -> str:
+    return f"document:{document_id}:content_version"
+
+
+async def get_cached_content_version(
+    cache: CacheManager, document_id: str, user_id: str
+) -> Optional[str]:
+    """
+    Look up a document's content version without touching the database.
+
+    Args:
+        cache: Cache manager
+        document_id: Document ID
+        user_id: Requesting user (must own the document)
+
+    Returns:
+        Content version, or None if unknown, owned by someone else, or Redis is down
+    """
+    try:
+        cached = await cache.get(_content_version_key(document_id))
+    except Exception as error:
+        logger.debug("Content version lookup failed: %s", error)
+        return None
+    if not cached:
+        return None
+    owner, _, version = cached.partition(" ")
+    return version if owner == user_id else None
+
+
+async def remember_content_version(
+    cache: CacheManager, document_id: str, user_id: str, version: str
+) -> None:
+    """Cache a processed document's content version (and owner) for 304s"""
+    try:
+        await cache.set(_content_version_key(document_id), f"{user_id} {version}", CONTENT_VERSION_TTL)
+    except Exception as error:
+        logger.debug("Content version store failed: %s", error)
+
+
+async def forget_content_version(cache: CacheManager, document_id: str) -> None:
+    """Drop a document's cached content version (its content is about to change)"""
+    await cache.delete(_content_version_key(document_id))
@@ -35,6 +35,26 @@ class Settings(BaseSettings):
         default="sqlite+aiosqlite:///./readpilot.db",
         description="Database connection URL"
     )
+    DB_ECHO: bool = False  # log every SQL statement
+    DB_POOL_SIZE: int = 10  # persistent connections per worker process
+    DB_MAX_OVERFLOW: int = 10  # extra connections allowed under burst load
+    DB_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000  # PostgreSQL statement_timeout
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256  # asyncpg statements cached per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5_000  # wait on locked SQLite database
+    DB_SLOW_QUERY_MS: float = 200.0  # statements at least this slow are counted and logged
+    DB_SLOW_QUERY_SAMPLE_RATE: float = 0.1  # fraction of slow statements written to the log
+    DB_SERVER_TIMING: bool = True  # add a Server-Timing header with per-request DB time
+
+    # Read Replicas
+    DATABASE_REPLICA_URLS: List[str] = Field(
+        default=[],
+        description="Read replica URLs; read-only requests are routed here"
+    )
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0  # replicas lagging more fall back to primary
+    DB_REPLICA_CHECK_INTERVAL: float = 10.0  # seconds between lag checks
+    DB_REPLICA_CHECK_TIMEOUT: float = 2.0  # seconds before a lag check counts as failed
 
     # Redis
     REDIS_URL: str = Field(
@@ -42,6 +62,58 @@ class Settings(BaseSettings):
         description="Redis connection URL"
     )
 
+    # Background Tasks
+    # celery: Redis-brokered workers; inprocess: asyncio worker pool inside the API process
+    TASK_BACKEND: Literal["celery", "inprocess"] = "celery"
+    INPROCESS_WORKERS: int = 2
+    INPROCESS_DRAIN_TIMEOUT: float = 30.0  # seconds to wait for running jobs on shutdown
+    INGESTION_MAX_ATTEMPTS: int = 3  # in-process runs before an interrupted job is failed
+    INGESTION_LEASE_SECONDS: float = 60.0  # processing jobs without a heartbeat this long are re-queued
+    CELERY_BROKER_URL: str = Field(
+        default="",
+        description="Celery broker URL (defaults to REDIS_URL)"
+    )
+    INGESTION_JOB_TIMEOUT: int = 30 * 60  # seconds
+    INGESTION_PROGRESS_INTERVAL: float = 0.25  # min seconds between progress events per stage
+    INGESTION_PROGRESS_TTL: int = 24 * 3600  # seconds the latest progress event is kept
+    INGESTION_PAGE_CHARS: int = 3_000  # page size for formats without native pages
+    INGESTION_CHUNK_SIZE: int = 1_000  # characters per retrieval chunk
+    INGESTION_CHUNK_OVERLAP: int = 150  # characters shared between adjacent chunks
+    SSE_KEEPALIVE_INTERVAL: float = 15.0  # seconds between keepalive comments on SSE streams
+
+    # Annotations
+    ANNOTATION_IMPORT_MAX_ITEMS: int = 20_000  # per bulk import request
+    ANNOTATION_IMPORT_BATCH_SIZE: int = 500  # rows validated and inserted per transaction
+    ANNOTATION_EXPORT_FETCH_SIZE: int = 1_000  # rows fetched per round trip while exporting
+
+    # Reading Progress
+    PROGRESS_FLUSH_INTERVAL: float = 5.0  # seconds between batched progress writes
+    PROGRESS_BUFFER_MAX_PENDING: int = 10_000  # readers buffered before an early flush
+
+    # Real-time Sync
+    SYNC_BATCH_WINDOW: float = 0.05  # seconds changes are coalesced before being pushed
+    SYNC_STREAM_MAXLEN: int = 500  # frames kept per (user, document) for resuming clients
+    SYNC_STREAM_TTL: int = 24 * 3600  # seconds a stream is kept after its last change
+    SYNC_QUEUE_SIZE: int = 100  # frames buffered per socket before it falls back to replay
+    SYNC_KEEPALIVE_INTERVAL: float = 25.0  # seconds between keepalive frames on idle sockets
+
+    # Startup
+    DB_CREATE_TABLES: bool = False  # create missing tables at startup (development without migrations)
+    DB_POOL_WARM_CONNECTIONS: int = 2  # connections opened at startup (capped at DB_POOL_SIZE)
+    STARTUP_WARMUP_TIMEOUT: float = 10.0  # seconds before a warm-up phase is abandoned
+    STARTUP_PRELOAD: bool = True  # load parsers and tokenizer in the background after boot
+    STARTUP_RETRY_INTERVAL: float = 5.0  # seconds between attempts of a phase retried after boot
+
+    # HTTP Responses
+    COMPRESSION_ENABLED: bool = True  # gzip/br/zstd responses for clients that accept them
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller complete responses are sent uncompressed
+
+    # Observability
+    METRICS_ENABLED: bool = True  # serve Prometheus metrics at /metrics
+    EVENT_LOOP_LAG_INTERVAL: float = 0.5  # seconds between event loop lag probes
+    READINESS_CHECK_TIMEOUT: float = 1.0  # seconds before a dependency check fails /ready
+    READINESS_CACHE_TTL: float = 2.0  # seconds a /ready result is reused
+
     # Vector Database (Qdrant)
     QDRANT_URL: str = Field(
         default="http://localhost:6333",
@@ -54,11 +126,51 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: str = Field(default="", description="Anthropic API key")
     LLM_PROVIDER: Literal["openai", "anthropic", "ollama"] = "openai"
     LLM_MODEL: str = "gpt-4o-mini"
+    LLM_MAX_OUTPUT_TOKENS: int = 1_024  # completion tokens per request
+    LLM_REQUEST_TIMEOUT: float = 60.0  # seconds per provider HTTP request
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    OLLAMA_BASE_URL: str = "http://localhost:11434/v1"  # OpenAI-compatible endpoint
+    EMBEDDING_PROVIDER: Literal["openai", "ollama"] = "openai"
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_BATCH_SIZE: int = 64  # chunks per embedding request
+
+    # LLM Request Scheduling (per provider)
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 200_000
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_DELAY: float = 0.5  # seconds
+    LLM_RETRY_MAX_DELAY: float = 20.0  # seconds
+
+    # Hierarchical Summarization
+    SUMMARY_MAX_CHUNK_CHARS: int = 12_000  # characters per map prompt
+    SUMMARY_REDUCE_FAN_IN: int = 8  # summaries combined per reduce prompt
+    SUMMARY_CACHE_TTL: int = 30 * 24 * 3600  # 30 days
+
+    # RAG Context Assembly
+    CONTEXT_MAX_TOKENS: int = 8_000  # prompt window used for Q&A
+    CONTEXT_RESERVED_TOKENS: int = 1_024  # kept free for the answer
+    CONTEXT_HISTORY_RATIO: float = 0.25  # share of the budget for chat history
+    CONTEXT_TOKENIZER_ENCODING: str = "o200k_base"  # used when tiktoken is installed
+
+    # Semantic Q&A Cache
+    QA_CACHE_ENABLED: bool = True
+    QA_CACHE_SIMILARITY_THRESHOLD: float = Field(
+        default=0.92,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity for reusing a cached answer"
+    )
+    QA_CACHE_TTL: int = 7 * 24 * 3600  # 7 days
+    QA_CACHE_MAX_ENTRIES: int = 500  # per document parse version
 
     # File Upload
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
     ALLOWED_EXTENSIONS: List[str] = [".pdf", ".epub", ".txt", ".md", ".docx"]
     UPLOAD_DIR: str = "./data/documents"
+    ZIP_MAX_ENTRIES: int = 10_000  # entries in an EPUB/DOCX container
+    ZIP_MAX_UNCOMPRESSED_SIZE: int = 512 * 1024 * 1024  # declared size of all entries once extracted
+    ZIP_MAX_COMPRESSION_RATIO: int = 100  # declared uncompressed size / archive size
 
     # Security
     SECRET_KEY: str = Field(
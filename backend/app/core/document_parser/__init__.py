@@ -0,0 +1,22 @@
+"""Document Parsers"""
+from app.core.document_parser.base import (
+    DocumentParser,
+    ParsedDocument,
+    UnsupportedDocumentError,
+    get_parser,
+    preload_parsers,
+    register_parser,
+    register_parser_module,
+)
+
+register_parser_module("app.core.document_parser.markdown_parser", "txt", "md")
+
+__all__ = [
+    "DocumentParser",
+    "ParsedDocument",
+    "UnsupportedDocumentError",
+    "get_parser",
+    "preload_parsers",
+    "register_parser",
+    "register_parser_module",
+]
@@ -0,0 +1,114 @@
+"""Document Parser Base Classes"""
+import importlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+# Called with (pages_parsed, total_pages) while a parser works through a file
+ProgressCallback = Callable[[int, int], None]
+
+
+class UnsupportedDocumentError(Exception):
+    """Raised when no parser is available for a file type"""
+
+
+@dataclass
+class ParsedDocument:
+    """Parser output stored in Document.parsed_content"""
+
+    pages: list[str]
+    # Section tree: {"title": str, "text": str, "children": [...]}
+    outline: dict = field(default_factory=dict)
+    title: Optional[str] = None
+    author: Optional[str] = None
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def word_count(self) -> int:
+        return sum(len(page.split()) for page in self.pages)
+
+    def to_content(self) -> dict:
+        """Serialize to the Document.parsed_content JSON structure"""
+        return {"pages": self.pages, "outline": self.outline}
+
+
+class DocumentParser(ABC):
+    """Abstract base class for document parsers"""
+
+    # File types handled by this parser (Document.file_type values)
+    file_types: tuple[str, ...] = ()
+
+    @abstractmethod
+    def parse(self, path: Path, progress: Optional[ProgressCallback] = None) -> ParsedDocument:
+        """
+        Parse a document file.
+
+        Blocking; callers on the event loop should run it in a thread.
+
+        Args:
+            path: Path to the stored file
+            progress: Optional callback receiving (pages_parsed, total_pages)
+
+        Returns:
+            ParsedDocument
+        """
+
+
+_PARSERS: dict[str, type[DocumentParser]] = {}
+
+# Modules defining the parsers of each file type. They are imported on first
+# use, so parsing libraries don't load (or slow down boot) in processes that
+# never parse that format.
+_PARSER_MODULES: dict[str, str] = {}
+
+
+def register_parser(parser_cls: type[DocumentParser]) -> type[DocumentParser]:
+    """Class decorator registering a parser for its file types"""
+    for file_type in parser_cls.file_types:
+        _PARSERS[file_type] = parser_cls
+    return parser_cls
+
+
+def register_parser_module(module: str, *file_types: str) -> None:
+    """
+    Declare the module whose parsers handle some file types, without importing it.
+
+    Args:
+        module: Dotted module path; importing it must register_parser() the types
+        file_types: File types without dot
+    """
+    for file_type in file_types:
+        _PARSER_MODULES[file_type] = module
+
+
+def preload_parsers() -> None:
+    """Import every declared parser module now (e.g. in the background after boot)"""
+    for module in set(_PARSER_MODULES.values()):
+        importlib.import_module(module)
+
+
+def get_parser(file_type: str) -> DocumentParser:
+    """
+    Get a parser instance for a file type.
+
+    Args:
+        file_type: Document file type without dot (pdf, epub, txt, md, docx)
+
+    Returns:
+        DocumentParser instance
+
+    Raises:
+        UnsupportedDocumentError: If no parser is registered for the type
+    """
+    file_type = file_type.lower().lstrip(".")
+    parser_cls = _PARSERS.get(file_type)
+    if parser_cls is None and file_type in _PARSER_MODULES:
+        importlib.import_module(_PARSER_MODULES[file_type])
+        parser_cls = _PARSERS.get(file_type)
+    if parser_cls is None:
+        raise UnsupportedDocumentError(f"No parser available for '{file_type}' documents")
+    return parser_cls()
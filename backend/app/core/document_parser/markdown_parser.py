@@ -0,0 +1,96 @@
+"""Plain Text and Markdown Parsers"""
+import re
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.core.document_parser.base import (
+    DocumentParser,
+    ParsedDocument,
+    ProgressCallback,
+    register_parser,
+)
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+
+
+def paginate(text: str, page_chars: int = settings.INGESTION_PAGE_CHARS) -> list[str]:
+    """
+    Split text into pages of roughly page_chars characters.
+
+    Page breaks prefer paragraph boundaries, then line boundaries. Form feed
+    characters always start a new page.
+
+    Args:
+        text: Full document text
+        page_chars: Target page size in characters
+
+    Returns:
+        List of page texts (at least one page)
+    """
+    pages: list[str] = []
+    for block in text.split("\f"):
+        while len(block) > page_chars:
+            cut = block.rfind("\n\n", 0, page_chars)
+            if cut < page_chars // 2:
+                cut = block.rfind("\n", 0, page_chars)
+            if cut < page_chars // 2:
+                cut = page_chars
+            pages.append(block[:cut])
+            block = block[cut:].lstrip("\n")
+        pages.append(block)
+    pages = [page for page in pages if page.strip()]
+    return pages or [""]
+
+
+@register_parser
+class PlainTextParser(DocumentParser):
+    """Parser for UTF-8 plain text files"""
+
+    file_types = ("txt",)
+
+    def _read(self, path: Path) -> str:
+        return path.read_text(encoding="utf-8", errors="replace")
+
+    def _outline(self, title: str, text: str) -> dict:
+        return {"title": title, "text": text, "children": []}
+
+    def parse(self, path: Path, progress: Optional[ProgressCallback] = None) -> ParsedDocument:
+        text = self._read(path)
+        pages = paginate(text)
+        if progress:
+            progress(len(pages), len(pages))
+
+        title = path.stem
+        return ParsedDocument(pages=pages, outline=self._outline(title, text), title=title)
+
+
+@register_parser
+class MarkdownParser(PlainTextParser):
+    """Parser for Markdown files; headings become the section outline"""
+
+    file_types = ("md",)
+
+    def _outline(self, title: str, text: str) -> dict:
+        root = {"title": title, "text": "", "children": []}
+        stack: list[tuple[int, dict]] = [(0, root)]
+        lines: list[str] = []
+
+        def flush() -> None:
+            stack[-1][1]["text"] = "\n".join(lines).strip()
+            lines.clear()
+
+        for line in text.splitlines():
+            match = _HEADING_RE.match(line)
+            if match is None:
+                lines.append(line)
+                continue
+            flush()
+            level = len(match.group(1))
+            while stack[-1][0] >= level:
+                stack.pop()
+            section: dict = {"title": match.group(2), "text": "", "children": []}
+            stack[-1][1]["children"].append(section)
+            stack.append((level, section))
+        flush()
+        return root
@@ -0,0 +1,173 @@
+"""Readiness Checks"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.cache import CacheManager, cache_manager
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.db.session import engine
+
+Check = Callable[[], Awaitable[None]]
+
+dependency_up = metrics_registry.gauge(
+    "readpilot_dependency_up",
+    "Whether the last readiness check of a dependency passed (1) or failed (0)",
+    ["dependency"],
+)
+dependency_check_seconds = metrics_registry.histogram(
+    "readpilot_dependency_check_seconds",
+    "Latency of readiness checks per dependency",
+    ["dependency"],
+)
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one dependency check"""
+
+    name: str
+    ok: bool
+    latency_ms: float
+    error: Optional[str] = None
+
+
+@dataclass
+class Readiness:
+    """Outcome of a readiness probe"""
+
+    checks: list[CheckResult] = field(default_factory=list)
+    checked_at: float = 0.0  # time.monotonic()
+
+    @property
+    def ready(self) -> bool:
+        return all(check.ok for check in self.checks)
+
+    def to_dict(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "checks": {
+                check.name: {
+                    "ok": check.ok,
+                    "latency_ms": round(check.latency_ms, 2),
+                    **({"error": check.error} if check.error else {}),
+                }
+                for check in self.checks
+            },
+        }
+
+
+def database_check(db_engine: AsyncEngine) -> Check:
+    """Check that a pooled connection can be checked out and run a query"""
+    async def check() -> None:
+        async with db_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    return check
+
+
+def cache_check(cache: CacheManager) -> Check:
+    """Check that Redis answers a PING"""
+    async def check() -> None:
+        await cache.redis.ping()
+    return check
+
+
+def storage_check(path: str) -> Check:
+    """Check that the upload directory exists and is writable"""
+    def probe() -> None:
+        directory = Path(path)
+        if not directory.is_dir():
+            raise FileNotFoundError(f"{directory} is not a directory")
+        if not os.access(directory, os.W_OK | os.X_OK):
+            raise PermissionError(f"{directory} is not writable")
+
+    async def check() -> None:
+        # A hung network filesystem blocks stat(); keep it off the event loop
+        await asyncio.to_thread(probe)
+    return check
+
+
+def job_runner_check(is_running: Callable[[], bool]) -> Check:
+    """Check that the in-process job runner has started (it retries in the background)"""
+    async def check() -> None:
+        if not is_running():
+            raise RuntimeError("job runner is not running")
+    return check
+
+
+class ReadinessProbe:
+    """
+    Check dependencies concurrently, each under a timeout, and cache the result.
+
+    Results are reused for cache_ttl seconds and concurrent probes share one
+    in-flight check, so however often load balancers poll, each worker checks
+    its dependencies at most once per interval.
+    """
+
+    def __init__(
+        self,
+        checks: dict[str, Check],
+        timeout: float = settings.READINESS_CHECK_TIMEOUT,
+        cache_ttl: float = settings.READINESS_CACHE_TTL,
+    ):
+        self.checks = checks
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self._last: Optional[Readiness] = None
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> Optional[Readiness]:
+        if self._last is not None and time.monotonic() - self._last.checked_at < self.cache_ttl:
+            return self._last
+        return None
+
+    async def _run(self, name: str, check: Check) -> CheckResult:
+        started = time.perf_counter()
+        error = None
+        try:
+            async with asyncio.timeout(self.timeout):
+                await check()
+        except TimeoutError:
+            error = f"timed out after {self.timeout}s"
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        latency = time.perf_counter() - started
+
+        dependency_check_seconds.labels(dependency=name).observe(latency)
+        dependency_up.labels(dependency=name).set(0 if error else 1)
+        return CheckResult(name=name, ok=error is None, latency_ms=latency * 1000, error=error)
+
+    async def check(self) -> Readiness:
+        """
+        Get the readiness of this worker.
+
+        Returns:
+            Cached Readiness if younger than cache_ttl, otherwise a new one
+        """
+        cached = self._fresh()
+        if cached is not None:
+            return cached
+        async with self._lock:
+            # Another probe may have refreshed the result while we waited
+            cached = self._fresh()
+            if cached is not None:
+                return cached
+            results = await asyncio.gather(
+                *(self._run(name, check) for name, check in self.checks.items())
+            )
+            self._last = Readiness(checks=list(results), checked_at=time.monotonic())
+            return self._last
+
+
+# Global readiness probe
+readiness_probe = ReadinessProbe({
+    "database": database_check(engine),
+    "cache": cache_check(cache_manager),
+    "storage": storage_check(settings.UPLOAD_DIR),
+})
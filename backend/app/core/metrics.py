@@ -0,0 +1,321 @@
+"""In-process Metrics Registry"""
+import asyncio
+import math
+import threading
+from bisect import bisect_left
+from typing import Iterable, Optional, Self, TypeVar
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Default latency buckets in seconds (1ms .. 30s)
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Self] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str, **kwargs: str) -> Self:
+        """
+        Get the child metric for a set of label values.
+
+        Args:
+            values: Label values in declaration order
+            kwargs: Label values by name
+
+        Returns:
+            Child metric bound to the label values
+        """
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}")
+
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def _new_child(self) -> Self:
+        raise NotImplementedError
+
+    def samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """
+        Collect samples as (name, labels, value) tuples.
+
+        Returns:
+            List of samples for this metric and all of its children
+        """
+        if not self.labelnames:
+            return self._own_samples({})
+
+        samples = []
+        for values, child in list(self._children.items()):
+            samples.extend(child._own_samples(dict(zip(self.labelnames, values))))
+        return samples
+
+    def _own_samples(self, labels: dict[str, str]) -> list[tuple[str, dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def _new_child(self) -> "Counter":
+        return Counter(self.name, self.documentation)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the counter"""
+        self.value += amount
+
+    def _own_samples(self, labels):
+        return [(f"{self.name}_total", labels, self.value)]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def _new_child(self) -> "Gauge":
+        return Gauge(self.name, self.documentation)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the gauge"""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement the gauge"""
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Set the gauge to a value"""
+        self.value = value
+
+    def _own_samples(self, labels):
+        return [(self.name, labels, self.value)]
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self) -> "Histogram":
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile from bucket counts.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Upper bound of the bucket containing the quantile, or None if empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= rank:
+                return bound
+        return float("inf")
+
+    def _own_samples(self, labels):
+        samples = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            samples.append((f"{self.name}_bucket", {**labels, "le": repr(bound)}, running))
+        samples.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, self.count))
+        samples.append((f"{self.name}_sum", labels, self.sum))
+        samples.append((f"{self.name}_count", labels, self.count))
+        return samples
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class MetricsRegistry:
+    """Registry holding all application metrics"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: M) -> M:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if not isinstance(existing, type(metric)):
+                    raise ValueError(f"Metric {metric.name} already registered as {existing.type_name}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Get or create a gauge"""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Get a registered metric by name"""
+        return self._metrics.get(name)
+
+    def collect(self) -> list[_Metric]:
+        """Get all registered metrics"""
+        return list(self._metrics.values())
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text (see PROMETHEUS_CONTENT_TYPE)
+        """
+        lines = []
+        for metric in sorted(self.collect(), key=lambda m: m.name):
+            # Counter samples carry the _total suffix; HELP/TYPE must match it
+            name = f"{metric.name}_total" if metric.type_name == "counter" else metric.name
+            lines.append(f"# HELP {name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {name} {metric.type_name}")
+            for sample_name, labels, value in metric.samples():
+                if labels:
+                    pairs = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                    lines.append(f"{sample_name}{{{pairs}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{sample_name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# Global metrics registry
+metrics_registry = MetricsRegistry()
+
+event_loop_lag = metrics_registry.gauge(
+    "readpilot_event_loop_lag_seconds",
+    "Delay of the most recent event loop lag probe",
+)
+event_loop_lag_histogram = metrics_registry.histogram(
+    "readpilot_event_loop_lag_probe_seconds",
+    "Delay of event loop lag probes beyond their scheduled wake-up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class LoopLagMonitor:
+    """
+    Measure how late the event loop runs scheduled callbacks.
+
+    A probe sleeps for interval seconds; anything beyond that before it wakes
+    is time the loop spent running other code without yielding (CPU-bound
+    parsing, blocking I/O), which delays every request on the worker.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start probing the running loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._probe_loop(), name="event-loop-lag")
+
+    async def stop(self) -> None:
+        """Stop probing"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _probe_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            event_loop_lag.set(lag)
+            event_loop_lag_histogram.observe(lag)
@@ -0,0 +1,330 @@
+"""ASGI Middleware"""
+import asyncio
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.compression import (
+    AVAILABLE_ENCODINGS,
+    StreamCompressor,
+    compress,
+    is_compressible,
+    negotiate_encoding,
+    stream_compressor,
+)
+from app.core.metrics import metrics_registry
+from app.db.session import QueryStats, current_query_stats
+
+# Label for requests that matched no route (404s, probes of random paths), so
+# arbitrary URLs can't create new time series
+UNMATCHED_ROUTE = "<unmatched>"
+
+_KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+http_request_duration = metrics_registry.histogram(
+    "readpilot_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+http_response_size = metrics_registry.histogram(
+    "readpilot_http_response_size_bytes",
+    "HTTP response body size by route template",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+http_requests_in_flight = metrics_registry.gauge(
+    "readpilot_http_requests_in_flight",
+    "HTTP requests currently being served",
+)
+http_compression_bytes = metrics_registry.counter(
+    "readpilot_http_compression_bytes",
+    "Response body bytes before (in) and after (out) compression",
+    ["encoding", "stage"],
+)
+db_request_queries = metrics_registry.histogram(
+    "readpilot_db_request_queries",
+    "SQL statements executed per HTTP request",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+db_request_seconds = metrics_registry.histogram(
+    "readpilot_db_request_seconds",
+    "Total time spent in SQL statements per HTTP request",
+)
+
+# Bodies at least this large are compressed in a worker thread, so one large
+# response doesn't stall every other request on the event loop
+_THREAD_COMPRESSION_SIZE = 256 * 1024
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Get the template of the route a request matched, e.g. ``/documents/{document_id}``.
+
+    Args:
+        scope: ASGI scope after routing
+
+    Returns:
+        Full route template, or UNMATCHED_ROUTE
+    """
+    # FastAPI resolves included routers lazily: scope["route"] is the route as
+    # declared on its APIRouter (no prefix); the effective context has the full path
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path_format = getattr(context, "path_format", None)
+    if isinstance(path_format, str):
+        return path_format
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if isinstance(path_format, str):
+        return path_format
+    # Routes without a compiled format (e.g. mounts) keep their raw path; the
+    # request path itself is never used, as it would be an unbounded label
+    path = getattr(route, "path", None)
+    return path if isinstance(path, str) else UNMATCHED_ROUTE
+
+
+class DBTimingMiddleware:
+    """
+    Collect per-request query count and database time.
+
+    Statements are timed by the engine hooks (app.db.session.instrument_engine)
+    into a QueryStats bound to the request's context. The totals so far are
+    sent as a ``Server-Timing: db`` header when the response starts and
+    recorded as metrics when the request ends.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing and stats.count:
+                value = f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (b"server-timing", value.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            db_request_queries.observe(stats.count)
+            db_request_seconds.observe(stats.seconds)
+
+
+class PerformanceMiddleware:
+    """
+    Record per-route latency, response size and in-flight requests.
+
+    Routes are labelled by their template (``/api/v1/documents/{document_id}``),
+    read from the scope after routing, so label cardinality is bounded by the
+    number of routes. Streaming responses are timed until their last body
+    chunk is sent. Always on, so the per-request work is kept to a clock read
+    on each side, a counter per body chunk and two cached child lookups.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._children: dict[tuple[str, str, str], tuple] = {}
+
+    def _metrics_for(self, method: str, route: str, status: str) -> tuple:
+        key = (method, route, status)
+        children = self._children.get(key)
+        if children is None:
+            children = (
+                http_request_duration.labels(method, route, status),
+                http_response_size.labels(method, route),
+            )
+            self._children[key] = children
+        return children
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            http_requests_in_flight.dec()
+            duration, response_size = self._metrics_for(
+                method if method in _KNOWN_METHODS else "OTHER",
+                route_template(scope),
+                f"{status // 100}xx",
+            )
+            duration.observe(time.perf_counter() - started)
+            response_size.observe(size)
+
+
+class CompressionMiddleware:
+    """
+    Compress text-like responses with the best coding the client accepts.
+
+    Codings are negotiated per request from Accept-Encoding (zstd and br when
+    their libraries are installed, gzip always). Complete bodies smaller than
+    minimum_size are sent as is. Streamed bodies are compressed chunk by chunk
+    and flushed after each one, so NDJSON exports and streamed JSON lists
+    still arrive incrementally. Already-encoded responses, Server-Sent Events
+    and 304s are never touched. Strong ETags get an encoding suffix, which
+    app.core.conditional strips again when validating. Text-like responses
+    sent uncompressed still carry Vary: Accept-Encoding.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: tuple[str, ...] = AVAILABLE_ENCODINGS,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = encodings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept, self.encodings) if accept else None
+        if encoding is None:
+            async def send_uncompressed(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    _vary_on_encoding(message)
+                await send(message)
+
+            await self.app(scope, receive, send_uncompressed)
+            return
+
+        await _CompressedResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+def _vary_on_encoding(start: Message) -> None:
+    """
+    Mark an uncompressed response as varying by Accept-Encoding.
+
+    Applies to responses another request could get compressed, so a shared
+    cache never serves this representation to a client that asked for (or
+    didn't accept) a compressed one.
+    """
+    headers = MutableHeaders(raw=start.setdefault("headers", []))
+    if "content-encoding" not in headers and is_compressible(headers.get("content-type", "")):
+        headers.add_vary_header("Accept-Encoding")
+
+
+class _CompressedResponder:
+    """Compression state of one response"""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.start: Optional[Message] = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        send = self.send
+        if send is None:
+            raise RuntimeError("Response sent before the responder was called")
+        if self.passthrough:
+            await send(message)
+            return
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start.setdefault("headers", []))
+            if (
+                start["status"] in (204, 304)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                self.passthrough = True
+                _vary_on_encoding(start)
+                await send(start)
+                await send(message)
+                return
+
+            headers["content-encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and etag.endswith('"') and not etag.startswith("W/"):
+                # A strong ETag identifies exact bytes: the compressed
+                # representation gets its own ("abc" -> "abc-gzip")
+                headers["etag"] = f'{etag[:-1]}-{self.encoding}"'
+            if more_body:
+                del headers["content-length"]
+                self.compressor = stream_compressor(self.encoding)
+            else:
+                compressed = await self._compress(body)
+                headers["content-length"] = str(len(compressed))
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+            await send(start)
+
+        compressor = self.compressor
+        if compressor is None:
+            # Body after the final chunk: nothing left to compress
+            await send(message)
+            return
+        chunk = compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += compressor.finish()
+        self._count(len(body), len(chunk))
+        await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _compress(self, body: bytes) -> bytes:
+        if len(body) >= _THREAD_COMPRESSION_SIZE:
+            compressed = await asyncio.to_thread(compress, body, self.encoding)
+        else:
+            compressed = compress(body, self.encoding)
+        self._count(len(body), len(compressed))
+        return compressed
+
+    def _count(self, before: int, after: int) -> None:
+        http_compression_bytes.labels(self.encoding, "in").inc(before)
+        http_compression_bytes.labels(self.encoding, "out").inc(after)
@@ -0,0 +1,107 @@
+"""JSON Responses"""
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import JSONResponse, StreamingResponse
+
+# Items serialized per streamed chunk: large enough to compress well, small
+# enough that the first bytes leave before the whole list is serialized
+STREAM_CHUNK_ITEMS = 50
+
+Serializer = Callable[[Any], bytes]
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson.
+
+    For endpoints without a response model. Endpoints with one are already
+    serialized to bytes by Pydantic's core, which a custom response class
+    would bypass, so this is not the application default.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_serializer(model: type[BaseModel]) -> Serializer:
+    """
+    Build a serializer of ORM objects (or dicts) to the JSON of a schema.
+
+    Args:
+        model: Pydantic schema with from_attributes enabled
+
+    Returns:
+        Function returning the JSON bytes of one item
+    """
+    adapter = TypeAdapter(model)
+
+    def serialize(item: Any) -> bytes:
+        return adapter.dump_json(adapter.validate_python(item, from_attributes=True))
+    return serialize
+
+
+async def _json_list_chunks(
+    items: Iterable[Any],
+    serialize: Serializer,
+    key: Optional[str],
+    fields: dict[str, Any],
+    chunk_items: int,
+) -> AsyncIterator[bytes]:
+    yield b"[" if key is None else b'{"' + key.encode() + b'":['
+    chunk: list[bytes] = []
+    separator = b""
+    for item in items:
+        chunk.append(serialize(item))
+        if len(chunk) == chunk_items:
+            yield separator + b",".join(chunk)
+            chunk, separator = [], b","
+    if chunk:
+        yield separator + b",".join(chunk)
+
+    if key is None:
+        yield b"]"
+    elif fields:
+        # '{"next_cursor":...}' -> '],"next_cursor":...}'
+        yield b"]," + orjson.dumps(fields)[1:]
+    else:
+        yield b"]}"
+
+
+def stream_json_list(
+    items: Iterable[Any],
+    serialize: Serializer = orjson.dumps,
+    key: Optional[str] = "items",
+    chunk_items: int = STREAM_CHUNK_ITEMS,
+    status_code: int = 200,
+    headers: Optional[dict[str, str]] = None,
+    **fields: Any,
+) -> StreamingResponse:
+    """
+    Stream a JSON list, serializing a chunk of items at a time.
+
+    The body is ``{"<key>": [items...], **fields}``, or a bare array when key
+    is None. The serialized list is never held in memory at once, and the
+    compression middleware compresses it chunk by chunk.
+
+    Args:
+        items: Items to serialize (already loaded)
+        serialize: Item to JSON bytes (see model_serializer); orjson by default
+        key: Name of the list member, or None for a bare array
+        chunk_items: Items per chunk
+        status_code: Response status
+        headers: Extra response headers
+        fields: Members written after the list, e.g. next_cursor
+
+    Returns:
+        StreamingResponse with media type application/json
+    """
+    if key is None and fields:
+        raise ValueError("A bare JSON array cannot carry extra fields")
+    return StreamingResponse(
+        _json_list_chunks(items, serialize, key, fields, chunk_items),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -0,0 +1,148 @@
+"""Application Startup Orchestration"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.cache import CacheManager
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+Step = Callable[[], Awaitable[None]]
+
+boot_phase_seconds = metrics_registry.gauge(
+    "readpilot_boot_phase_seconds",
+    "Duration of application boot phases",
+    ["phase"],
+)
+
+
+class BootSequence:
+    """
+    Run startup phases, concurrently where independent, and time each one.
+
+    Warm-up phases are optional: a dependency that is down at boot is logged
+    and left to the readiness probe (/ready) instead of crashing the worker,
+    which would otherwise restart in a loop until the dependency recovers.
+    """
+
+    def __init__(self, timeout: float = settings.STARTUP_WARMUP_TIMEOUT):
+        self.timeout = timeout
+        self.timings: dict[str, float] = {}
+        self.failures: dict[str, str] = {}
+        self._started = time.perf_counter()
+        self._background: list[asyncio.Task] = []
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the boot sequence started"""
+        return time.perf_counter() - self._started
+
+    async def run(self, name: str, step: Step, required: bool = True) -> None:
+        """
+        Run and time one phase.
+
+        Args:
+            name: Phase name (used in timings and metrics)
+            step: Coroutine function to run
+            required: Re-raise failures (True) or log them and continue (False)
+        """
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(None if required else self.timeout):
+                await step()
+        except Exception as error:
+            if required:
+                raise
+            self.failures[name] = f"{type(error).__name__}: {error}"
+            logger.warning("Boot phase %s failed, continuing: %s", name, self.failures[name])
+        finally:
+            self.timings[name] = time.perf_counter() - started
+            boot_phase_seconds.labels(phase=name).set(self.timings[name])
+
+    async def run_concurrently(self, steps: dict[str, Step], required: bool = False) -> None:
+        """Run independent phases at the same time; boot waits for the slowest"""
+        await asyncio.gather(*(self.run(name, step, required) for name, step in steps.items()))
+
+    def run_in_background(
+        self,
+        name: str,
+        step: Step,
+        retry_interval: Optional[float] = None,
+    ) -> None:
+        """
+        Start a phase without waiting for it (timed and logged when it finishes).
+
+        Args:
+            name: Phase name (used in timings and metrics)
+            step: Coroutine function to run
+            retry_interval: Seconds between attempts if the phase should be
+                retried until it succeeds; None runs it once
+        """
+        self._background.append(asyncio.create_task(
+            self._run_background(name, step, retry_interval), name=f"boot-{name}"
+        ))
+
+    async def _run_background(self, name: str, step: Step, retry_interval: Optional[float]) -> None:
+        while True:
+            self.failures.pop(name, None)
+            await self.run(name, step, required=False)
+            if retry_interval is None or name not in self.failures:
+                return
+            await asyncio.sleep(retry_interval)
+
+    async def cancel_background(self) -> None:
+        """Cancel background phases still running (at shutdown)"""
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self._background.clear()
+
+    def summary(self) -> str:
+        """One-line report of phase timings"""
+        phases = ", ".join(
+            f"{name} {seconds * 1000:.0f}ms" + (" (failed)" if name in self.failures else "")
+            for name, seconds in self.timings.items()
+        )
+        return f"{phases}; ready in {self.elapsed * 1000:.0f}ms"
+
+
+async def warm_database(db_engine: AsyncEngine, connections: int = settings.DB_POOL_WARM_CONNECTIONS) -> None:
+    """
+    Open pool connections concurrently so early requests don't pay for connecting.
+
+    Args:
+        db_engine: Engine whose pool is warmed
+        connections: Connections to open (capped at the pool size)
+    """
+    size: Optional[Callable[[], int]] = getattr(db_engine.pool, "size", None)
+    if callable(size):
+        connections = min(connections, size())
+
+    async def connect() -> None:
+        async with db_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # All connections are checked out at once, so each is a new one; they go
+    # back to the pool idle when the block exits
+    await asyncio.gather(*(connect() for _ in range(max(1, connections))))
+
+
+async def connect_cache(cache: CacheManager) -> None:
+    """Create the Redis client and open its first connection"""
+    await cache.connect()
+    await cache.redis.ping()
+
+
+async def preload_models() -> None:
+    """Import document parsers and load the tokenizer off the event loop"""
+    from app.core.ai.context_builder import preload_tokenizer
+    from app.core.document_parser import preload_parsers
+
+    await asyncio.to_thread(preload_parsers)
+    await asyncio.to_thread(preload_tokenizer)
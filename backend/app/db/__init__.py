@@ -1,12 +1,24 @@
 """Database Module"""
 from app.db.base import Base
-from app.db.session import async_session_maker, close_db, engine, get_db, init_db
+from app.db.session import (
+    async_session_maker,
+    close_db,
+    engine,
+    get_db,
+    get_read_db,
+    get_read_session_maker,
+    init_db,
+    read_session_maker,
+)
 
 __all__ = [
     "Base",
     "engine",
     "async_session_maker",
     "get_db",
+    "get_read_db",
+    "get_read_session_maker",
+    "read_session_maker",
     "init_db",
     "close_db",
 ]
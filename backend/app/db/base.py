@@ -1,5 +1,5 @@
 """Database Base Class"""
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
 
 from sqlalchemy import DateTime, func
@@ -16,17 +16,26 @@ class Base(DeclarativeBase):
         return cls.__name__.lower() + "s"
 
 
+def utcnow() -> datetime:
+    """Current UTC time (timezone-aware)"""
+    return datetime.now(timezone.utc)
+
+
 class TimestampMixin:
     """Mixin for created_at and updated_at timestamps"""
 
+    # Python-side defaults give every row a microsecond timestamp known at insert
+    # time: no refresh after flush, and stable keyset ordering on SQLite too
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
         nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utcnow,
         nullable=False
     )
@@ -0,0 +1,87 @@
+"""Named Eager-Loading Profiles"""
+from sqlalchemy.orm import load_only, raiseload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.models import AISummary, Document, User
+
+# Columns shown wherever a document appears as a card (library, dashboard).
+# Never includes parsed_content, which can be megabytes per row.
+_DOCUMENT_CARD_COLUMNS = (
+    Document.id,
+    Document.user_id,
+    Document.title,
+    Document.author,
+    Document.file_type,
+    Document.file_hash,
+    Document.page_count,
+    Document.parse_version,
+    Document.processing_status,
+    Document.processing_error,
+    Document.is_indexed,
+    Document.current_page,
+    Document.scroll_position,
+    Document.last_read_at,
+    Document.created_at,
+    Document.updated_at,
+)
+
+# Each profile loads exactly what one view renders. Deferred columns and
+# unlisted relationships raise on access instead of issuing a query, so an
+# endpoint that outgrows its profile fails loudly in tests rather than
+# silently turning into N+1 queries (or MissingGreenlet under asyncio).
+LOAD_PROFILES: dict[str, tuple[ORMOption, ...]] = {
+    # Library listings and ownership checks
+    "document_card": (
+        load_only(*_DOCUMENT_CARD_COLUMNS, raiseload=True),
+        raiseload("*"),
+    ),
+    # Reader view: card fields plus annotations (documents are per user) and summaries
+    "document_reader": (
+        load_only(*_DOCUMENT_CARD_COLUMNS, Document.word_count, raiseload=True),
+        selectinload(Document.annotations).options(raiseload("*")),
+        selectinload(Document.ai_summaries).options(
+            load_only(
+                AISummary.id,
+                AISummary.document_id,
+                AISummary.summary_type,
+                AISummary.target_section,
+                AISummary.text,
+                AISummary.updated_at,
+                raiseload=True,
+            ),
+            raiseload("*"),
+        ),
+        raiseload("*"),
+    ),
+    # Dashboard: the user's counters and document cards
+    "user_dashboard": (
+        selectinload(User.documents).options(
+            load_only(*_DOCUMENT_CARD_COLUMNS, raiseload=True),
+            raiseload("*"),
+        ),
+        raiseload("*"),
+    ),
+}
+
+
+def load_profile(name: str) -> tuple[ORMOption, ...]:
+    """
+    Get the loader options of a named profile.
+
+    Usage:
+        select(Document).options(*load_profile("document_card"))
+
+    Args:
+        name: Profile name (see LOAD_PROFILES)
+
+    Returns:
+        Loader options to pass to Select.options()
+
+    Raises:
+        ValueError: If the profile doesn't exist
+    """
+    try:
+        return LOAD_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown load profile: {name}") from None
+
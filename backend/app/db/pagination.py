@@ -0,0 +1,136 @@
+"""Keyset (Seek) Pagination"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, Optional, Sequence, TypeVar
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results and the cursor of the next page"""
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+
+    Args:
+        values: Sort column values of the last row (datetimes, strings, numbers)
+
+    Returns:
+        URL-safe base64 string
+    """
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+        size: Number of sort columns expected
+
+    Returns:
+        Sort column values
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError("wrong number of values")
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, KeyError, TypeError) as error:
+        raise InvalidCursorError(f"Invalid cursor: {error}") from error
+
+
+def _seek_condition(columns: Sequence[InstrumentedAttribute], values: Sequence[Any], descending: bool):
+    """
+    Build "row comes after (values)" for a lexicographic sort on columns.
+
+    Expanded to (a > x) OR (a = x AND b > y) rather than a row-value comparison,
+    which SQLite and Postgres both plan as a range scan on the composite index.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*(columns[j] == values[j] for j in range(i)), step))
+    return or_(*clauses)
+
+
+async def keyset_paginate(
+    session: AsyncSession,
+    stmt: Select,
+    order_by: Sequence[InstrumentedAttribute],
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    descending: bool = False,
+) -> Page:
+    """
+    Fetch one page of an ORM select using keyset pagination.
+
+    Instead of OFFSET, each page seeks past the sort key of the previous page's
+    last row, so page 50 costs the same index range scan as page 1 and rows
+    inserted meanwhile never shift or duplicate results. The last order_by
+    column must be unique (usually the primary key) to break ties.
+
+    Args:
+        session: Database session
+        stmt: Select of a single ORM entity, already filtered
+        order_by: Sort columns, matching a composite index
+        cursor: Cursor of the previous page (None for the first page)
+        limit: Page size (capped at MAX_PAGE_SIZE)
+        descending: Newest/largest first
+
+    Returns:
+        Page of entities
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        values = decode_cursor(cursor, len(order_by))
+        stmt = stmt.where(_seek_condition(order_by, values, descending))
+
+    stmt = stmt.order_by(*(column.desc() if descending else column.asc() for column in order_by))
+    # Fetch one extra row to learn whether another page exists
+    rows = list((await session.scalars(stmt.limit(limit + 1))).all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in order_by])
+    return Page(items=rows, next_cursor=next_cursor)
@@ -1,17 +1,400 @@
 """Database Session Management"""
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import logging
+import random
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncGenerator, Optional, Sequence
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import metrics_registry
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.ENVIRONMENT == "development",
-    future=True,
-    pool_pre_ping=True,
+logger = logging.getLogger(__name__)
+
+# Replication delay on a PostgreSQL standby (0 when fully replayed)
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+db_pool_checkout_wait = metrics_registry.histogram(
+    "readpilot_db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["pool"],
+)
+db_pool_checkout_timeouts = metrics_registry.counter(
+    "readpilot_db_pool_checkout_timeouts",
+    "Pool checkouts that gave up after DB_POOL_TIMEOUT",
+    ["pool"],
+)
+db_pool_connections = metrics_registry.gauge(
+    "readpilot_db_pool_connections",
+    "Pool connections by state (checked_out, idle, overflow)",
+    ["pool", "state"],
+)
+db_replica_lag = metrics_registry.gauge(
+    "readpilot_db_replica_lag_seconds",
+    "Replication lag of each read replica (+Inf when unreachable)",
+    ["replica"],
 )
+db_session_reads = metrics_registry.counter(
+    "readpilot_db_routed_queries",
+    "Queries issued through read sessions by target",
+    ["target"],
+)
+db_query_duration = metrics_registry.histogram(
+    "readpilot_db_query_seconds",
+    "Latency of individual SQL statements",
+    ["pool", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+db_slow_queries = metrics_registry.counter(
+    "readpilot_db_slow_queries",
+    "Statements slower than DB_SLOW_QUERY_MS",
+    ["pool", "operation"],
+)
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|\$\d+|:\w+|\?")
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST_RE = re.compile(r"(VALUES\s*\(\?\.\.\.\))(?:\s*,\s*\(\?\.\.\.\))+", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    """Queries executed while serving one request"""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+# Stats of the request being served; set by DBTimingMiddleware
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a SQL statement to a fingerprint shared by all its executions.
+
+    Literals and bind placeholders become ``?``, placeholder lists (IN lists,
+    multi-row VALUES) collapse to one element and whitespace is squeezed.
+
+    Args:
+        statement: SQL text as sent to the driver
+
+    Returns:
+        Normalized SQL
+    """
+    sql = _STRING_LITERAL_RE.sub("?", statement)
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _NUMBER_LITERAL_RE.sub("?", sql)
+    sql = _PLACEHOLDER_LIST_RE.sub("(?...)", sql)
+    sql = _VALUES_LIST_RE.sub(r"\1", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip()[:10].split(None, 1)
+    verb = head[0].upper() if head else ""
+    return verb if verb in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+
+def instrument_engine(
+    engine: AsyncEngine,
+    pool_name: str = "primary",
+    slow_query_ms: float = settings.DB_SLOW_QUERY_MS,
+    slow_query_sample_rate: float = settings.DB_SLOW_QUERY_SAMPLE_RATE,
+) -> None:
+    """
+    Time every statement executed on an engine.
+
+    Records per-statement latency by operation, adds to the current request's
+    QueryStats, and logs a sample of slow statements with normalized SQL.
+
+    Args:
+        engine: Engine to instrument
+        pool_name: Label used for query metrics
+        slow_query_ms: Statements at least this slow count as slow
+        slow_query_sample_rate: Fraction of slow statements logged (all are counted)
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        operation = _operation(statement)
+        db_query_duration.labels(pool=pool_name, operation=operation).observe(elapsed)
+
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+
+        if elapsed * 1000 >= slow_query_ms:
+            db_slow_queries.labels(pool=pool_name, operation=operation).inc()
+            if random.random() < slow_query_sample_rate:
+                slow_query_logger.warning(
+                    "Slow query (%.1f ms, %s%s): %s",
+                    elapsed * 1000,
+                    pool_name,
+                    ", executemany" if executemany else "",
+                    normalize_sql(statement),
+                )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        started = conn.info.get("query_started") if conn is not None else None
+        if started:
+            started.pop()
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection"""
+
+    pool_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            db_pool_checkout_timeouts.labels(pool=self.pool_name).inc()
+            raise
+        finally:
+            db_pool_checkout_wait.labels(pool=self.pool_name).observe(time.perf_counter() - started)
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply per-connection SQLite pragmas on connect"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def create_engine(url: str = settings.DATABASE_URL, pool_name: str = "primary") -> AsyncEngine:
+    """
+    Create an async engine tuned for the database backend.
+
+    - PostgreSQL (asyncpg): sized queue pool with overflow, checkout timeout and
+      recycling, server-side statement timeout and prepared statement caching.
+    - SQLite (file): WAL journal, busy_timeout and synchronous=NORMAL applied on
+      every new connection.
+    - SQLite (memory): default pool, since each connection is its own database.
+
+    Args:
+        url: Database URL
+        pool_name: Label used for pool metrics (primary, replica, ...)
+
+    Returns:
+        AsyncEngine
+    """
+    parsed_url = make_url(url)
+    backend = parsed_url.get_backend_name()
+    database = parsed_url.database or ""
+    kwargs: dict = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": True,
+    }
+
+    if backend == "sqlite" and database in ("", ":memory:"):
+        engine = create_async_engine(url, **kwargs)
+        instrument_engine(engine, pool_name)
+        return engine
+
+    # Subclass per engine so the metrics label survives pool recreation on dispose()
+    pool_class = type(TimedAsyncAdaptedQueuePool.__name__, (TimedAsyncAdaptedQueuePool,), {"pool_name": pool_name})
+    kwargs.update(
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+    if backend == "postgresql":
+        kwargs["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "application_name": settings.PROJECT_NAME,
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+            },
+        }
+
+    engine = create_async_engine(url, **kwargs)
+
+    if backend == "sqlite":
+        event.listen(engine.sync_engine, "connect", _sqlite_pragmas)
+
+    instrument_engine(engine, pool_name)
+    return engine
+
+
+def pool_status(engine: AsyncEngine, pool_name: str = "primary") -> dict:
+    """
+    Snapshot connection pool usage and export it as gauges.
+
+    Args:
+        engine: Engine to inspect
+        pool_name: Label used for pool metrics
+
+    Returns:
+        Dictionary with size, checked_out, idle and overflow counts
+        (empty for pools without queue semantics)
+    """
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {}
+
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+    }
+    for state in ("checked_out", "idle", "overflow"):
+        db_pool_connections.labels(pool=pool_name, state=state).set(status[state])
+    return status
+
+
+class ReplicaSet:
+    """
+    Read replicas with lag tracking.
+
+    Replicas whose replication lag exceeds max_lag (or that fail the lag check)
+    are skipped until a later check finds them healthy again. Lag checks run in
+    the background at most once per check_interval.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        max_lag: float = settings.DB_REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = settings.DB_REPLICA_CHECK_INTERVAL,
+    ):
+        self.engines = list(engines)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: dict[int, float] = {i: 0.0 for i in range(len(self.engines))}
+        self._checked_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._round_robin = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def healthy(self) -> list[AsyncEngine]:
+        """Replicas currently within the lag limit"""
+        return [e for i, e in enumerate(self.engines) if self.lag[i] <= self.max_lag]
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """
+        Pick a healthy replica round-robin.
+
+        Returns:
+            Replica engine, or None when all replicas are lagging (use the primary)
+        """
+        healthy = self.healthy()
+        if not healthy:
+            return None
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    async def _measure(self, index: int, engine: AsyncEngine) -> None:
+        try:
+            async with asyncio.timeout(settings.DB_REPLICA_CHECK_TIMEOUT):
+                async with engine.connect() as conn:
+                    if engine.dialect.name == "postgresql":
+                        lag = float((await conn.execute(REPLICA_LAG_SQL)).scalar() or 0.0)
+                    else:
+                        await conn.execute(text("SELECT 1"))
+                        lag = 0.0
+        except Exception as error:
+            logger.warning("Read replica %d failed lag check: %s", index, error)
+            lag = float("inf")
+        self.lag[index] = lag
+        db_replica_lag.labels(replica=str(index)).set(lag)
+
+    async def refresh(self) -> None:
+        """Measure the lag of every replica now"""
+        self._checked_at = time.monotonic()
+        await asyncio.gather(*(self._measure(i, e) for i, e in enumerate(self.engines)))
+
+    def maybe_refresh(self) -> None:
+        """Start a background lag check if the last one is older than check_interval"""
+        if not self.engines or time.monotonic() - self._checked_at < self.check_interval:
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._checked_at = time.monotonic()
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def dispose(self) -> None:
+        """Close all replica connections"""
+        await asyncio.gather(*(engine.dispose() for engine in self.engines))
+
+
+class RoutingSession(Session):
+    """
+    Session routing reads to a replica and writes to the primary.
+
+    The replica is pinned for the whole session. Once the session flushes or
+    executes a DML / SELECT ... FOR UPDATE statement, every later statement
+    also goes to the primary, so a request always reads its own writes.
+    """
+
+    def __init__(self, *args, primary: AsyncEngine, replicas: ReplicaSet, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self._replica: Optional[AsyncEngine] = None
+        self.use_primary = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if not self.use_primary and (
+            self._flushing
+            or getattr(clause, "is_dml", False)
+            or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            self.use_primary = True
+
+        if not self.use_primary:
+            if self._replica is None:
+                self._replica = self.replicas.choose()
+            if self._replica is not None:
+                db_session_reads.labels(target="replica").inc()
+                return self._replica.sync_engine
+
+        db_session_reads.labels(target="primary").inc()
+        return self.primary.sync_engine
+
+
+# Create async engine
+engine = create_engine()
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -22,6 +405,24 @@ async_session_maker = async_sessionmaker(
     autoflush=False,
 )
 
+# Read replicas (optional)
+replica_set = ReplicaSet([
+    create_engine(url, pool_name=f"replica{i}")
+    for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+])
+
+# Session factory for read-mostly requests
+read_session_maker = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+    primary=engine,
+    replicas=replica_set,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -39,6 +440,39 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting a replica-routed database session.
+
+    Reads go to a healthy read replica (or the primary when none is configured
+    or all are lagging); writes, and every statement after the first write,
+    go to the primary.
+
+    Usage:
+        @app.get("/documents")
+        async def list_documents(db: AsyncSession = Depends(get_read_db)):
+            ...
+    """
+    async with get_read_session_maker()() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def get_read_session_maker() -> async_sessionmaker[AsyncSession]:
+    """
+    Dependency for getting the session factory used by get_read_db.
+
+    For work that outlives the request's dependencies, e.g. a streaming
+    response body that opens its own session while it is being sent.
+    """
+    if not replica_set:
+        return async_session_maker
+    replica_set.maybe_refresh()
+    return read_session_maker
+
+
 async def init_db() -> None:
     """Initialize database - create all tables"""
     from app.db.base import Base
@@ -47,8 +481,11 @@ async def init_db() -> None:
         Annotation,
         ChatMessage,
         Document,
+        IngestionJob,
         ReadingSession,
         User,
+        UserDailyStats,
+        UserDocumentStats,
     )
 
     async with engine.begin() as conn:
@@ -58,3 +495,4 @@ async def init_db() -> None:
 async def close_db() -> None:
     """Close database connections"""
     await engine.dispose()
+    await replica_set.dispose()
@@ -0,0 +1,28 @@
+"""Dialect-Specific INSERT ... ON CONFLICT"""
+from typing import Union
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def upsert(db: AsyncSession, table: Table) -> Union[postgresql.Insert, sqlite.Insert]:
+    """
+    Start an INSERT supporting on_conflict_do_update for the session's database.
+
+    Args:
+        db: Database session (its bind decides the dialect)
+        table: Target table
+
+    Returns:
+        Dialect insert construct
+
+    Raises:
+        NotImplementedError: For databases without ON CONFLICT support
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upserts are not implemented for {dialect}")
@@ -1,10 +1,22 @@
 """FastAPI Application Entry Point"""
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.api.v1 import api_router
+from app.core.cache import cache_manager
 from app.core.config import settings
+from app.core.health import job_runner_check, readiness_probe
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, LoopLagMonitor, metrics_registry
+from app.core.middleware import CompressionMiddleware, DBTimingMiddleware, PerformanceMiddleware
+from app.core.startup import BootSequence, connect_cache, preload_models, warm_database
+from app.db.session import close_db, engine, init_db, replica_set
+from app.utils.file_storage import file_storage
+
+loop_lag_monitor = LoopLagMonitor(settings.EVENT_LOOP_LAG_INTERVAL)
 
 
 @asynccontextmanager
@@ -14,11 +26,62 @@ async def lifespan(app: FastAPI):
     print(f"🚀 Starting {settings.PROJECT_NAME} v{settings.VERSION}")
     print(f"📝 Environment: {settings.ENVIRONMENT}")
     print(f"🔗 API URL: {settings.API_V1_PREFIX}")
+    await loop_lag_monitor.start()
+    boot = BootSequence()
+    # Background subsystems are imported on startup, not with the module:
+    # importing the app (CLI tools, tests) stays cheap, and only the in-process
+    # task backend loads the ingestion pipeline and its LLM clients
+    from app.services.document_sync import sync_hub, sync_publisher
+    from app.services.progress_buffer import progress_buffer
+
+    async def start_database():
+        if settings.DB_CREATE_TABLES:
+            await init_db()
+        await warm_database(engine)
+        if replica_set:
+            await replica_set.refresh()
+
+    # Independent warm-ups run concurrently; boot takes as long as the slowest
+    await boot.run_concurrently({
+        "database": start_database,
+        "cache": lambda: connect_cache(cache_manager),
+        "storage": lambda: asyncio.to_thread(file_storage.ensure_base_path),
+    })
+    if settings.TASK_BACKEND == "inprocess":
+        from app.tasks.runner import job_runner
+
+        # Recovery needs the database: if it is down, keep retrying in the
+        # background and report not ready instead of failing boot
+        readiness_probe.checks["job_runner"] = job_runner_check(lambda: job_runner.running)
+        boot.run_in_background(
+            "job_runner",
+            lambda: job_runner.start(cache_manager),
+            retry_interval=settings.STARTUP_RETRY_INTERVAL,
+        )
+        print(f"⚙️  In-process job runner: {job_runner.workers} workers")
+    await boot.run("progress_buffer", progress_buffer.start)
+    if settings.STARTUP_PRELOAD:
+        # Parsers and tokenizer load on first use otherwise; don't hold up boot for them
+        boot.run_in_background("preload", preload_models)
+    print(f"⏱️  Boot: {boot.summary()}")
 
     yield
 
     # Shutdown
     print("👋 Shutting down application")
+    await boot.cancel_background()
+    # Write buffered reading positions before the database goes away
+    await progress_buffer.stop()
+    if settings.TASK_BACKEND == "inprocess":
+        from app.tasks.runner import job_runner
+
+        await job_runner.stop()
+    # Push pending sync frames and drop subscriptions while Redis is still up
+    await sync_publisher.stop()
+    await sync_hub.stop()
+    await cache_manager.close()
+    await close_db()
+    await loop_lag_monitor.stop()
 
 
 app = FastAPI(
@@ -31,6 +94,17 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Per-request database timing (Server-Timing header + metrics)
+app.add_middleware(DBTimingMiddleware, server_timing=settings.DB_SERVER_TIMING)
+
+# Negotiated gzip/br/zstd compression of large text responses
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# Per-route latency, response size and in-flight requests (outside DB timing,
+# so its latency covers all the work of a request)
+app.add_middleware(PerformanceMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -61,6 +135,19 @@ async def health_check():
     }
 
 
-# Include routers here
-# from app.api.v1 import api_router
-# app.include_router(api_router, prefix=settings.API_V1_PREFIX)
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 503 while a dependency (database, cache, storage) is unavailable"""
+    readiness = await readiness_probe.check()
+    return JSONResponse(readiness.to_dict(), status_code=200 if readiness.ready else 503)
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics endpoint"""
+        return Response(metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+# Include routers
+app.include_router(api_router, prefix=settings.API_V1_PREFIX)
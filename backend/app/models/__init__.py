@@ -3,6 +3,8 @@ from app.models.ai_summary import AISummary
 from app.models.annotation import Annotation
 from app.models.chat_message import ChatMessage
 from app.models.document import Document
+from app.models.ingestion_job import IngestionJob
+from app.models.learning_stats import UserDailyStats, UserDocumentStats
 from app.models.reading_session import ReadingSession
 from app.models.user import User
 
@@ -13,4 +15,7 @@ __all__ = [
     "ChatMessage",
     "ReadingSession",
     "AISummary",
+    "IngestionJob",
+    "UserDailyStats",
+    "UserDocumentStats",
 ]
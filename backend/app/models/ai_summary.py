@@ -1,7 +1,7 @@
 """AI Summary Model"""
 from typing import Optional
 
-from sqlalchemy import ForeignKey, JSON, String, Text
+from sqlalchemy import ForeignKey, Index, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin
@@ -11,9 +11,12 @@ class AISummary(Base, TimestampMixin):
     """AI-generated summary model"""
 
     __tablename__ = "ai_summaries"
+    __table_args__ = (
+        Index("ix_ai_summaries_document_type_section", "document_id", "summary_type", "target_section"),
+    )
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
-    document_id: Mapped[str] = mapped_column(String(50), ForeignKey("documents.id"), nullable=False, index=True)
+    document_id: Mapped[str] = mapped_column(String(50), ForeignKey("documents.id"), nullable=False)
 
     # Summary type: full, chapter, section, custom
     summary_type: Mapped[str] = mapped_column(String(20), nullable=False)
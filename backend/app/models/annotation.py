@@ -1,7 +1,7 @@
 """Annotation Model"""
 from typing import Optional
 
-from sqlalchemy import ForeignKey, JSON, String, Text
+from sqlalchemy import ForeignKey, Index, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin
@@ -11,9 +11,13 @@ class Annotation(Base, TimestampMixin):
     """Annotation model for highlights, notes, and bookmarks"""
 
     __tablename__ = "annotations"
+    __table_args__ = (
+        # Reader's annotations on a document in creation order (keyset on created_at, id)
+        Index("ix_annotations_user_document_created", "user_id", "document_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
-    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), nullable=False)
     document_id: Mapped[str] = mapped_column(String(50), ForeignKey("documents.id"), nullable=False, index=True)
 
     # Annotation type: highlight, important, note, bookmark
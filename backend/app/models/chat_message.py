@@ -1,7 +1,7 @@
 """Chat Message Model"""
 from typing import Optional
 
-from sqlalchemy import Enum, ForeignKey, JSON, String, Text
+from sqlalchemy import Enum, ForeignKey, Index, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin
@@ -11,10 +11,20 @@ class ChatMessage(Base, TimestampMixin):
     """Chat message model for Q&A interactions"""
 
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Chat history of a document by time (keyset on created_at, id)
+        Index("ix_chat_messages_document_created", "document_id", "created_at", "id"),
+        # A reader's chat history on a document; role/parent_id make thread listing index-only
+        Index(
+            "ix_chat_messages_user_document_created",
+            "user_id", "document_id", "created_at", "id",
+            postgresql_include=["role", "parent_id"],
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
-    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), nullable=False, index=True)
-    document_id: Mapped[str] = mapped_column(String(50), ForeignKey("documents.id"), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), nullable=False)
+    document_id: Mapped[str] = mapped_column(String(50), ForeignKey("documents.id"), nullable=False)
 
     # Message role: user or assistant
     role: Mapped[str] = mapped_column(
@@ -2,19 +2,38 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin
 
 
+def content_version(file_hash: str, parse_version: int, processing_status: str) -> Optional[str]:
+    """
+    Version of a document's parsed pages, outline and summaries.
+
+    They only change when the file is re-parsed, so (file_hash, parse_version)
+    identifies them once processing has completed.
+
+    Returns:
+        Version string, or None while the document is not fully processed
+    """
+    if processing_status != "completed":
+        return None
+    return f"{file_hash[:16]}.{parse_version}"
+
+
 class Document(Base, TimestampMixin):
     """Document model"""
 
     __tablename__ = "documents"
+    __table_args__ = (
+        # Library listing: a user's documents by recent activity (keyset on updated_at, id)
+        Index("ix_documents_user_updated", "user_id", "updated_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
-    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), nullable=False)
 
     # File information
     title: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -39,6 +58,9 @@ class Document(Base, TimestampMixin):
     )  # pending, processing, completed, failed
     processing_error: Mapped[Optional[str]] = mapped_column(Text)
 
+    # Incremented every time parsed_content is regenerated; derived caches key on it
+    parse_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
     # Reading progress
     current_page: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     scroll_position: Mapped[Optional[float]] = mapped_column()  # 0.0 to 1.0
@@ -54,5 +76,10 @@ class Document(Base, TimestampMixin):
     reading_sessions = relationship("ReadingSession", back_populates="document", cascade="all, delete-orphan")
     ai_summaries = relationship("AISummary", back_populates="document", cascade="all, delete-orphan")
 
+    @property
+    def content_version(self) -> Optional[str]:
+        """Version of the parsed content (see content_version())"""
+        return content_version(self.file_hash, self.parse_version, self.processing_status)
+
     def __repr__(self) -> str:
         return f"<Document(id={self.id}, title={self.title})>"
@@ -0,0 +1,59 @@
+"""Learning Statistics Rollup Models"""
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, LargeBinary, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, TimestampMixin
+
+
+class UserDailyStats(Base, TimestampMixin):
+    """Per-user, per-day totals, maintained incrementally as reading sessions end"""
+
+    __tablename__ = "user_daily_stats"
+
+    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), primary_key=True)
+    # UTC day the session started on
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    reading_seconds: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sessions: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    scroll_events: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    annotations_made: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    questions_asked: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UserDailyStats(user_id={self.user_id}, day={self.day})>"
+
+
+class UserDocumentStats(Base, TimestampMixin):
+    """Per-user, per-document totals, maintained incrementally as reading sessions end"""
+
+    __tablename__ = "user_document_stats"
+    __table_args__ = (
+        # Dashboard "recently read" list
+        Index("ix_user_document_stats_user_last_read", "user_id", "last_read_at"),
+    )
+
+    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), primary_key=True)
+    document_id: Mapped[str] = mapped_column(
+        String(50), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    reading_seconds: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sessions: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    scroll_events: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    annotations_made: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    questions_asked: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_read_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    # Pages read across all sessions: bit p-1 set for page p (see app.utils.page_bitmap),
+    # OR-merged on every progress flush; pages_read is its population count
+    page_bitmap: Mapped[bytes] = mapped_column(
+        LargeBinary, default=b"", server_default=text("''"), nullable=False
+    )
+    pages_read: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UserDocumentStats(user_id={self.user_id}, document_id={self.document_id})>"
@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin
@@ -12,9 +12,12 @@ class ReadingSession(Base, TimestampMixin):
     """Reading session model for tracking user reading behavior"""
 
     __tablename__ = "reading_sessions"
+    __table_args__ = (
+        Index("ix_reading_sessions_user_document_start", "user_id", "document_id", "start_time"),
+    )
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
-    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(50), ForeignKey("users.id"), nullable=False)
     document_id: Mapped[str] = mapped_column(String(50), ForeignKey("documents.id"), nullable=False, index=True)
 
     # Session timing
@@ -22,10 +25,6 @@ class ReadingSession(Base, TimestampMixin):
     end_time: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     duration_seconds: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    # Pages/sections read (JSON array)
-    # Example: [1, 2, 3, 5, 7]
-    pages_read: Mapped[Optional[list]] = mapped_column(JSON, default=list)
-
     # Reading statistics
     scroll_events: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     annotations_made: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
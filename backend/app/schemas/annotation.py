@@ -0,0 +1,90 @@
+"""Annotation Schemas"""
+from datetime import datetime
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.core.config import settings
+
+
+class AnnotationResponse(BaseModel):
+    """Annotation as returned by the API"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    document_id: str
+    type: str
+    position: dict
+    selected_text: str
+    note_content: Optional[str] = None
+    color: str
+    tags: Optional[list] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class AnnotationPage(BaseModel):
+    """Page of annotations with the cursor of the next page"""
+
+    items: list[AnnotationResponse]
+    next_cursor: Optional[str] = None
+
+
+class AnnotationCreate(BaseModel):
+    """Annotation to create (also the shape of one bulk import item)"""
+
+    type: Literal["highlight", "important", "note", "bookmark"]
+    position: dict
+    selected_text: str = Field(min_length=1)
+    note_content: Optional[str] = None
+    color: Literal["yellow", "red", "green", "blue"] = "yellow"
+    tags: list[str] = Field(default_factory=list)
+    # Original creation time of imported annotations
+    created_at: Optional[datetime] = None
+
+
+class AnnotationUpdate(BaseModel):
+    """Changes to an annotation; omitted fields are left as they are"""
+
+    type: Optional[Literal["highlight", "important", "note", "bookmark"]] = None
+    position: Optional[dict] = None
+    note_content: Optional[str] = None
+    color: Optional[Literal["yellow", "red", "green", "blue"]] = None
+    tags: Optional[list[str]] = None
+
+    @field_validator("type", "position", "color", "tags")
+    @classmethod
+    def _reject_null(cls, value: Any) -> Any:
+        # Omitting a field leaves it unchanged; only note_content can be cleared
+        if value is None:
+            raise ValueError("cannot be null; omit the field to keep its value")
+        return value
+
+
+class AnnotationCreateRequest(AnnotationCreate):
+    """Annotation to create through the API"""
+
+    document_id: str
+
+
+class AnnotationBulkImport(BaseModel):
+    """Bulk import request; items are validated one batch at a time"""
+
+    document_id: str
+    items: list[dict[str, Any]] = Field(max_length=settings.ANNOTATION_IMPORT_MAX_ITEMS)
+
+
+class AnnotationImportError(BaseModel):
+    """Rejected import item"""
+
+    index: int
+    error: str
+
+
+class AnnotationBulkImportResponse(BaseModel):
+    """Result of a bulk import"""
+
+    imported: int
+    ids: list[str]
+    errors: list[AnnotationImportError] = Field(default_factory=list)
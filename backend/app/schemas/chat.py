@@ -0,0 +1,26 @@
+"""Chat Schemas"""
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChatMessageResponse(BaseModel):
+    """Chat message as returned by the API"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    document_id: str
+    role: str
+    content: str
+    sources: Optional[list] = None
+    parent_id: Optional[str] = None
+    created_at: datetime
+
+
+class ChatHistoryPage(BaseModel):
+    """Page of chat messages with the cursor of the next page"""
+
+    items: list[ChatMessageResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,108 @@
+"""Document Schemas"""
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.annotation import AnnotationResponse
+
+
+class DocumentUploadResponse(BaseModel):
+    """Response of a document upload"""
+
+    document_id: str
+    title: str
+    file_hash: str
+    status: str
+    task_id: Optional[str] = None
+
+
+class ProcessingProgress(BaseModel):
+    """Latest ingestion progress event"""
+
+    status: str
+    stage: Optional[str] = None
+    current: int = 0
+    total: int = 0
+    message: Optional[str] = None
+
+
+class DocumentStatusResponse(BaseModel):
+    """Processing status of a document"""
+
+    document_id: str
+    status: str
+    error: Optional[str] = None
+    page_count: Optional[int] = None
+    is_indexed: bool = False
+    progress: Optional[ProcessingProgress] = None
+
+
+class DocumentCard(BaseModel):
+    """Document as shown in lists (loaded with the "document_card" profile)"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    title: str
+    author: Optional[str] = None
+    file_type: str
+    page_count: Optional[int] = None
+    processing_status: str
+    is_indexed: bool
+    content_version: Optional[str] = None  # pass as ?version= to get immutable page/summary URLs
+    current_page: int
+    scroll_position: Optional[float] = None
+    last_read_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class DocumentCardPage(BaseModel):
+    """Page of document cards with the cursor of the next page"""
+
+    items: list[DocumentCard]
+    next_cursor: Optional[str] = None
+
+
+class SummaryBrief(BaseModel):
+    """AI summary as shown in the reader"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    summary_type: str
+    target_section: Optional[str] = None
+    text: str
+
+
+class SummaryResponse(SummaryBrief):
+    """AI summary with its structured content"""
+
+    content: dict
+    guiding_questions: Optional[list] = None
+    updated_at: datetime
+
+
+class DocumentPageText(BaseModel):
+    """Text of one parsed page"""
+
+    number: int
+    text: str
+
+
+class DocumentPages(BaseModel):
+    """Range of parsed pages and the first page of the next range"""
+
+    items: list[DocumentPageText]
+    document_id: str
+    page_count: int
+    next_start: Optional[int] = None
+
+
+class DocumentDetail(DocumentCard):
+    """Document as opened in the reader (loaded with the "document_reader" profile)"""
+
+    word_count: Optional[int] = None
+    annotations: list[AnnotationResponse]
+    ai_summaries: list[SummaryBrief]
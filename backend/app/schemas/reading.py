@@ -0,0 +1,41 @@
+"""Reading Progress Schemas"""
+from datetime import datetime
+from typing import Annotated, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.utils.page_bitmap import MAX_TRACKED_PAGE
+
+
+class ReadingSessionStart(BaseModel):
+    """Request to start a reading session"""
+
+    document_id: str
+
+
+class ReadingSessionResponse(BaseModel):
+    """Reading session as returned by the API"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    document_id: str
+    start_time: datetime
+    end_time: Optional[datetime] = None
+    duration_seconds: int
+    scroll_events: int
+    annotations_made: int
+    questions_asked: int
+
+
+class ProgressUpdate(BaseModel):
+    """Reading position reported by the reader, typically on scroll"""
+
+    document_id: str
+    current_page: int = Field(ge=1)
+    scroll_position: Optional[float] = Field(default=None, ge=0.0, le=1.0)
+    session_id: Optional[str] = None
+    scroll_events: int = Field(default=1, ge=0)
+    pages: list[Annotated[int, Field(ge=1, le=MAX_TRACKED_PAGE)]] = Field(
+        default_factory=list, max_length=1_000
+    )
@@ -0,0 +1,55 @@
+"""Learning Statistics Schemas"""
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DailyStats(BaseModel):
+    """Reading activity on one day"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date
+    reading_seconds: int
+    sessions: int
+    annotations_made: int
+    questions_asked: int
+
+
+class DocumentStats(BaseModel):
+    """Reading activity on one document"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    document_id: str
+    reading_seconds: int
+    sessions: int
+    annotations_made: int
+    questions_asked: int
+    pages_read: int
+    last_read_at: Optional[datetime] = None
+
+
+class DashboardResponse(BaseModel):
+    """Learning statistics dashboard"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    total_reading_time: int
+    documents_read: int
+    questions_asked: int
+    notes_created: int
+    daily: list[DailyStats]
+    recent_documents: list[DocumentStats]
+
+
+class PageCoverageResponse(BaseModel):
+    """Pages of a document read across all sessions"""
+
+    document_id: str
+    pages_read: int
+    page_count: int
+    coverage: float
+    # Inclusive [first, last] ranges of pages not read yet
+    unread: list[tuple[int, int]]
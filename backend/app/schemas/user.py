@@ -0,0 +1,19 @@
+"""User Schemas"""
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.document import DocumentCard
+
+
+class UserProfile(BaseModel):
+    """Current user with counters and documents (loaded with the "user_dashboard" profile)"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    email: str
+    username: str
+    total_reading_time: int
+    documents_read: int
+    questions_asked: int
+    notes_created: int
+    documents: list[DocumentCard]
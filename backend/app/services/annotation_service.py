@@ -0,0 +1,331 @@
+"""Annotation Service"""
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from pydantic import ValidationError
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.base import utcnow
+from app.db.pagination import Page, keyset_paginate
+from app.models import Annotation, Document, ReadingSession, User
+from app.schemas.annotation import AnnotationCreate, AnnotationUpdate
+from app.utils.ids import generate_id
+
+# Columns written by export_annotations, in output order
+EXPORT_COLUMNS = (
+    Annotation.id,
+    Annotation.type,
+    Annotation.position,
+    Annotation.selected_text,
+    Annotation.note_content,
+    Annotation.color,
+    Annotation.tags,
+    Annotation.created_at,
+    Annotation.updated_at,
+)
+
+
+@dataclass
+class AnnotationImportResult:
+    """Outcome of a bulk import"""
+
+    ids: list[str] = field(default_factory=list)
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def imported(self) -> int:
+        return len(self.ids)
+
+
+async def annotation_state(
+    db: AsyncSession, user_id: str, document_id: str
+) -> Optional[tuple[int, Optional[datetime]]]:
+    """
+    Summarize a reader's annotations on a document, to validate cached lists.
+
+    Any create, update or delete changes the count or the latest updated_at.
+
+    Args:
+        db: Database session
+        user_id: Reader (must own the document)
+        document_id: Annotated document
+
+    Returns:
+        (annotation count, latest updated_at), or None if the document is not
+        the reader's
+    """
+    state = (await db.execute(
+        select(func.count(Annotation.id), func.max(Annotation.updated_at))
+        .select_from(Document)
+        .outerjoin(Annotation, and_(
+            Annotation.document_id == Document.id,
+            Annotation.user_id == user_id,
+        ))
+        .where(Document.id == document_id, Document.user_id == user_id)
+        .group_by(Document.id)
+    )).one_or_none()
+    return None if state is None else (state[0], state[1])
+
+
+async def list_annotations(
+    db: AsyncSession,
+    user_id: str,
+    document_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    descending: bool = False,
+) -> Page[Annotation]:
+    """
+    List a reader's annotations on a document in creation order.
+
+    Served by ix_annotations_user_document_created: the filter and the
+    (created_at, id) seek are one index range scan.
+
+    Args:
+        db: Database session
+        user_id: Annotation owner
+        document_id: Annotated document
+        cursor: next_cursor of the previous page
+        limit: Page size
+        descending: Newest first
+
+    Returns:
+        Page of annotations
+    """
+    stmt = select(Annotation).where(
+        Annotation.user_id == user_id,
+        Annotation.document_id == document_id,
+    )
+    return await keyset_paginate(
+        db, stmt, [Annotation.created_at, Annotation.id], cursor, limit, descending
+    )
+
+
+async def create_annotation(
+    db: AsyncSession, user_id: str, document_id: str, data: AnnotationCreate
+) -> Annotation:
+    """
+    Create one annotation and count it like an imported one.
+
+    Args:
+        db: Database session
+        user_id: Annotation owner (must own the document)
+        document_id: Annotated document
+        data: Annotation fields
+
+    Returns:
+        The new annotation
+    """
+    now = utcnow()
+    annotation = Annotation(
+        id=generate_id("ann"),
+        user_id=user_id,
+        document_id=document_id,
+        type=data.type,
+        position=data.position,
+        selected_text=data.selected_text,
+        note_content=data.note_content,
+        color=data.color,
+        tags=data.tags,
+        created_at=data.created_at or now,
+        updated_at=now,
+    )
+    db.add(annotation)
+    await _bump_counters(db, user_id, document_id, [{"type": data.type}])
+    await db.commit()
+    return annotation
+
+
+async def update_annotation(
+    db: AsyncSession, user_id: str, annotation_id: str, changes: AnnotationUpdate
+) -> Optional[Annotation]:
+    """
+    Apply changes to a reader's annotation.
+
+    Returns:
+        The updated annotation, or None if the reader has no such annotation
+    """
+    annotation = await db.scalar(
+        select(Annotation).where(Annotation.id == annotation_id, Annotation.user_id == user_id)
+    )
+    if annotation is None:
+        return None
+    for name, value in changes.model_dump(exclude_unset=True).items():
+        setattr(annotation, name, value)
+    await db.commit()
+    return annotation
+
+
+async def delete_annotation(db: AsyncSession, user_id: str, annotation_id: str) -> Optional[str]:
+    """
+    Delete a reader's annotation.
+
+    Returns:
+        ID of the document it annotated, or None if the reader has no such annotation
+    """
+    document_id = (await db.execute(
+        delete(Annotation)
+        .where(Annotation.id == annotation_id, Annotation.user_id == user_id)
+        .returning(Annotation.document_id)
+    )).scalar_one_or_none()
+    await db.commit()
+    return document_id
+
+
+def _validate_batch(
+    items: Sequence[dict[str, Any]],
+    offset: int,
+    user_id: str,
+    document_id: str,
+    result: AnnotationImportResult,
+) -> list[dict[str, Any]]:
+    """Validate one batch of import items into insert parameter rows"""
+    now = utcnow()
+    rows: list[dict[str, Any]] = []
+    for index, item in enumerate(items, start=offset):
+        try:
+            data = AnnotationCreate.model_validate(item)
+        except ValidationError as error:
+            first = error.errors()[0]
+            location = ".".join(str(part) for part in first["loc"])
+            result.errors.append((index, f"{location}: {first['msg']}" if location else first["msg"]))
+            continue
+        rows.append({
+            "id": generate_id("ann"),
+            "user_id": user_id,
+            "document_id": document_id,
+            "type": data.type,
+            "position": data.position,
+            "selected_text": data.selected_text,
+            "note_content": data.note_content,
+            "color": data.color,
+            "tags": data.tags,
+            # Microsecond steps keep import order under (created_at, id) ordering
+            "created_at": data.created_at or now + timedelta(microseconds=len(rows)),
+            "updated_at": now,
+        })
+    return rows
+
+
+async def import_annotations(
+    db: AsyncSession,
+    user_id: str,
+    document_id: str,
+    items: Sequence[dict[str, Any]],
+    batch_size: int = settings.ANNOTATION_IMPORT_BATCH_SIZE,
+) -> AnnotationImportResult:
+    """
+    Import annotations in batches.
+
+    Each batch is validated, inserted with multi-row INSERT statements
+    (insertmanyvalues; IDs are generated client-side, so nothing needs to be
+    returned) and committed together with one counter UPDATE per table, so a
+    batch costs a handful of round trips instead of one per annotation. Invalid items are reported and skipped;
+    batches committed before a failure stay imported.
+
+    Args:
+        db: Database session
+        user_id: Importing user
+        document_id: Document the annotations belong to
+        items: Raw annotation dicts (see AnnotationCreate)
+        batch_size: Items per transaction
+
+    Returns:
+        AnnotationImportResult with the new IDs and per-item errors
+    """
+    result = AnnotationImportResult()
+    batch_size = max(1, batch_size)
+
+    for offset in range(0, len(items), batch_size):
+        rows = _validate_batch(
+            items[offset:offset + batch_size], offset, user_id, document_id, result
+        )
+        if not rows:
+            continue
+
+        # render_nulls keeps rows with and without note_content in one statement
+        await db.execute(insert(Annotation).execution_options(render_nulls=True), rows)
+        result.ids.extend(row["id"] for row in rows)
+        await _bump_counters(db, user_id, document_id, rows)
+        await db.commit()
+
+    return result
+
+
+async def _bump_counters(
+    db: AsyncSession, user_id: str, document_id: str, rows: Sequence[dict[str, Any]]
+) -> None:
+    """Add a batch to the user's and the active reading session's counters"""
+    notes = sum(1 for row in rows if row["type"] == "note")
+    if notes:
+        await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(notes_created=User.notes_created + notes)
+            .execution_options(synchronize_session=False)
+        )
+
+    active_session = (
+        select(ReadingSession.id)
+        .where(
+            ReadingSession.user_id == user_id,
+            ReadingSession.document_id == document_id,
+            ReadingSession.end_time.is_(None),
+        )
+        .order_by(ReadingSession.start_time.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(ReadingSession)
+        .where(ReadingSession.id == active_session)
+        .values(annotations_made=ReadingSession.annotations_made + len(rows))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def export_annotations(
+    session_maker: async_sessionmaker[AsyncSession],
+    user_id: str,
+    document_id: str,
+    fetch_size: int = settings.ANNOTATION_EXPORT_FETCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a reader's annotations on a document as NDJSON.
+
+    Rows are read through a server-side cursor fetch_size at a time as plain
+    tuples (no ORM identity map), so memory stays flat however many
+    annotations there are. Lines can be fed back to import_annotations.
+
+    Args:
+        session_maker: Session factory; the session lives as long as the stream
+        user_id: Annotation owner
+        document_id: Annotated document
+        fetch_size: Rows per fetch
+
+    Yields:
+        NDJSON chunks, one line per annotation
+    """
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .where(Annotation.user_id == user_id, Annotation.document_id == document_id)
+        .order_by(Annotation.created_at, Annotation.id)
+        .execution_options(yield_per=fetch_size)
+    )
+    async with session_maker() as session:
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            yield "".join(
+                json.dumps(row._asdict(), ensure_ascii=False, default=_json_default) + "\n"
+                for row in rows
+            ).encode("utf-8")
@@ -0,0 +1,42 @@
+"""Chat Service"""
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.pagination import Page, keyset_paginate
+from app.models import ChatMessage
+
+
+async def list_chat_history(
+    db: AsyncSession,
+    document_id: str,
+    user_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    descending: bool = True,
+) -> Page[ChatMessage]:
+    """
+    List the chat messages of a document by time.
+
+    Uses ix_chat_messages_user_document_created when filtered by user and
+    ix_chat_messages_document_created otherwise. Defaults to newest first, the
+    order a chat panel loads history in while scrolling up.
+
+    Args:
+        db: Database session
+        document_id: Document the conversation is about
+        user_id: Restrict to one reader's messages
+        cursor: next_cursor of the previous page
+        limit: Page size
+        descending: Newest first
+
+    Returns:
+        Page of chat messages
+    """
+    stmt = select(ChatMessage).where(ChatMessage.document_id == document_id)
+    if user_id is not None:
+        stmt = stmt.where(ChatMessage.user_id == user_id)
+    return await keyset_paginate(
+        db, stmt, [ChatMessage.created_at, ChatMessage.id], cursor, limit, descending
+    )
@@ -0,0 +1,395 @@
+"""Real-time Annotation and Reading Position Sync"""
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, cast
+
+from redis.asyncio.client import PubSub
+
+from app.core.cache import CacheManager, cache_manager
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Cursor of a stream with no frames yet
+START_CURSOR = "0-0"
+
+# XRANGE / XREVRANGE reply (the client decodes responses to str)
+StreamEntries = list[tuple[str, dict[str, str]]]
+
+sync_connections = metrics_registry.gauge(
+    "readpilot_sync_connections",
+    "Open sync WebSocket connections on this worker",
+)
+sync_frames_published = metrics_registry.counter(
+    "readpilot_sync_frames_published",
+    "Delta frames published to sync streams",
+)
+sync_changes_coalesced = metrics_registry.counter(
+    "readpilot_sync_changes_coalesced",
+    "Changes merged into a pending frame instead of sent on their own",
+)
+
+
+def sync_channel(user_id: str, document_id: str) -> str:
+    """Redis pub/sub channel carrying a reader's live frames for a document"""
+    return f"sync:{user_id}:{document_id}"
+
+
+def sync_stream_key(user_id: str, document_id: str) -> str:
+    """Redis stream keeping recent frames, so reconnecting clients can resume"""
+    return f"sync:{user_id}:{document_id}:stream"
+
+
+def parse_cursor(cursor: str) -> Optional[tuple[int, int]]:
+    """Parse a cursor (Redis stream ID "<ms>-<seq>") into a comparable tuple"""
+    ms, _, seq = cursor.partition("-")
+    if not (ms.isdigit() and seq.isdigit()):
+        return None
+    return int(ms), int(seq)
+
+
+@dataclass
+class SyncDelta:
+    """
+    Changes to one reader's view of a document, coalesced.
+
+    Annotations are keyed by ID, so repeated edits collapse to the latest
+    state and a deletion cancels earlier upserts; only the last reading
+    position is kept. `reload` (after bulk imports) tells clients to refetch
+    the annotation list, which supersedes any individual changes.
+    """
+
+    upserted: dict[str, dict[str, Any]] = field(default_factory=dict)
+    deleted: dict[str, None] = field(default_factory=dict)  # ordered set
+    current_page: Optional[int] = None
+    reload: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.reload or self.upserted or self.deleted or self.current_page is not None)
+
+    def upsert(self, annotation: dict[str, Any]) -> None:
+        if not self.reload:
+            self.deleted.pop(annotation["id"], None)
+            self.upserted[annotation["id"]] = annotation
+
+    def delete(self, annotation_id: str) -> None:
+        if not self.reload:
+            self.upserted.pop(annotation_id, None)
+            self.deleted[annotation_id] = None
+
+    def merge(self, newer: "SyncDelta") -> None:
+        """Fold a later delta into this one"""
+        if newer.reload:
+            self.reload = True
+            self.upserted.clear()
+            self.deleted.clear()
+        for annotation_id in newer.deleted:
+            self.delete(annotation_id)
+        for annotation in newer.upserted.values():
+            self.upsert(annotation)
+        if newer.current_page is not None:
+            self.current_page = newer.current_page
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "annotations": list(self.upserted.values()),
+            "deleted": list(self.deleted),
+            "current_page": self.current_page,
+            "reload": self.reload,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SyncDelta":
+        return cls(
+            upserted={annotation["id"]: annotation for annotation in data.get("annotations", [])},
+            deleted=dict.fromkeys(data.get("deleted", [])),
+            current_page=data.get("current_page"),
+            reload=data.get("reload", False),
+        )
+
+
+def delta_frame(cursor: str, delta: SyncDelta) -> dict[str, Any]:
+    """Frame sent to clients for a delta; cursor is the last stream entry it covers"""
+    return {"type": "delta", "cursor": cursor, **delta.to_dict()}
+
+
+class SyncPublisher:
+    """
+    Coalesce annotation and reading position changes and publish them.
+
+    Changes are merged per (user, document) for `window` seconds, then each
+    pair's delta is appended to its Redis stream (trimmed to maxlen, so
+    clients can resume from a cursor) and published on its channel for the
+    sockets connected to any worker. A flush costs two round trips however
+    many pairs changed. Publishing is best effort: the database stays the
+    source of truth, and changes lost while Redis is down only reach other
+    devices when they next reload.
+    """
+
+    def __init__(
+        self,
+        cache: CacheManager = cache_manager,
+        window: float = settings.SYNC_BATCH_WINDOW,
+        maxlen: int = settings.SYNC_STREAM_MAXLEN,
+        ttl: int = settings.SYNC_STREAM_TTL,
+    ):
+        self.cache = cache
+        self.window = window
+        self.maxlen = maxlen
+        self.ttl = ttl
+        self._pending: dict[tuple[str, str], SyncDelta] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _record(self, user_id: str, document_id: str, delta: SyncDelta) -> None:
+        pending = self._pending.get((user_id, document_id))
+        if pending is None:
+            self._pending[(user_id, document_id)] = delta
+        else:
+            pending.merge(delta)
+            sync_changes_coalesced.inc()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_later(), name="sync-flush")
+
+    def annotations_changed(
+        self,
+        user_id: str,
+        document_id: str,
+        upserted: Iterable[dict[str, Any]] = (),
+        deleted: Iterable[str] = (),
+    ) -> None:
+        """
+        Record annotation changes.
+
+        Args:
+            user_id: Annotation owner
+            document_id: Annotated document
+            upserted: Created or updated annotations, JSON-ready (AnnotationResponse)
+            deleted: IDs of deleted annotations
+        """
+        delta = SyncDelta()
+        for annotation_id in deleted:
+            delta.delete(annotation_id)
+        for annotation in upserted:
+            delta.upsert(annotation)
+        if delta:
+            self._record(user_id, document_id, delta)
+
+    def annotations_reloaded(self, user_id: str, document_id: str) -> None:
+        """Record a change too large to push (bulk import): clients refetch the list"""
+        self._record(user_id, document_id, SyncDelta(reload=True))
+
+    def page_changed(self, user_id: str, document_id: str, current_page: int) -> None:
+        """Record a new reading position"""
+        self._record(user_id, document_id, SyncDelta(current_page=current_page))
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        try:
+            await self.flush()
+        except Exception as error:
+            logger.warning("Sync publish failed, changes dropped: %s", error)
+
+    async def flush(self) -> int:
+        """
+        Publish all pending deltas now.
+
+        Returns:
+            Number of (user, document) pairs published
+        """
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        redis = self.cache.redis
+        async with redis.pipeline(transaction=False) as pipe:
+            for (user_id, document_id), delta in batch.items():
+                stream = sync_stream_key(user_id, document_id)
+                pipe.xadd(
+                    stream,
+                    {"delta": json.dumps(delta.to_dict(), ensure_ascii=False)},
+                    maxlen=self.maxlen,
+                    approximate=False,
+                )
+                pipe.expire(stream, self.ttl)
+            results = await pipe.execute()
+
+        # Stream IDs are only known once appended; publish them as cursors
+        async with redis.pipeline(transaction=False) as pipe:
+            for ((user_id, document_id), delta), cursor in zip(batch.items(), results[::2]):
+                pipe.publish(
+                    sync_channel(user_id, document_id),
+                    json.dumps(delta_frame(cursor, delta), ensure_ascii=False),
+                )
+            await pipe.execute()
+
+        sync_frames_published.inc(len(batch))
+        return len(batch)
+
+    async def stop(self) -> None:
+        """Cancel the pending flush and publish what is buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as error:
+            logger.warning("Final sync publish failed: %s", error)
+
+
+async def latest_cursor(cache: CacheManager, user_id: str, document_id: str) -> str:
+    """Cursor of the newest frame of a stream (START_CURSOR if it has none)"""
+    entries = cast(
+        StreamEntries,
+        await cache.redis.xrevrange(sync_stream_key(user_id, document_id), count=1),
+    )
+    return entries[0][0] if entries else START_CURSOR
+
+
+async def replay(
+    cache: CacheManager,
+    user_id: str,
+    document_id: str,
+    cursor: str,
+    maxlen: int = settings.SYNC_STREAM_MAXLEN,
+) -> Optional[tuple[str, SyncDelta]]:
+    """
+    Collect the frames a client missed since a cursor, as one delta.
+
+    Args:
+        cache: Cache manager
+        user_id: Reader
+        document_id: Document
+        cursor: Last cursor the client applied
+        maxlen: Stream length limit (a full stream may have dropped frames)
+
+    Returns:
+        (new cursor, merged delta), or None if the cursor is too old (its
+        frames were trimmed or expired) and the client must reload
+    """
+    if parse_cursor(cursor) is None:
+        return None
+    stream = sync_stream_key(user_id, document_id)
+    redis = cache.redis
+    if cursor == START_CURSOR:
+        # Nothing seen yet: resumable as long as nothing was trimmed either
+        if await redis.xlen(stream) >= maxlen:
+            return None
+    elif not await redis.xrange(stream, cursor, cursor):
+        # Trimming removes the oldest frames first; if the cursor's own frame
+        # is still there, everything after it is too
+        return None
+
+    delta = SyncDelta()
+    entries = cast(StreamEntries, await redis.xrange(stream, f"({cursor}", "+"))
+    for entry_id, fields in entries:
+        delta.merge(SyncDelta.from_dict(json.loads(fields["delta"])))
+        cursor = entry_id
+    return cursor, delta
+
+
+class Subscription:
+    """Frames of one channel delivered to one socket"""
+
+    def __init__(self, channel: str, size: int):
+        self.channel = channel
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(size)
+        # Set when frames were dropped because the socket could not keep up;
+        # the socket then replays from the stream instead
+        self.overflowed = False
+
+    def deliver(self, frame: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class SyncHub:
+    """
+    Fan frames out from Redis to this worker's sockets.
+
+    One pub/sub connection per worker is shared by all sockets: a channel is
+    subscribed while at least one local socket watches it, and each frame is
+    decoded once and queued for every watching socket.
+    """
+
+    def __init__(self, cache: CacheManager = cache_manager, queue_size: int = settings.SYNC_QUEUE_SIZE):
+        self.cache = cache
+        self.queue_size = queue_size
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self._pubsub: Optional[PubSub] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, user_id: str, document_id: str) -> Subscription:
+        """Start receiving a (user, document) channel's frames"""
+        subscription = Subscription(sync_channel(user_id, document_id), self.queue_size)
+        async with self._lock:
+            pubsub = self._pubsub
+            if pubsub is None:
+                pubsub = self._pubsub = self.cache.redis.pubsub()
+            watchers = self._subscriptions.setdefault(subscription.channel, set())
+            if not watchers:
+                await pubsub.subscribe(subscription.channel)
+            watchers.add(subscription)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read(pubsub), name="sync-hub")
+        sync_connections.inc()
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop receiving frames"""
+        sync_connections.dec()
+        async with self._lock:
+            watchers = self._subscriptions.get(subscription.channel)
+            if watchers is None:
+                return
+            watchers.discard(subscription)
+            if not watchers:
+                del self._subscriptions[subscription.channel]
+                if self._pubsub is not None:
+                    await self._pubsub.unsubscribe(subscription.channel)
+
+    async def _read(self, pubsub: PubSub) -> None:
+        while True:
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception as error:
+                logger.warning("Sync hub read failed: %s", error)
+                # Sockets replay from the stream once their queue overflows or
+                # they reconnect; mark everyone so nothing is silently lost
+                for subscriptions in self._subscriptions.values():
+                    for subscription in subscriptions:
+                        subscription.overflowed = True
+                await asyncio.sleep(1.0)
+                continue
+            if message is None:
+                continue
+            watchers = self._subscriptions.get(message["channel"])
+            if watchers:
+                frame = json.loads(message["data"])
+                for subscription in watchers:
+                    subscription.deliver(frame)
+
+    async def stop(self) -> None:
+        """Stop the reader and close the pub/sub connection"""
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        self._subscriptions.clear()
+
+
+# Global instances
+sync_publisher = SyncPublisher()
+sync_hub = SyncHub()
@@ -0,0 +1,346 @@
+"""Write-Coalescing Buffer for Reading Progress"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Optional, cast
+
+from sqlalchemy import Table, bindparam, func, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+from app.db.base import utcnow
+from app.db.session import async_session_maker
+from app.db.upsert import upsert
+from app.models import Document, ReadingSession, UserDocumentStats
+from app.utils.page_bitmap import bitmap_count, bitmap_or, pages_to_bitmap
+
+logger = logging.getLogger(__name__)
+
+progress_updates = metrics_registry.counter(
+    "readpilot_progress_updates",
+    "Reading progress updates received from readers",
+)
+progress_rows_written = metrics_registry.counter(
+    "readpilot_progress_rows_written",
+    "Rows updated by reading progress flushes",
+    ["table"],
+)
+progress_flush_seconds = metrics_registry.histogram(
+    "readpilot_progress_flush_seconds",
+    "Duration of reading progress flushes",
+)
+progress_pending = metrics_registry.gauge(
+    "readpilot_progress_pending",
+    "(user, document) pairs with buffered progress not yet written",
+)
+
+_documents = cast(Table, Document.__table__)
+_sessions = cast(Table, ReadingSession.__table__)
+_stats = cast(Table, UserDocumentStats.__table__)
+
+# Updates are keyed on the owner as well, so progress for a document or session
+# the reader doesn't own is a no-op and recording needs no ownership query.
+# Last write wins by read time, so a delayed flush (or another worker process
+# flushing the same reader) never moves the position backwards
+_update_document = (
+    update(_documents)
+    .where(_documents.c.id == bindparam("b_document_id"))
+    .where(_documents.c.user_id == bindparam("b_user_id"))
+    .where(or_(
+        _documents.c.last_read_at.is_(None),
+        _documents.c.last_read_at <= bindparam("b_read_at"),
+    ))
+    .values(
+        current_page=bindparam("b_page"),
+        scroll_position=func.coalesce(bindparam("b_scroll"), _documents.c.scroll_position),
+        last_read_at=bindparam("b_read_at"),
+    )
+)
+
+_update_session = (
+    update(_sessions)
+    .where(_sessions.c.id == bindparam("b_session_id"))
+    .where(_sessions.c.user_id == bindparam("b_user_id"))
+    .where(_sessions.c.end_time.is_(None))
+    .values(scroll_events=_sessions.c.scroll_events + bindparam("b_scroll_events"))
+)
+
+
+@dataclass
+class PendingProgress:
+    """Progress of one reader in one document, merged since the last flush"""
+
+    user_id: str
+    document_id: str
+    current_page: int
+    read_at: datetime
+    scroll_position: Optional[float] = None
+    session_id: Optional[str] = None
+    scroll_events: int = 0
+    pages: set[int] = field(default_factory=set)
+
+    def merge(self, newer: "PendingProgress") -> None:
+        """Fold a later update into this one (positions replaced, counters summed)"""
+        if newer.read_at >= self.read_at:
+            self.current_page = newer.current_page
+            self.read_at = newer.read_at
+            if newer.scroll_position is not None:
+                self.scroll_position = newer.scroll_position
+        if newer.session_id is not None and newer.session_id != self.session_id:
+            # A new session starts a new set of deltas; the old ones are flushed separately
+            raise ValueError("Cannot merge progress of different reading sessions")
+        self.scroll_events += newer.scroll_events
+        self.pages |= newer.pages
+
+
+class ProgressBuffer:
+    """
+    Coalesce reading progress updates in memory and write them in batches.
+
+    Readers report progress on every scroll. Updates are merged per
+    (user, document) and flushed every flush_interval seconds as one
+    executemany statement per table, so each active reader costs at most one
+    document, session and page coverage row write per interval. Ending a session
+    flushes its pair immediately, and stop() flushes everything left, so the
+    final position is always written; only a crash can drop the last interval.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+        flush_interval: float = settings.PROGRESS_FLUSH_INTERVAL,
+        max_pending: int = settings.PROGRESS_BUFFER_MAX_PENDING,
+    ):
+        self.session_maker = session_maker
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: dict[tuple[str, str], PendingProgress] = {}
+        # Deltas of earlier sessions whose flush failed after the reader had
+        # moved on to a new session; written with the next flush of the pair
+        self._superseded: dict[tuple[str, str], list[PendingProgress]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the periodic flush task"""
+        if not self.running:
+            self._task = asyncio.create_task(self._flush_loop(), name="progress-flush")
+
+    async def stop(self) -> None:
+        """Stop the flush task and write everything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Reading progress flush failed; retrying next interval")
+
+    async def record(
+        self,
+        user_id: str,
+        document_id: str,
+        current_page: int,
+        scroll_position: Optional[float] = None,
+        session_id: Optional[str] = None,
+        scroll_events: int = 0,
+        pages: Iterable[int] = (),
+    ) -> None:
+        """
+        Buffer a progress update.
+
+        Args:
+            user_id: Reader
+            document_id: Document being read
+            current_page: Page the reader is on
+            scroll_position: Position within the document (0.0 to 1.0)
+            session_id: Reading session to attribute scroll events and pages to
+            scroll_events: Scroll events since the previous update
+            pages: Pages viewed since the previous update
+        """
+        progress_updates.inc()
+        update_ = PendingProgress(
+            user_id=user_id,
+            document_id=document_id,
+            current_page=current_page,
+            read_at=utcnow(),
+            scroll_position=scroll_position,
+            session_id=session_id,
+            scroll_events=scroll_events,
+            pages=set(pages),
+        )
+        key = (user_id, document_id)
+        pending = self._pending.get(key)
+        if pending is not None and update_.session_id not in (None, pending.session_id):
+            # Reader switched sessions: write the old session's deltas first
+            await self.flush_key(user_id, document_id)
+            pending = None
+
+        if pending is None:
+            self._pending[key] = update_
+        else:
+            pending.merge(update_)
+        progress_pending.set(len(self._pending))
+
+        if len(self._pending) >= self.max_pending and not self._lock.locked():
+            await self.flush()
+
+    async def flush_key(self, user_id: str, document_id: str) -> None:
+        """
+        Write the buffered progress of one (user, document) pair now.
+
+        Waits for a flush already in flight, which may hold the pair's
+        progress, so the pair is in the database when this returns.
+        """
+        async with self._lock:
+            batch = self._superseded.pop((user_id, document_id), [])
+            pending = self._pending.pop((user_id, document_id), None)
+            if pending is not None:
+                batch.append(pending)
+            progress_pending.set(len(self._pending))
+            if batch:
+                await self._write(batch)
+
+    async def flush(self) -> int:
+        """
+        Write all buffered progress.
+
+        Returns:
+            Number of (user, document) pairs written
+        """
+        async with self._lock:
+            # Superseded sessions first: positions are last-write-wins by read time
+            batch = [p for held in self._superseded.values() for p in held]
+            batch += self._pending.values()
+            self._pending, self._superseded = {}, {}
+            progress_pending.set(0)
+            if batch:
+                await self._write(batch)
+            return len(batch)
+
+    async def _write(self, batch: list[PendingProgress]) -> None:
+        started = time.perf_counter()
+        try:
+            async with self.session_maker() as session:
+                await self._write_documents(session, batch)
+                await self._write_sessions(session, [p for p in batch if p.session_id])
+                await self._write_coverage(session, [p for p in batch if p.pages])
+                await session.commit()
+        except Exception:
+            self._requeue(batch)
+            raise
+        finally:
+            progress_flush_seconds.observe(time.perf_counter() - started)
+
+    async def _write_documents(self, session: AsyncSession, batch: list[PendingProgress]) -> None:
+        await session.execute(_update_document, [
+            {
+                "b_document_id": p.document_id,
+                "b_user_id": p.user_id,
+                "b_read_at": p.read_at,
+                "b_page": p.current_page,
+                "b_scroll": p.scroll_position,
+            }
+            for p in batch
+        ])
+        progress_rows_written.labels(table="documents").inc(len(batch))
+
+    async def _write_sessions(self, session: AsyncSession, batch: list[PendingProgress]) -> None:
+        batch = [p for p in batch if p.scroll_events]
+        if not batch:
+            return
+        await session.execute(_update_session, [
+            {
+                "b_session_id": p.session_id,
+                "b_user_id": p.user_id,
+                "b_scroll_events": p.scroll_events,
+            }
+            for p in batch
+        ])
+        progress_rows_written.labels(table="reading_sessions").inc(len(batch))
+
+    async def _write_coverage(self, session: AsyncSession, batch: list[PendingProgress]) -> None:
+        """OR the pages of a batch into each reader's page coverage bitmap"""
+        if not batch:
+            return
+        # Owned documents of the batch with their current bitmaps, in one query.
+        # Locking the document rows serializes concurrent merges across processes.
+        stats = UserDocumentStats
+        rows = (await session.execute(
+            select(Document.user_id, Document.id, stats.page_bitmap)
+            .outerjoin(stats, (stats.document_id == Document.id) & (stats.user_id == Document.user_id))
+            .where(tuple_(Document.user_id, Document.id).in_(
+                [(p.user_id, p.document_id) for p in batch]
+            ))
+            .with_for_update(of=Document)
+        )).all()
+        existing = {(user_id, document_id): bitmap for user_id, document_id, bitmap in rows}
+
+        # A pair appears more than once when a superseded session is flushed
+        # with its successor; one upsert row per pair
+        pages: dict[tuple[str, str], set[int]] = {}
+        for p in batch:
+            pages.setdefault((p.user_id, p.document_id), set()).update(p.pages)
+
+        params = []
+        for (user_id, document_id), viewed in pages.items():
+            if (user_id, document_id) not in existing:
+                continue
+            merged = bitmap_or(existing[user_id, document_id] or b"", pages_to_bitmap(viewed))
+            params.append({
+                "user_id": user_id,
+                "document_id": document_id,
+                "page_bitmap": merged,
+                "pages_read": bitmap_count(merged),
+            })
+        if not params:
+            return
+
+        stmt = upsert(session, _stats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "document_id"],
+            set_={
+                "page_bitmap": stmt.excluded.page_bitmap,
+                "pages_read": stmt.excluded.pages_read,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await session.execute(stmt, params)
+        progress_rows_written.labels(table="user_document_stats").inc(len(params))
+
+    def _requeue(self, batch: list[PendingProgress]) -> None:
+        """Put a failed batch back, under any updates that arrived meanwhile"""
+        for failed in batch:
+            key = (failed.user_id, failed.document_id)
+            newer = self._pending.get(key)
+            if newer is not None and newer.session_id not in (None, failed.session_id):
+                # Different sessions can't be merged: keep the older one's scroll
+                # events and pages aside until the pair is flushed again
+                older, current = sorted((failed, newer), key=lambda p: p.read_at)
+                self._superseded.setdefault(key, []).append(older)
+                self._pending[key] = current
+                continue
+            if newer is not None:
+                failed.merge(newer)
+            self._pending[key] = failed
+        progress_pending.set(len(self._pending))
+
+
+# Global buffer instance
+progress_buffer = ProgressBuffer()
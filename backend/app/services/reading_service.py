@@ -0,0 +1,95 @@
+"""Reading Session Service"""
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import utcnow
+from app.models import ReadingSession
+from app.services import stats_service
+from app.services.progress_buffer import ProgressBuffer, progress_buffer
+from app.utils.ids import generate_id
+
+
+async def start_session(db: AsyncSession, user_id: str, document_id: str) -> ReadingSession:
+    """
+    Start a reading session.
+
+    Args:
+        db: Database session
+        user_id: Reader
+        document_id: Document being read (ownership checked by the caller)
+
+    Returns:
+        The new ReadingSession
+    """
+    session = ReadingSession(
+        id=generate_id("rs"),
+        user_id=user_id,
+        document_id=document_id,
+        start_time=utcnow(),
+    )
+    db.add(session)
+    await db.commit()
+    return session
+
+
+async def end_session(
+    db: AsyncSession,
+    user_id: str,
+    session_id: str,
+    buffer: ProgressBuffer = progress_buffer,
+) -> Optional[ReadingSession]:
+    """
+    End a reading session, writing its buffered progress first.
+
+    end_time is claimed with a conditional UPDATE, so when the same session
+    is ended concurrently only one caller wins and rolls its counters up into
+    the learning statistics tables, in the same transaction.
+
+    Args:
+        db: Database session
+        user_id: Reader
+        session_id: Session to end
+        buffer: Progress buffer holding the session's pending updates
+
+    Returns:
+        The ended ReadingSession, or None if it doesn't belong to the user
+    """
+    session = await db.get(ReadingSession, session_id)
+    if session is None or session.user_id != user_id:
+        return None
+    if session.end_time is not None:
+        return session
+
+    await buffer.flush_key(user_id, session.document_id)
+
+    end_time = utcnow()
+    claimed = (await db.execute(
+        update(ReadingSession)
+        .where(
+            ReadingSession.id == session_id,
+            ReadingSession.user_id == user_id,
+            ReadingSession.end_time.is_(None),
+        )
+        .values(end_time=end_time)
+        .returning(ReadingSession.id)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    if claimed is None:
+        # Ended by a concurrent request, which rolled it up
+        await db.rollback()
+        await db.refresh(session)
+        return session
+
+    # Counters are final once end_time is set (progress writes skip ended sessions)
+    await db.refresh(session)
+    session.end_time = end_time
+    start_time = session.start_time
+    if start_time.tzinfo is None:
+        # SQLite returns naive datetimes
+        start_time = start_time.replace(tzinfo=end_time.tzinfo)
+    session.duration_seconds = max(0, int((end_time - start_time).total_seconds()))
+    await stats_service.record_session(db, session)
+    await db.commit()
+    return session
@@ -0,0 +1,252 @@
+"""Learning Statistics Service"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.upsert import upsert
+from app.models import Document, ReadingSession, User, UserDailyStats, UserDocumentStats
+from app.utils.page_bitmap import unread_ranges
+
+
+@dataclass
+class Dashboard:
+    """Learning statistics of one user"""
+
+    total_reading_time: int = 0
+    documents_read: int = 0
+    questions_asked: int = 0
+    notes_created: int = 0
+    daily: list[UserDailyStats] = field(default_factory=list)
+    recent_documents: list[UserDocumentStats] = field(default_factory=list)
+
+
+@dataclass
+class PageCoverage:
+    """How much of a document a reader has read, across all sessions"""
+
+    pages_read: int
+    page_count: int
+    unread: list[tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def fraction(self) -> float:
+        return min(1.0, self.pages_read / self.page_count) if self.page_count else 0.0
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; they are stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _session_counters(session: ReadingSession) -> dict[str, int]:
+    """Counters a finished session adds to both aggregate tables"""
+    return {
+        "reading_seconds": session.duration_seconds,
+        "sessions": 1,
+        "scroll_events": session.scroll_events,
+        "annotations_made": session.annotations_made,
+        "questions_asked": session.questions_asked,
+    }
+
+
+async def _upsert_add(
+    db: AsyncSession,
+    model: Any,
+    key: dict[str, Any],
+    counters: dict[str, int],
+    replace: Optional[dict[str, Any]] = None,
+) -> int:
+    """
+    Add counters to a rollup row, creating it if missing, in one statement.
+
+    Returns:
+        The row's session count after the update
+    """
+    table = model.__table__
+    now = datetime.now(timezone.utc)
+    stmt = upsert(db, table).values(
+        **key, **counters, **(replace or {}), created_at=now, updated_at=now
+    )
+    set_ = {name: table.c[name] + stmt.excluded[name] for name in counters}
+    set_.update({name: stmt.excluded[name] for name in replace or {}})
+    set_["updated_at"] = now
+    stmt = stmt.on_conflict_do_update(index_elements=list(key), set_=set_)
+    return int((await db.execute(stmt.returning(table.c.sessions))).scalar_one())
+
+
+async def record_session(db: AsyncSession, session: ReadingSession) -> None:
+    """
+    Roll an ended reading session up into the aggregate tables.
+
+    Runs in the caller's transaction, so the rollups commit atomically with
+    the session's end_time: one upsert per aggregate table plus one UPDATE of
+    the user's lifetime counters, whatever the length of the user's history.
+
+    Args:
+        db: Database session (the caller commits)
+        session: Ended ReadingSession with its final counters
+    """
+    counters = _session_counters(session)
+    await _upsert_add(
+        db,
+        UserDailyStats,
+        {"user_id": session.user_id, "day": _as_utc(session.start_time).date()},
+        counters,
+    )
+    document_sessions = await _upsert_add(
+        db,
+        UserDocumentStats,
+        {"user_id": session.user_id, "document_id": session.document_id},
+        counters,
+        {"last_read_at": session.end_time},
+    )
+
+    await db.execute(
+        update(User)
+        .where(User.id == session.user_id)
+        .values(
+            total_reading_time=User.total_reading_time + session.duration_seconds,
+            # First finished session on a document counts it as read
+            documents_read=User.documents_read + (1 if document_sessions == 1 else 0),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def rebuild_user_stats(db: AsyncSession, user_id: str) -> int:
+    """
+    Recompute a user's rollups from the full reading session history.
+
+    For backfilling users whose sessions predate the rollup tables, or for
+    repairing drift; the request path never needs it.
+
+    Args:
+        db: Database session (committed on success)
+        user_id: User to rebuild
+
+    Returns:
+        Number of ended sessions aggregated
+    """
+    # Page coverage is not derived from sessions; carry it over
+    coverage = {
+        document_id: {"page_bitmap": bitmap, "pages_read": count}
+        for document_id, bitmap, count in (await db.execute(
+            select(
+                UserDocumentStats.document_id,
+                UserDocumentStats.page_bitmap,
+                UserDocumentStats.pages_read,
+            ).where(UserDocumentStats.user_id == user_id)
+        )).all()
+    }
+    await db.execute(delete(UserDailyStats).where(UserDailyStats.user_id == user_id))
+    await db.execute(delete(UserDocumentStats).where(UserDocumentStats.user_id == user_id))
+
+    sessions = (await db.scalars(
+        select(ReadingSession)
+        .where(ReadingSession.user_id == user_id, ReadingSession.end_time.is_not(None))
+    )).all()
+
+    daily: dict[date, dict[str, Any]] = {}
+    documents: dict[str, dict[str, Any]] = {}
+    for session in sessions:
+        if session.end_time is None:
+            continue  # excluded by the query; narrows the type
+        counters = _session_counters(session)
+        day = daily.setdefault(_as_utc(session.start_time).date(), dict.fromkeys(counters, 0))
+        doc = documents.setdefault(session.document_id, dict.fromkeys(counters, 0))
+        for name, value in counters.items():
+            day[name] += value
+            doc[name] += value
+        end_time = _as_utc(session.end_time)
+        if doc.get("last_read_at") is None or end_time > doc["last_read_at"]:
+            doc["last_read_at"] = end_time
+    documents_read = len(documents)
+
+    for document_id, pages in coverage.items():
+        documents.setdefault(document_id, {}).update(pages)
+
+    db.add_all(UserDailyStats(user_id=user_id, day=d, **v) for d, v in daily.items())
+    db.add_all(UserDocumentStats(user_id=user_id, document_id=d, **v) for d, v in documents.items())
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            total_reading_time=sum(v["reading_seconds"] for v in daily.values()),
+            documents_read=documents_read,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return len(sessions)
+
+
+async def get_dashboard(db: AsyncSession, user: User, days: int = 30, documents: int = 10) -> Dashboard:
+    """
+    Load a user's dashboard from the rollup tables.
+
+    Both reads are index range scans; no session history is touched.
+
+    Args:
+        db: Database session
+        user: User whose lifetime counters are shown
+        days: Length of the daily series, ending today (UTC)
+        documents: Number of most recently read documents
+
+    Returns:
+        Dashboard
+    """
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    daily = (await db.scalars(
+        select(UserDailyStats)
+        .where(UserDailyStats.user_id == user.id, UserDailyStats.day >= since)
+        .order_by(UserDailyStats.day)
+    )).all()
+    recent = (await db.scalars(
+        select(UserDocumentStats)
+        # Coverage-only rows (no session ended yet) have no last_read_at
+        .where(UserDocumentStats.user_id == user.id, UserDocumentStats.last_read_at.is_not(None))
+        .order_by(UserDocumentStats.last_read_at.desc())
+        .limit(documents)
+    )).all()
+
+    return Dashboard(
+        total_reading_time=user.total_reading_time,
+        documents_read=user.documents_read,
+        questions_asked=user.questions_asked,
+        notes_created=user.notes_created,
+        daily=list(daily),
+        recent_documents=list(recent),
+    )
+
+
+async def get_page_coverage(db: AsyncSession, user_id: str, document: Document) -> PageCoverage:
+    """
+    Compute a reader's page coverage of a document.
+
+    One primary-key read of the bitmap; unread ranges are found by scanning
+    page_count / 8 bytes.
+
+    Args:
+        db: Database session
+        user_id: Reader
+        document: Document (its page_count bounds the result)
+
+    Returns:
+        PageCoverage
+    """
+    bitmap = await db.scalar(
+        select(UserDocumentStats.page_bitmap).where(
+            UserDocumentStats.user_id == user_id,
+            UserDocumentStats.document_id == document.id,
+        )
+    ) or b""
+    page_count = document.page_count or 0
+    unread = unread_ranges(bitmap, page_count)
+    return PageCoverage(
+        pages_read=page_count - sum(last - first + 1 for first, last in unread),
+        page_count=page_count,
+        unread=unread,
+    )
@@ -0,0 +1,24 @@
+"""Celery Application (Redis broker)"""
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "readpilot",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+    include=["app.tasks.document_tasks"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+    # Ingestion jobs are long: only ack after completion and fetch one at a time,
+    # so a crashed worker's job is redelivered and work is spread evenly
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    task_routes={"documents.*": {"queue": "ingestion"}},
+    broker_transport_options={"visibility_timeout": settings.INGESTION_JOB_TIMEOUT * 2},
+    task_time_limit=settings.INGESTION_JOB_TIMEOUT,
+)
@@ -0,0 +1,46 @@
+"""Document Processing Tasks"""
+import asyncio
+from typing import Any, Coroutine, Optional
+
+from app.core.cache import CacheManager
+from app.tasks.celery_app import celery_app
+from app.tasks.pipeline import get_pipeline
+
+# Celery tasks are synchronous; each worker process keeps one event loop so the
+# async engine's pooled connections and the Redis client stay bound to it
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_cache: Optional[CacheManager] = None
+
+
+def _run(coro: Coroutine[Any, Any, Any]) -> Any:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+async def _get_cache() -> CacheManager:
+    global _cache
+    if _cache is None:
+        _cache = CacheManager()
+        await _cache.connect()
+    return _cache
+
+
+async def _process(document_id: str) -> None:
+    pipeline = get_pipeline(await _get_cache())
+    await pipeline.run(document_id)
+
+
+@celery_app.task(name="documents.process")
+def process_document(document_id: str) -> None:
+    """
+    Run the ingestion pipeline for a document.
+
+    Failures are recorded on the Document row by the pipeline; the task is not
+    retried automatically since parse errors are deterministic.
+
+    Args:
+        document_id: ID of the document to process
+    """
+    _run(_process(document_id))
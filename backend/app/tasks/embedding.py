@@ -0,0 +1,134 @@
+"""Chunk Embedding into the Vector Store"""
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+from app.core.ai.scheduler import LLMScheduler, Priority, llm_scheduler
+from app.core.config import settings
+from app.models import Document
+from app.tasks.pipeline import StageProgress
+
+# Async function embedding a batch of texts, one vector per text
+EmbedBatch = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+# Namespace of the deterministic point IDs, so re-embedding a document
+# overwrites its points instead of adding new ones
+_POINT_NAMESPACE = uuid.UUID("5b8f3a4e-2f64-4f0e-9d52-3c1a7e0b6d21")
+
+
+class VectorStoreError(Exception):
+    """Qdrant request failure"""
+
+
+class QdrantChunkEmbedder:
+    """
+    Embed a document's chunks in batches and store them in a Qdrant collection.
+
+    Embedding requests go through the LLM scheduler at background priority,
+    so ingestion never starves interactive Q&A of provider capacity. The
+    collection is created on first use with the embedding model's vector
+    size; a document's previous points are removed before its new ones are
+    written, so re-processing never leaves stale chunks behind.
+    """
+
+    def __init__(
+        self,
+        embed: EmbedBatch,
+        http_client: Optional[httpx.AsyncClient] = None,
+        url: str = settings.QDRANT_URL,
+        collection: str = settings.QDRANT_COLLECTION_NAME,
+        batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+        scheduler: LLMScheduler = llm_scheduler,
+        provider: str = settings.EMBEDDING_PROVIDER,
+    ):
+        self.embed = embed
+        self.http = http_client or httpx.AsyncClient(timeout=settings.LLM_REQUEST_TIMEOUT)
+        self.url = url.rstrip("/")
+        self.collection = collection
+        self.batch_size = max(1, batch_size)
+        self.scheduler = scheduler
+        self.provider = provider
+        self._collection_ready = False
+
+    async def _request(self, method: str, path: str, body: Optional[dict] = None) -> Any:
+        response = await self.http.request(
+            method, f"{self.url}/collections/{self.collection}{path}", json=body
+        )
+        if response.status_code >= 400:
+            raise VectorStoreError(
+                f"Qdrant {method} {path or '/'}: {response.status_code} {response.text[:500]}"
+            )
+        return response.json()
+
+    async def _ensure_collection(self, vector_size: int) -> None:
+        if self._collection_ready:
+            return
+        response = await self.http.get(f"{self.url}/collections/{self.collection}")
+        if response.status_code == 404:
+            await self._request("PUT", "", {"vectors": {"size": vector_size, "distance": "Cosine"}})
+            await self._request("PUT", "/index", {
+                "field_name": "document_id",
+                "field_schema": "keyword",
+            })
+        elif response.status_code >= 400:
+            raise VectorStoreError(
+                f"Qdrant GET collection: {response.status_code} {response.text[:500]}"
+            )
+        self._collection_ready = True
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        vectors = await self.scheduler.submit(
+            lambda: self.embed(texts),
+            provider=self.provider,
+            priority=Priority.BACKGROUND,
+            estimated_tokens=sum(len(text) for text in texts) // 4,
+        )
+        if len(vectors) != len(texts):
+            raise VectorStoreError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+        return vectors
+
+    async def embed_chunks(
+        self,
+        document: Document,
+        chunks: list[dict],
+        pages: list[str],
+        progress: StageProgress,
+    ) -> None:
+        """
+        Embed and store the chunks of a document.
+
+        Args:
+            document: Document the chunks belong to
+            chunks: Chunk spans (see chunk_pages)
+            pages: Page texts the spans point into
+            progress: Called with (chunks embedded, total chunks) after each batch
+        """
+        total = len(chunks)
+        for offset in range(0, total, self.batch_size):
+            batch = chunks[offset:offset + self.batch_size]
+            texts = [pages[chunk["page"] - 1][chunk["start"]:chunk["end"]] for chunk in batch]
+            vectors = await self._embed_batch(texts)
+
+            if offset == 0:
+                await self._ensure_collection(len(vectors[0]))
+                await self._request("POST", "/points/delete?wait=true", {
+                    "filter": {"must": [{"key": "document_id", "match": {"value": document.id}}]},
+                })
+            await self._request("PUT", "/points?wait=true", {"points": [
+                {
+                    "id": str(uuid.uuid5(_POINT_NAMESPACE, f"{document.id}:{chunk['index']}")),
+                    "vector": vector,
+                    "payload": {
+                        "document_id": document.id,
+                        "user_id": document.user_id,
+                        "chunk_index": chunk["index"],
+                        "page": chunk["page"],
+                        "start": chunk["start"],
+                        "end": chunk["end"],
+                        "text": text,
+                    },
+                }
+                for chunk, text, vector in zip(batch, texts, vectors)
+            ]})
+            await progress(offset + len(batch), total)
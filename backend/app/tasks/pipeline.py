@@ -0,0 +1,225 @@
+"""Document Ingestion Pipeline"""
+import asyncio
+import logging
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Protocol
+
+import httpx
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.ai.llm import LLMClient
+from app.core.ai.summarizer import HierarchicalSummarizer, Section
+from app.core.cache import CacheManager
+from app.core.conditional import forget_content_version
+from app.core.document_parser import ParsedDocument, get_parser
+from app.db.session import async_session_maker
+from app.models import AISummary, Document
+from app.tasks.progress import ProgressReporter
+from app.utils.ids import generate_id
+from app.utils.text_processing import chunk_pages
+
+logger = logging.getLogger(__name__)
+
+# Async callback receiving (units_done, total_units)
+StageProgress = Callable[[int, int], Awaitable[None]]
+
+
+class ChunkEmbedder(Protocol):
+    """Stores chunk embeddings in the vector store"""
+
+    async def embed_chunks(
+        self,
+        document: Document,
+        chunks: list[dict],
+        pages: list[str],
+        progress: StageProgress,
+    ) -> None:
+        ...
+
+
+class IngestionPipeline:
+    """
+    Runs parse -> chunk -> embed -> summarize for one document.
+
+    Drives Document.processing_status / processing_error and publishes
+    progress events. The embed and summarize stages are skipped when no
+    embedder or summarizer is passed (tests that only exercise parsing);
+    get_pipeline always builds both. The pipeline is independent of the job
+    backend that invokes it.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+        cache: Optional[CacheManager] = None,
+        embedder: Optional[ChunkEmbedder] = None,
+        summarizer: Optional[HierarchicalSummarizer] = None,
+    ):
+        self.session_maker = session_maker
+        self.cache = cache
+        self.embedder = embedder
+        self.summarizer = summarizer
+
+    async def run(self, document_id: str) -> None:
+        """
+        Process a document end to end.
+
+        Args:
+            document_id: ID of a Document row
+
+        Raises:
+            LookupError: If the document does not exist
+            Exception: Any stage failure, after the document is marked failed
+        """
+        reporter = ProgressReporter(self.cache, document_id)
+
+        async with self.session_maker() as session:
+            document = await session.get(Document, document_id)
+            if document is None:
+                raise LookupError(f"Document {document_id} not found")
+
+            document.processing_status = "processing"
+            document.processing_error = None
+            await session.commit()
+            await self._forget_content_version(document_id)
+            await reporter.publish("processing", "parse", force=True)
+
+            try:
+                await self._process(session, document, reporter)
+            except Exception as error:
+                logger.exception("Ingestion failed for document %s", document_id)
+                await session.rollback()
+                document.processing_status = "failed"
+                document.processing_error = f"{type(error).__name__}: {error}"[:2000]
+                await session.commit()
+                await self._forget_content_version(document_id)
+                await reporter.publish("failed", message=document.processing_error)
+                raise
+
+            document.processing_status = "completed"
+            await session.commit()
+            await self._forget_content_version(document_id)
+            await reporter.publish("completed")
+
+    async def _forget_content_version(self, document_id: str) -> None:
+        # Cached content versions answer 304s without the database; drop it
+        # whenever the parsed content or summaries may have changed
+        if self.cache is None:
+            return
+        try:
+            await forget_content_version(self.cache, document_id)
+        except Exception as error:
+            logger.warning("Could not invalidate content version of %s: %s", document_id, error)
+
+    async def _process(
+        self,
+        session: AsyncSession,
+        document: Document,
+        reporter: ProgressReporter,
+    ) -> None:
+        parsed = await self._parse(document, reporter)
+
+        if parsed.author and not document.author:
+            document.author = parsed.author
+        document.page_count = parsed.page_count
+        document.word_count = parsed.word_count
+
+        chunks = chunk_pages(parsed.pages)
+        await reporter.publish("processing", "chunk", len(chunks), len(chunks))
+
+        content = parsed.to_content()
+        content["chunks"] = chunks
+        document.parsed_content = content
+        document.parse_version = (document.parse_version or 0) + 1
+        await session.commit()
+
+        if self.embedder is not None:
+            async def embed_progress(done: int, total: int) -> None:
+                await reporter.publish("processing", "embed", done, total)
+
+            await reporter.publish("processing", "embed", 0, len(chunks), force=True)
+            await self.embedder.embed_chunks(document, chunks, parsed.pages, embed_progress)
+            document.is_indexed = True
+            await session.commit()
+
+        if self.summarizer is not None and parsed.outline:
+            await reporter.publish("processing", "summarize", force=True)
+            await self._summarize(session, document, parsed)
+
+    async def _parse(self, document: Document, reporter: ProgressReporter) -> ParsedDocument:
+        parser = get_parser(document.file_type)
+        loop = asyncio.get_running_loop()
+        # The loop only keeps weak references to tasks; hold them until done
+        publishing: set[asyncio.Task] = set()
+
+        def publish(done: int, total: int) -> None:
+            task = loop.create_task(reporter.publish("processing", "parse", done, total))
+            publishing.add(task)
+            task.add_done_callback(publishing.discard)
+
+        def on_page(done: int, total: int) -> None:
+            # Called from the parser thread; hop back onto the event loop
+            loop.call_soon_threadsafe(publish, done, total)
+
+        try:
+            return await asyncio.to_thread(parser.parse, Path(document.file_path), on_page)
+        finally:
+            # Progress events already scheduled go out before the next stage's
+            await asyncio.gather(*publishing, return_exceptions=True)
+
+    async def _summarize(
+        self,
+        session: AsyncSession,
+        document: Document,
+        parsed: ParsedDocument,
+    ) -> None:
+        if self.summarizer is None:
+            return
+        result = await self.summarizer.summarize_document(Section.from_dict(parsed.outline))
+
+        await session.execute(
+            delete(AISummary).where(
+                AISummary.document_id == document.id,
+                AISummary.summary_type == "full",
+            )
+        )
+        session.add(AISummary(
+            id=generate_id("sum"),
+            document_id=document.id,
+            summary_type="full",
+            content={"summary": result.text},
+            text=result.text,
+        ))
+        await session.commit()
+
+
+def get_pipeline(
+    cache: Optional[CacheManager] = None,
+    session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> IngestionPipeline:
+    """
+    Build the ingestion pipeline with all four stages.
+
+    Args:
+        cache: Connected cache manager used for progress events and summaries
+        session_maker: Session factory for document updates
+        http_client: HTTP client for the LLM provider and Qdrant (one is
+            created per client when omitted)
+
+    Returns:
+        IngestionPipeline
+
+    Raises:
+        RuntimeError: If the LLM or embedding provider is not configured
+    """
+    from app.tasks.embedding import QdrantChunkEmbedder
+
+    llm = LLMClient(http_client=http_client)
+    return IngestionPipeline(
+        session_maker,
+        cache=cache,
+        embedder=QdrantChunkEmbedder(llm.embed, http_client=http_client),
+        summarizer=HierarchicalSummarizer(llm.complete, cache),
+    )
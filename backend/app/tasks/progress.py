@@ -0,0 +1,93 @@
+"""Ingestion Progress Reporting"""
+import json
+import time
+from typing import Any, Optional
+
+from app.core.cache import CacheManager
+from app.core.config import settings
+
+# Statuses after which no further progress events are published
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def progress_channel(document_id: str) -> str:
+    """Redis pub/sub channel carrying progress events of a document"""
+    return f"document:{document_id}:progress"
+
+
+def progress_key(document_id: str) -> str:
+    """Redis key holding the latest progress event of a document"""
+    return f"document:{document_id}:progress:latest"
+
+
+class ProgressReporter:
+    """
+    Publish fine-grained ingestion progress over Redis pub/sub.
+
+    The latest event is also stored under a key so late subscribers (SSE
+    clients connecting mid-ingestion) can start from a snapshot. Events are
+    throttled per stage; stage changes and terminal events always go out.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[CacheManager],
+        document_id: str,
+        min_interval: float = settings.INGESTION_PROGRESS_INTERVAL,
+    ):
+        self.cache = cache
+        self.document_id = document_id
+        self.min_interval = min_interval
+        self._last_stage: Optional[str] = None
+        self._last_sent = 0.0
+
+    async def publish(
+        self,
+        status: str,
+        stage: Optional[str] = None,
+        current: int = 0,
+        total: int = 0,
+        message: Optional[str] = None,
+        force: bool = False,
+    ) -> None:
+        """
+        Publish a progress event.
+
+        Args:
+            status: Document processing status (processing, completed, failed)
+            stage: Pipeline stage (parse, chunk, embed, summarize)
+            current: Units done in this stage (pages parsed, chunks embedded, ...)
+            total: Total units in this stage
+            message: Optional human readable detail (e.g. error message)
+            force: Publish even if throttled
+        """
+        if self.cache is None:
+            return
+
+        now = time.monotonic()
+        final = status in TERMINAL_STATUSES or (total and current >= total)
+        if (
+            not force
+            and not final
+            and stage == self._last_stage
+            and now - self._last_sent < self.min_interval
+        ):
+            return
+        self._last_stage = stage
+        self._last_sent = now
+
+        event: dict[str, Any] = {
+            "document_id": self.document_id,
+            "status": status,
+            "stage": stage,
+            "current": current,
+            "total": total,
+            "message": message,
+            "timestamp": time.time(),
+        }
+        payload = json.dumps(event, ensure_ascii=False)
+
+        async with self.cache.redis.pipeline() as pipe:
+            pipe.setex(progress_key(self.document_id), settings.INGESTION_PROGRESS_TTL, payload)
+            pipe.publish(progress_channel(self.document_id), payload)
+            await pipe.execute()
@@ -0,0 +1,26 @@
+"""Ingestion Job Dispatch"""
+import asyncio
+
+from app.core.config import settings
+
+
+async def enqueue_document_processing(document_id: str) -> str:
+    """
+    Queue a document for background ingestion.
+
+    Args:
+        document_id: ID of a pending Document row
+
+    Returns:
+        Job ID
+    """
+    if settings.TASK_BACKEND == "inprocess":
+        from app.tasks.runner import job_runner
+
+        return await job_runner.submit(document_id)
+
+    from app.tasks.document_tasks import process_document
+
+    # Publishing to the broker is blocking I/O; keep it off the event loop
+    result = await asyncio.to_thread(process_document.apply_async, args=[document_id])
+    return str(result.id)
@@ -0,0 +1,281 @@
+"""In-Process Ingestion Job Runner"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, cast
+
+from sqlalchemy import ColumnElement, CursorResult, Update, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.cache import CacheManager
+from app.core.config import settings
+from app.db.session import async_session_maker
+from app.models import Document, IngestionJob
+from app.tasks.pipeline import IngestionPipeline, get_pipeline
+from app.utils.ids import generate_id
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def _update(session: AsyncSession, statement: Update) -> int:
+    """Run an UPDATE and return the number of rows it matched"""
+    result = cast(CursorResult, await session.execute(statement))
+    return result.rowcount
+
+
+class InProcessJobRunner:
+    """
+    Asyncio worker pool running ingestion jobs inside the API process.
+
+    For deployments without a broker. Job state is persisted in the
+    ingestion_jobs table, so queued jobs survive restarts and shutdown waits
+    for in-flight jobs before exiting. Jobs are claimed with a conditional
+    UPDATE and hold a lease kept alive by a heartbeat while they run; a
+    processing job whose lease expired (its worker died) is re-queued, up to
+    INGESTION_MAX_ATTEMPTS. Several API processes can therefore run the
+    runner against one database without running a job twice.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+        workers: int = settings.INPROCESS_WORKERS,
+        max_attempts: int = settings.INGESTION_MAX_ATTEMPTS,
+        drain_timeout: float = settings.INPROCESS_DRAIN_TIMEOUT,
+        lease_seconds: float = settings.INGESTION_LEASE_SECONDS,
+    ):
+        self.session_maker = session_maker
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.drain_timeout = drain_timeout
+        self.lease_seconds = lease_seconds
+        self.pipeline: Optional[IngestionPipeline] = None
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        self._claimed: set[str] = set()
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and not self._stopping
+
+    async def start(self, cache: Optional[CacheManager] = None) -> None:
+        """
+        Recover unfinished jobs and start the worker pool.
+
+        Args:
+            cache: Connected cache manager used for progress events
+        """
+        if self._tasks:
+            return
+        if self.pipeline is None:
+            self.pipeline = get_pipeline(cache, self.session_maker)
+        self._queue = asyncio.Queue()
+        self._stopping = False
+
+        await self._recover()
+        for job_id in await self._queued():
+            self._queue.put_nowait(job_id)
+
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ingestion-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._sweeper = asyncio.create_task(self._sweep(), name="ingestion-lease-sweeper")
+        logger.info("In-process job runner started with %d workers", self.workers)
+
+    async def stop(self) -> None:
+        """Stop taking jobs and wait (up to drain_timeout) for in-flight jobs"""
+        if not self._tasks:
+            return
+        self._stopping = True
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        for _ in self._tasks:
+            self._queue.put_nowait(None)
+
+        _, pending = await asyncio.wait(self._tasks, timeout=self.drain_timeout)
+        interrupted = list(self._claimed)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Cancelled %d ingestion jobs still running at shutdown", len(pending))
+            await asyncio.gather(*pending, return_exceptions=True)
+        if interrupted:
+            # Interrupted jobs stay in 'processing'; dropping their lease lets
+            # the next start (here or in another process) recover them at once
+            await self._release(interrupted)
+        self._tasks = []
+
+    async def submit(self, document_id: str) -> str:
+        """
+        Persist a job for a document and queue it.
+
+        Args:
+            document_id: ID of a pending Document row
+
+        Returns:
+            Job ID
+
+        Raises:
+            RuntimeError: If the runner is not running
+        """
+        if not self.running:
+            raise RuntimeError("In-process job runner is not running")
+
+        job = IngestionJob(id=generate_id("job"), document_id=document_id, status="queued")
+        async with self.session_maker() as session:
+            session.add(job)
+            await session.commit()
+
+        self._queue.put_nowait(job.id)
+        return job.id
+
+    def _lease_expired(self) -> ColumnElement[bool]:
+        cutoff = _now() - timedelta(seconds=self.lease_seconds)
+        return or_(IngestionJob.heartbeat_at.is_(None), IngestionJob.heartbeat_at < cutoff)
+
+    async def _recover(self) -> list[str]:
+        """Re-queue processing jobs whose lease expired; return the re-queued job IDs"""
+        requeued: list[str] = []
+        async with self.session_maker() as session:
+            expired = (await session.scalars(
+                select(IngestionJob)
+                .where(IngestionJob.status == "processing", self._lease_expired())
+            )).all()
+
+            for job in expired:
+                # Conditional on the lease still being expired, so a job whose
+                # worker heartbeats in the meantime is left alone
+                claim = (
+                    update(IngestionJob)
+                    .where(
+                        IngestionJob.id == job.id,
+                        IngestionJob.status == "processing",
+                        self._lease_expired(),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if job.attempts >= self.max_attempts:
+                    error = "Worker stopped during processing too many times"
+                    failed = claim.values(status="failed", error=error, finished_at=_now())
+                    if await _update(session, failed) == 1:
+                        await session.execute(
+                            update(Document)
+                            .where(Document.id == job.document_id)
+                            .values(processing_status="failed", processing_error=error)
+                        )
+                elif await _update(session, claim.values(status="queued", heartbeat_at=None)) == 1:
+                    requeued.append(job.id)
+            await session.commit()
+
+        if expired:
+            logger.warning("Recovered %d interrupted ingestion jobs", len(expired))
+        return requeued
+
+    async def _queued(self) -> list[str]:
+        """IDs of all queued jobs, oldest first"""
+        async with self.session_maker() as session:
+            return list((await session.scalars(
+                select(IngestionJob.id)
+                .where(IngestionJob.status == "queued")
+                .order_by(IngestionJob.created_at)
+            )).all())
+
+    async def _release(self, job_ids: list[str]) -> None:
+        """Expire the leases of jobs this runner can no longer finish"""
+        async with self.session_maker() as session:
+            await session.execute(
+                update(IngestionJob)
+                .where(IngestionJob.id.in_(job_ids), IngestionJob.status == "processing")
+                .values(heartbeat_at=None)
+            )
+            await session.commit()
+
+    async def _sweep(self) -> None:
+        """Periodically re-queue jobs whose worker died (e.g. in another process)"""
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                for job_id in await self._recover():
+                    self._queue.put_nowait(job_id)
+            except Exception:
+                logger.exception("Ingestion lease sweep failed")
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Keep a running job's lease alive"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_maker() as session:
+                    await session.execute(
+                        update(IngestionJob)
+                        .where(IngestionJob.id == job_id, IngestionJob.status == "processing")
+                        .values(heartbeat_at=_now())
+                    )
+                    await session.commit()
+            except Exception as error:
+                logger.warning("Heartbeat of ingestion job %s failed: %s", job_id, error)
+
+    async def _worker(self) -> None:
+        while not self._stopping:
+            job_id = await self._queue.get()
+            if job_id is None:
+                break
+            try:
+                await self._execute(job_id)
+            except Exception:
+                logger.exception("Ingestion job %s crashed", job_id)
+
+    async def _execute(self, job_id: str) -> None:
+        pipeline = self.pipeline
+        if pipeline is None:
+            raise RuntimeError("In-process job runner has no pipeline")
+
+        async with self.session_maker() as session:
+            # Atomic claim: of all workers (in any process) that dequeued this
+            # job, only the one whose UPDATE matched a queued row runs it
+            now = _now()
+            claimed = await _update(session, (
+                update(IngestionJob)
+                .where(IngestionJob.id == job_id, IngestionJob.status == "queued")
+                .values(
+                    status="processing",
+                    attempts=IngestionJob.attempts + 1,
+                    started_at=now,
+                    heartbeat_at=now,
+                )
+            ))
+            await session.commit()
+            if claimed != 1:
+                return
+
+            job = await session.get(IngestionJob, job_id)
+            if job is None:
+                return
+            self._claimed.add(job_id)
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                await pipeline.run(job.document_id)
+            except Exception as error:
+                job.status = "failed"
+                job.error = f"{type(error).__name__}: {error}"[:2000]
+            else:
+                job.status = "completed"
+            finally:
+                heartbeat.cancel()
+                self._claimed.discard(job_id)
+            job.finished_at = _now()
+            job.heartbeat_at = None
+            await session.commit()
+
+
+# Global runner instance (used when TASK_BACKEND == "inprocess")
+job_runner = InProcessJobRunner()
@@ -0,0 +1,128 @@
+"""Shared pytest fixtures"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.cache import CacheManager
+from app.db.base import Base
+from app.models import AISummary, Document, User
+
+
+@pytest.fixture
+async def cache():
+    """Cache manager backed by an in-memory fakeredis server"""
+    fakeredis = pytest.importorskip("fakeredis")
+
+    manager = CacheManager()
+    manager._redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield manager
+    await manager.close()
+
+
+@pytest.fixture
+async def db_engine():
+    """Async engine on a fresh in-memory SQLite database with all tables"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+class QueryCounter:
+    """SQL statements executed on an engine (executemany counts once)"""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@pytest.fixture
+def query_counter(db_engine):
+    """Count queries on the test database, e.g. to pin an endpoint's query budget"""
+    counter = QueryCounter()
+    event.listen(db_engine.sync_engine, "before_cursor_execute", counter._record)
+    yield counter
+    event.remove(db_engine.sync_engine, "before_cursor_execute", counter._record)
+
+
+@pytest.fixture
+def session_maker(db_engine):
+    """Session factory bound to the test database"""
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def user(session_maker):
+    """Persisted test user"""
+    async with session_maker() as session:
+        user = User(id="user_1", email="reader@example.com", username="reader", hashed_password="x")
+        session.add(user)
+        await session.commit()
+    return user
+
+
+@pytest.fixture
+async def api_client(session_maker, cache, user, monkeypatch):
+    """HTTP client for the app, wired to the test database and cache"""
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.cache import get_cache
+    from app.db.session import get_db, get_read_db, get_read_session_maker
+    from app.main import app
+    from app.services.document_sync import sync_hub, sync_publisher
+    from app.utils.security import create_access_token
+
+    async def override_get_db():
+        async with session_maker() as session:
+            yield session
+
+    async def override_get_cache():
+        return cache
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_session_maker] = lambda: session_maker
+    app.dependency_overrides[get_cache] = override_get_cache
+    monkeypatch.setattr(sync_publisher, "cache", cache)
+    monkeypatch.setattr(sync_hub, "cache", cache)
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", headers=headers
+    ) as client:
+        yield client
+    await sync_publisher.stop()
+    await sync_hub.stop()
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def parsed_document(session_maker, user):
+    """Processed 45-page document doc_1 with one summary"""
+    async with session_maker() as session:
+        session.add(Document(
+            id="doc_1", user_id=user.id, title="Book", file_path="/tmp/b.txt",
+            file_hash="a" * 64, file_size=1, file_type="txt", page_count=45,
+            processing_status="completed", parse_version=1,
+            parsed_content={"pages": [f"Page {n} " + "lorem ipsum " * 100 for n in range(1, 46)]},
+        ))
+        session.add(AISummary(
+            id="sum_1", document_id="doc_1", summary_type="full", text="Summary",
+            content={"topic": "Books", "core_points": ["a", "b"]},
+        ))
+        await session.commit()
+    return "doc_1"
@@ -0,0 +1,119 @@
+"""Tests for bulk annotation import, NDJSON export and annotation updates"""
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.models import Annotation, Document, ReadingSession, User
+from app.services.annotation_service import export_annotations, import_annotations
+
+
+@pytest.fixture
+async def document(session_maker, user):
+    async with session_maker() as session:
+        session.add(Document(
+            id="doc_1", user_id=user.id, title="Book", file_path="/tmp/book.txt",
+            file_hash="h" * 64, file_size=1, file_type="txt",
+        ))
+        session.add(ReadingSession(
+            id="rs_1", user_id=user.id, document_id="doc_1",
+            start_time=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        ))
+        await session.commit()
+
+
+def _items(count):
+    return [
+        {
+            "type": "note" if i % 4 == 0 else "highlight",
+            "position": {"page": i // 10, "start": i, "end": i + 5},
+            "selected_text": f"passage {i}",
+            "note_content": "thought" if i % 4 == 0 else None,
+        }
+        for i in range(count)
+    ]
+
+
+async def test_import_batches_statements_and_counters(db_engine, session_maker, document):
+    items = _items(100)
+    items[7] = {"type": "scribble", "position": {}, "selected_text": "x"}
+    items[42] = {"type": "highlight", "position": {}}
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        async with session_maker() as session:
+            result = await import_annotations(session, "user_1", "doc_1", items, batch_size=40)
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert result.imported == 98
+    assert [index for index, _ in result.errors] == [7, 42]
+    assert "type" in result.errors[0][1]
+    assert "selected_text" in result.errors[1][1]
+
+    # Three batches: one INSERT, at most two counter UPDATEs each
+    inserts = [s for s in statements if s.startswith("INSERT INTO annotations")]
+    updates = [s for s in statements if s.startswith("UPDATE")]
+    assert len(inserts) == 3
+    assert len(updates) <= 6
+
+    async with session_maker() as session:
+        assert await session.scalar(select(func.count()).select_from(Annotation)) == 98
+        user = await session.get(User, "user_1")
+        reading = await session.get(ReadingSession, "rs_1")
+    assert user.notes_created == 25
+    assert reading.annotations_made == 98
+
+
+async def test_export_streams_importable_ndjson(session_maker, document):
+    async with session_maker() as session:
+        await import_annotations(session, "user_1", "doc_1", _items(25))
+
+    chunks = [chunk async for chunk in export_annotations(session_maker, "user_1", "doc_1", fetch_size=10)]
+    assert len(chunks) == 3
+    lines = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    assert len(lines) == 25
+    assert lines[0]["selected_text"] == "passage 0"
+
+    async with session_maker() as session:
+        result = await import_annotations(session, "user_1", "doc_1", lines)
+    assert result.imported == 25 and not result.errors
+
+
+async def test_bulk_endpoints(api_client, document):
+    response = await api_client.post(
+        "/api/v1/annotations/bulk",
+        json={"document_id": "doc_1", "items": _items(3) + [{"type": "note"}]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 3
+    assert data["errors"][0]["index"] == 3
+
+    response = await api_client.get("/api/v1/annotations/export", params={"document_id": "doc_1"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == data["ids"]
+
+
+async def test_update_rejects_nulls_except_note(api_client, document):
+    created = await api_client.post("/api/v1/annotations", json={
+        "document_id": "doc_1", "type": "note", "position": {"page": 1},
+        "selected_text": "passage", "note_content": "thought", "tags": ["a"],
+    })
+    url = f"/api/v1/annotations/{created.json()['id']}"
+
+    for field in ("type", "position", "color", "tags"):
+        response = await api_client.patch(url, json={field: None})
+        assert response.status_code == 422, field
+
+    response = await api_client.patch(url, json={"note_content": None, "color": "blue"})
+    assert response.status_code == 200
+    assert (response.json()["note_content"], response.json()["color"]) == (None, "blue")
+
+    response = await api_client.get("/api/v1/annotations", params={"document_id": "doc_1"})
+    assert response.status_code == 200
+    [annotation] = response.json()["items"]
+    assert (annotation["type"], annotation["tags"]) == ("note", ["a"])
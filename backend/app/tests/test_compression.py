@@ -0,0 +1,127 @@
+"""Tests for response compression and streamed JSON serialization"""
+import gzip
+import json
+import zlib
+
+import pytest
+
+from app.core.compression import negotiate_encoding
+from app.core.middleware import CompressionMiddleware
+from app.core.responses import stream_json_list
+
+ALL = ("zstd", "br", "gzip")
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate, br", ALL) == "br"
+    assert negotiate_encoding("gzip, br;q=0.5", ALL) == "gzip"
+    assert negotiate_encoding("zstd, gzip", ("gzip",)) == "gzip"
+    assert negotiate_encoding("*", ALL) == "zstd"
+    assert negotiate_encoding("gzip;q=0, identity", ALL) is None
+    assert negotiate_encoding("deflate", ALL) is None
+
+
+async def _call(app, accept="gzip"):
+    """Run an ASGI app and collect the response start and body messages"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept.encode())]}
+    await app(scope, receive, send)
+    headers = {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+    return headers, [m.get("body", b"") for m in messages[1:]]
+
+
+def _app(chunks, content_type=b"application/json"):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", content_type),
+            (b"content-length", str(sum(map(len, chunks))).encode()),
+        ]})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+async def test_large_bodies_are_compressed_small_ones_are_not():
+    body = json.dumps({"pages": ["the same sentence again. " * 40] * 50}).encode()
+    headers, chunks = await _call(CompressionMiddleware(_app([body]), encodings=("gzip",)))
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(chunks[0]) < len(body) / 10
+    assert gzip.decompress(chunks[0]) == body
+
+    headers, chunks = await _call(CompressionMiddleware(_app([b'{"ok":true}']), encodings=("gzip",)))
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert chunks == [b'{"ok":true}']
+
+    headers, _ = await _call(CompressionMiddleware(_app([body], b"image/png"), encodings=("gzip",)))
+    assert "content-encoding" not in headers
+    assert "vary" not in headers
+
+
+async def test_uncompressed_responses_vary_on_accept_encoding():
+    body = json.dumps({"text": "x" * 5000}).encode()
+    headers, chunks = await _call(CompressionMiddleware(_app([body]), encodings=("gzip",)), accept="identity")
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert chunks == [body]
+
+
+async def test_streams_are_compressed_chunk_by_chunk():
+    parts = [json.dumps({"row": i, "text": "x" * 500}).encode() + b"\n" for i in range(5)]
+    headers, chunks = await _call(CompressionMiddleware(_app(parts, b"application/x-ndjson"), encodings=("gzip",)))
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert len(chunks) == 5
+    # Every chunk is flushed, so a client can decode each line as it arrives
+    decoder = zlib.decompressobj(31)
+    assert decoder.decompress(chunks[0]) == parts[0]
+    assert gzip.decompress(b"".join(chunks)) == b"".join(parts)
+
+    headers, _ = await _call(CompressionMiddleware(_app(parts, b"text/event-stream"), encodings=("gzip",)))
+    assert "content-encoding" not in headers
+
+
+async def test_stream_json_list_shapes():
+    async def body(response):
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    response = stream_json_list(range(7), chunk_items=3, next_cursor=None, total=7)
+    assert json.loads(await body(response)) == {"items": list(range(7)), "next_cursor": None, "total": 7}
+    assert json.loads(await body(stream_json_list([], key=None))) == []
+    assert json.loads(await body(stream_json_list([1, 2], key="rows"))) == {"rows": [1, 2]}
+    with pytest.raises(ValueError):
+        stream_json_list([], key=None, next_cursor="x")
+
+
+async def test_pages_endpoint_streams_compressed_pages(api_client, parsed_document):
+    response = await api_client.get(
+        f"/api/v1/documents/{parsed_document}/pages?start=41&limit=20",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    body = response.json()
+    assert [page["number"] for page in body["items"]] == [41, 42, 43, 44, 45]
+    assert body["items"][0]["text"].startswith("Page 41 ")
+    assert body["page_count"] == 45
+    assert body["next_start"] is None
+
+    body = (await api_client.get(f"/api/v1/documents/{parsed_document}/pages?limit=20")).json()
+    assert body["next_start"] == 21
+    assert (await api_client.get("/api/v1/documents/missing/pages")).status_code == 404
+
+
+async def test_summaries_endpoint(api_client, parsed_document):
+    response = await api_client.get(f"/api/v1/documents/{parsed_document}/summaries")
+    assert response.status_code == 200
+    [summary] = response.json()
+    assert summary["content"] == {"topic": "Books", "core_points": ["a", "b"]}
+    assert summary["summary_type"] == "full"
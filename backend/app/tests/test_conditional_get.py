@@ -0,0 +1,136 @@
+"""Tests for conditional GET (ETags, 304s and caching headers)"""
+from app.core.conditional import IMMUTABLE, REVALIDATE, make_etag, match_etag
+from app.models import Document
+from app.models.document import content_version
+from app.tasks.pipeline import IngestionPipeline
+
+VERSION = content_version("a" * 64, 1, "completed")
+
+
+def test_match_etag():
+    etag = make_etag("pages", 1, 20, "v1")
+    assert etag.startswith('"') and len(etag) == 34
+    assert make_etag("pages", 1, 20, "v2") != etag
+
+    assert match_etag(etag, etag) == etag
+    assert match_etag(f'"other", W/{etag}', etag) == f"W/{etag}"
+    assert match_etag(f'{etag[:-1]}-gzip"', etag) == f'{etag[:-1]}-gzip"'
+    assert match_etag("*", etag) == etag
+    assert match_etag('"other"', etag) is None
+    assert match_etag(None, etag) is None
+
+
+def test_content_version():
+    assert VERSION == "aaaaaaaaaaaaaaaa.1"
+    assert content_version("a" * 64, 1, "processing") is None
+
+
+async def test_pages_revalidate_without_database(api_client, parsed_document, query_counter):
+    url = f"/api/v1/documents/{parsed_document}/pages?limit=5"
+    response = await api_client.get(url, headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == REVALIDATE
+    etag = response.headers["etag"]
+
+    query_counter.reset()
+    response = await api_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    assert query_counter.count == 0
+
+    # Another page range is another representation
+    response = await api_client.get(
+        f"/api/v1/documents/{parsed_document}/pages?limit=6", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+
+async def test_compressed_etag_validates(api_client, parsed_document):
+    url = f"/api/v1/documents/{parsed_document}/pages"
+    response = await api_client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag.endswith('-gzip"')
+
+    response = await api_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+async def test_versioned_content_is_immutable(api_client, parsed_document, session_maker, cache):
+    url = f"/api/v1/documents/{parsed_document}/summaries?version={VERSION}"
+    response = await api_client.get(url)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert response.json()[0]["id"] == "sum_1"
+
+    async with session_maker() as session:
+        document = await session.get(Document, parsed_document)
+        assert document.content_version == VERSION
+        document.parse_version = 2
+        await session.commit()
+
+    # Reprocessing invalidates the cached version; the old URL is now stale
+    await IngestionPipeline(session_maker, cache=cache)._forget_content_version(parsed_document)
+    response = await api_client.get(url)
+    assert response.status_code == 409
+
+
+async def test_processing_documents_are_not_cached(api_client, parsed_document, session_maker):
+    async with session_maker() as session:
+        document = await session.get(Document, parsed_document)
+        document.processing_status = "processing"
+        await session.commit()
+
+    response = await api_client.get(f"/api/v1/documents/{parsed_document}/pages")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
+
+
+async def test_document_detail_etag_follows_annotations(api_client, parsed_document, query_counter):
+    url = f"/api/v1/documents/{parsed_document}"
+    response = await api_client.get(url)
+    assert response.status_code == 200
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    query_counter.reset()
+    response = await api_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert query_counter.count == 2  # authentication + validator
+    response = await api_client.get(url, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    # "-0000" parses to a naive datetime; it is compared as UTC
+    since = "Sat, 01 Jan 2000 00:00:00 -0000"
+    response = await api_client.get(url, headers={"If-Modified-Since": since})
+    assert response.status_code == 200
+
+    imported = await api_client.post("/api/v1/annotations/bulk", json={
+        "document_id": parsed_document,
+        "items": [{"type": "highlight", "position": {"page": 1}, "selected_text": "lorem"}],
+    })
+    assert imported.json()["imported"] == 1
+
+    response = await api_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["annotations"][0]["selected_text"] == "lorem"
+
+
+async def test_annotation_list_etag(api_client, parsed_document):
+    url = f"/api/v1/annotations?document_id={parsed_document}"
+    response = await api_client.get(url)
+    assert response.json()["items"] == []
+    etag = response.headers["etag"]
+    assert (await api_client.get(url, headers={"If-None-Match": etag})).status_code == 304
+
+    await api_client.post("/api/v1/annotations/bulk", json={
+        "document_id": parsed_document,
+        "items": [{"type": "note", "position": {"page": 2}, "selected_text": "ipsum"}],
+    })
+    response = await api_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+    assert "last-modified" in response.headers
+
+    assert (await api_client.get("/api/v1/annotations?document_id=missing")).status_code == 404
@@ -0,0 +1,70 @@
+"""Tests for RAG context assembly"""
+from types import SimpleNamespace
+
+from app.core.ai.context_builder import (
+    ContextBuilder,
+    ContextChunk,
+    count_tokens,
+    thread_history,
+    truncate_to_tokens,
+)
+
+
+def message(id, content, parent_id=None, role="user"):
+    return SimpleNamespace(id=id, role=role, content=content, parent_id=parent_id)
+
+
+def test_count_tokens_handles_cjk():
+    assert count_tokens("") == 0
+    assert count_tokens("深度学习") >= 4
+    assert count_tokens("deep learning " * 10) > count_tokens("deep learning")
+
+
+def test_truncate_to_tokens():
+    text = "word " * 200
+    truncated = truncate_to_tokens(text, 50)
+    assert truncated.endswith("…")
+    assert count_tokens(truncated) <= 50
+    assert truncate_to_tokens("short", 50) == "short"
+
+
+def test_thread_history_follows_parent_links():
+    messages = [
+        message("1", "q1"),
+        message("2", "a1", "1", "assistant"),
+        message("3", "other branch", "1"),
+        message("4", "q2", "2"),
+    ]
+    assert [m.id for m in thread_history(messages, "4")] == ["1", "2", "4"]
+
+
+def test_build_dedupes_and_respects_budget():
+    builder = ContextBuilder(max_tokens=200, reserved_tokens=20, history_ratio=0.3)
+    chunks = [
+        ContextChunk("a", "alpha " * 30, 0.9, page=1, start=0, end=180),
+        ContextChunk("b", "alpha " * 30, 0.8, page=1, start=20, end=200),  # overlaps a
+        ContextChunk("c", "gamma " * 10, 0.5, page=2, start=0, end=60),
+        ContextChunk("d", "delta " * 200, 0.95, page=3, start=0, end=1200),  # too large
+    ]
+    history = [message("1", "earlier question " * 40), message("2", "recent", "1")]
+
+    context = builder.build("What is alpha?", chunks, history)
+
+    assert [c.id for c in context.chunks] == ["a", "c"]
+    assert [t.id for t in context.history] == ["1", "2"]
+    assert context.history[0].content.endswith("…")
+    assert context.tokens_used <= 180
+    assert context.tokens_saved == context.tokens_candidate - context.tokens_used
+    assert context.tokens_saved > 0
+    assert "[1] (page 1)" in context.render_sources()
+
+
+def test_build_prefers_relevance_per_token():
+    builder = ContextBuilder(max_tokens=60, reserved_tokens=0, history_ratio=0)
+    chunks = [
+        ContextChunk("big", "text " * 50, 0.9, page=1),
+        ContextChunk("small1", "text " * 20, 0.6, page=2),
+        ContextChunk("small2", "more " * 20, 0.6, page=3),
+    ]
+    context = builder.build("q", chunks)
+    assert {c.id for c in context.chunks} == {"small1", "small2"}
@@ -0,0 +1,74 @@
+"""Tests for database engine configuration"""
+from sqlalchemy import text
+
+from app.db.session import (
+    TimedAsyncAdaptedQueuePool,
+    create_engine,
+    db_pool_checkout_wait,
+    pool_status,
+)
+
+
+async def test_sqlite_file_engine_applies_pragmas(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", pool_name="test")
+    try:
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+            assert pool_status(engine, "test")["checked_out"] == 1
+
+        assert journal_mode == "wal"
+        assert busy_timeout == 5000
+        assert synchronous == 1  # NORMAL
+        assert isinstance(engine.pool, TimedAsyncAdaptedQueuePool)
+        assert db_pool_checkout_wait.labels(pool="test").count >= 1
+    finally:
+        await engine.dispose()
+
+
+def test_memory_engine_uses_default_pool():
+    engine = create_engine("sqlite+aiosqlite:///:memory:")
+    assert not isinstance(engine.pool, TimedAsyncAdaptedQueuePool)
+    assert pool_status(engine) == {}
+
+
+async def test_read_session_routes_to_replica_until_first_write(tmp_path):
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from app.db.base import Base
+    from app.db.session import ReplicaSet, RoutingSession
+    from app.models import User
+
+    primary = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}", pool_name="replica0")
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    async with replica.begin() as conn:
+        await conn.execute(
+            User.__table__.insert().values(id="u_replica", email="r@x", username="r", hashed_password="x")
+        )
+
+    replicas = ReplicaSet([replica], max_lag=5)
+    maker = async_sessionmaker(
+        primary, class_=AsyncSession, sync_session_class=RoutingSession,
+        expire_on_commit=False, primary=primary, replicas=replicas,
+    )
+    user_ids = select(User.id).order_by(User.id)
+    try:
+        async with maker() as session:
+            assert (await session.scalars(user_ids)).all() == ["u_replica"]
+            session.add(User(id="u_new", email="n@x", username="n", hashed_password="x"))
+            await session.flush()
+            # Read-your-writes: after the flush, reads stick to the primary
+            assert (await session.scalars(user_ids)).all() == ["u_new"]
+            await session.commit()
+
+        replicas.lag[0] = 60.0  # replica fell behind
+        async with maker() as session:
+            assert (await session.scalars(user_ids)).all() == ["u_new"]
+    finally:
+        await primary.dispose()
+        await replica.dispose()
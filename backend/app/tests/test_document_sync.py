@@ -0,0 +1,154 @@
+"""Tests for real-time annotation sync (coalescing, fan-out, resume)"""
+import asyncio
+import json
+
+import pytest
+
+from app.services.document_sync import (
+    START_CURSOR,
+    SyncDelta,
+    SyncPublisher,
+    replay,
+    sync_publisher,
+)
+from app.utils.security import create_access_token
+
+
+def _annotation(annotation_id, color="yellow"):
+    return {"id": annotation_id, "color": color}
+
+
+def test_delta_coalescing():
+    delta = SyncDelta()
+    delta.upsert(_annotation("a"))
+    delta.upsert(_annotation("b"))
+    delta.merge(SyncDelta(upserted={"a": _annotation("a", "red")}, current_page=3))
+    delta.merge(SyncDelta(deleted={"b": None}, current_page=4))
+    assert delta.to_dict() == {
+        "annotations": [_annotation("a", "red")],
+        "deleted": ["b"],
+        "current_page": 4,
+        "reload": False,
+    }
+    assert SyncDelta.from_dict(delta.to_dict()) == delta
+
+    delta.merge(SyncDelta(reload=True))
+    delta.upsert(_annotation("c"))
+    assert delta.to_dict() == {"annotations": [], "deleted": [], "current_page": 4, "reload": True}
+    assert not SyncDelta()
+
+
+async def test_publisher_batches_and_replays(cache):
+    publisher = SyncPublisher(cache, window=60, maxlen=2)
+    publisher.annotations_changed("u1", "d1", [_annotation("a")])
+    publisher.annotations_changed("u1", "d1", [_annotation("a", "blue")])
+    publisher.page_changed("u1", "d1", 7)
+    publisher.page_changed("u2", "d1", 1)
+    assert len(publisher) == 2
+    assert await publisher.flush() == 2
+
+    cursor, delta = await replay(cache, "u1", "d1", START_CURSOR, maxlen=2)
+    assert delta.to_dict()["annotations"] == [_annotation("a", "blue")]
+    assert delta.current_page == 7
+    assert await replay(cache, "u1", "d1", cursor) == (cursor, SyncDelta())
+
+    publisher.page_changed("u1", "d1", 8)
+    await publisher.flush()
+    publisher.page_changed("u1", "d1", 9)
+    await publisher.flush()
+    await publisher.stop()
+    # The first frame was trimmed: a client that only saw it must reload
+    assert await replay(cache, "u1", "d1", cursor) is None
+    assert await replay(cache, "u1", "d1", START_CURSOR, maxlen=2) is None
+    assert await replay(cache, "u1", "d1", "not-a-cursor") is None
+
+
+class _Socket:
+    """Minimal ASGI WebSocket client running the app on the test's event loop"""
+
+    def __init__(self, app, path, query=""):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.outgoing: asyncio.Queue = asyncio.Queue()
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "path": path,
+            "raw_path": path.encode(), "query_string": query.encode(), "headers": [],
+            "client": ("test", 1), "server": ("test", 80), "subprotocols": [],
+        }
+        self.outgoing.put_nowait({"type": "websocket.connect"})
+        self.task = asyncio.create_task(app(scope, self.outgoing.get, self.incoming.put))
+
+    async def receive(self):
+        return await asyncio.wait_for(self.incoming.get(), 5)
+
+    async def receive_json(self):
+        message = await self.receive()
+        assert message["type"] == "websocket.send", message
+        return json.loads(message["text"])
+
+    async def close(self):
+        await self.outgoing.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, 5)
+
+
+@pytest.fixture
+def connect_sync(api_client, parsed_document, user, monkeypatch):
+    from app.main import app
+
+    # Frames go out when the test flushes, not when the window elapses
+    monkeypatch.setattr(sync_publisher, "window", 60)
+    token = create_access_token(user.id)
+
+    def connect(cursor=None):
+        query = f"token={token}" + (f"&cursor={cursor}" if cursor else "")
+        return _Socket(app, f"/api/v1/sync/{parsed_document}", query)
+    return connect
+
+
+async def test_socket_pushes_coalesced_changes_and_resumes(api_client, parsed_document, connect_sync):
+    socket = connect_sync()
+    assert (await socket.receive())["type"] == "websocket.accept"
+    hello = await socket.receive_json()
+    assert hello == {"type": "hello", "cursor": START_CURSOR}
+
+    created = (await api_client.post("/api/v1/annotations", json={
+        "document_id": parsed_document, "type": "note", "position": {"page": 2}, "selected_text": "lorem",
+    })).json()
+    await api_client.patch(f"/api/v1/annotations/{created['id']}", json={"color": "green"})
+    await api_client.post("/api/v1/reading/progress", json={"document_id": parsed_document, "current_page": 5})
+    assert len(sync_publisher) == 1
+    await sync_publisher.flush()
+
+    # Three changes inside one window arrive as one frame
+    frame = await socket.receive_json()
+    assert frame["type"] == "delta"
+    [annotation] = frame["annotations"]
+    assert annotation["id"] == created["id"] and annotation["color"] == "green"
+    assert frame["current_page"] == 5
+    await socket.close()
+
+    # Changes made while disconnected are replayed from the cursor
+    response = await api_client.delete(f"/api/v1/annotations/{created['id']}")
+    assert response.status_code == 204
+    await sync_publisher.flush()
+
+    socket = connect_sync(cursor=frame["cursor"])
+    assert (await socket.receive())["type"] == "websocket.accept"
+    replayed = await socket.receive_json()
+    assert replayed["deleted"] == [created["id"]]
+    assert replayed["annotations"] == []
+    await socket.close()
+
+    socket = connect_sync(cursor="1-0")
+    await socket.receive()
+    assert (await socket.receive_json())["type"] == "reset"
+    await socket.close()
+
+
+async def test_socket_requires_owner(api_client, parsed_document):
+    from app.main import app
+
+    for query in ("", "token=bad", f"token={create_access_token('someone-else')}"):
+        socket = _Socket(app, f"/api/v1/sync/{parsed_document}", query)
+        message = await socket.receive()
+        assert message["type"] == "websocket.close" and message["code"] == 1008
+        await asyncio.wait_for(socket.task, 5)
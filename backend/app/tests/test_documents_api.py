@@ -0,0 +1,90 @@
+"""Tests for document API endpoints"""
+import pytest
+
+from app.api.v1 import documents
+from app.models import Document
+from app.utils.file_storage import FileStorage
+
+
+@pytest.fixture
+def queued(monkeypatch, tmp_path):
+    """Uploads stored under tmp_path, processing jobs recorded instead of run"""
+    jobs = []
+
+    async def fake_enqueue(document_id):
+        jobs.append(document_id)
+        return "job-1"
+
+    monkeypatch.setattr(documents, "enqueue_document_processing", fake_enqueue)
+    monkeypatch.setattr(documents, "file_storage", FileStorage(str(tmp_path)))
+    return jobs
+
+
+async def test_upload_returns_immediately_and_queues(api_client, session_maker, queued):
+    response = await api_client.post(
+        "/api/v1/documents",
+        files={"file": ("notes.md", b"# Title\nBody", "text/markdown")},
+    )
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "pending"
+    assert data["task_id"] == "job-1"
+    assert queued == [data["document_id"]]
+
+    async with session_maker() as session:
+        document = await session.get(Document, data["document_id"])
+    assert document.file_type == "md"
+    assert document.title == "notes"
+
+    status = await api_client.get(f"/api/v1/documents/{data['document_id']}/status")
+    assert status.json()["status"] == "pending"
+
+
+async def test_text_uploads_are_stored_as_utf8(api_client, session_maker, queued, tmp_path):
+    text = "第一章\r\n读书笔记\r\n" * 2000
+    ids = []
+    for encoding in ("gbk", "utf-8"):
+        response = await api_client.post(
+            "/api/v1/documents", files={"file": ("book.txt", text.encode(encoding), "text/plain")}
+        )
+        assert response.status_code == 202
+        ids.append(response.json()["document_id"])
+
+    async with session_maker() as session:
+        gbk, utf8 = [await session.get(Document, document_id) for document_id in ids]
+    # Same text in either encoding is one canonical file
+    assert gbk.file_hash == utf8.file_hash
+    with open(gbk.file_path, "rb") as stored:
+        assert stored.read() == text.replace("\r\n", "\n").encode("utf-8")
+    assert gbk.file_size == len(text.replace("\r\n", "\n").encode("utf-8"))
+
+    # Broken only after the validation sample: rejected while stored, nothing left behind
+    corrupt = text.encode("utf-8") + b"\xff\xfe"
+    response = await api_client.post(
+        "/api/v1/documents", files={"file": ("bad.txt", corrupt, "text/plain")}
+    )
+    assert response.status_code == 400
+    assert "not valid utf-8 text" in response.json()["detail"]
+    assert not list(tmp_path.glob("**/.upload-*"))
+
+
+async def test_progress_stream_for_finished_document(api_client, session_maker, queued):
+    response = await api_client.post(
+        "/api/v1/documents", files={"file": ("a.txt", b"hello", "text/plain")}
+    )
+    document_id = response.json()["document_id"]
+    async with session_maker() as session:
+        document = await session.get(Document, document_id)
+        document.processing_status = "completed"
+        await session.commit()
+
+    stream = await api_client.get(f"/api/v1/documents/{document_id}/progress")
+    assert stream.headers["content-type"].startswith("text/event-stream")
+    assert '"status": "completed"' in stream.text
+
+
+async def test_requires_authentication(api_client):
+    response = await api_client.get(
+        "/api/v1/documents/doc_x/status", headers={"Authorization": "Bearer bogus"}
+    )
+    assert response.status_code == 401
@@ -0,0 +1,102 @@
+"""Tests for upload validation and ZIP container sniffing"""
+import io
+import os
+import struct
+import zipfile
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import settings
+from app.utils.file_validation import (
+    DOCX_MIME_TYPE,
+    EPUB_MIME_TYPE,
+    sniff_zip_container,
+    validate_file,
+)
+
+
+def _zip(entries, compression=zipfile.ZIP_DEFLATED) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data, compress_type=zipfile.ZIP_STORED if name == "mimetype" else compression)
+    return buffer.getvalue()
+
+
+EPUB = {"mimetype": "application/epub+zip", "META-INF/container.xml": "<container/>", "OEBPS/ch1.xhtml": "<p/>"}
+DOCX = {"[Content_Types].xml": "<Types/>", "_rels/.rels": "<Relationships/>", "word/document.xml": "<w:document/>"}
+
+
+class CountingFile(io.BytesIO):
+    """BytesIO that counts the bytes read from it"""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def test_sniff_tells_epub_from_docx():
+    assert sniff_zip_container(io.BytesIO(_zip(EPUB))) == EPUB_MIME_TYPE
+    assert sniff_zip_container(io.BytesIO(_zip(DOCX))) == DOCX_MIME_TYPE
+    with pytest.raises(HTTPException, match="neither an EPUB nor a DOCX"):
+        sniff_zip_container(io.BytesIO(_zip({"readme.txt": "hi"})))
+
+
+def test_sniff_reads_only_the_central_directory():
+    archive = _zip({**EPUB, "OEBPS/cover.jpg": os.urandom(4 * 1024 * 1024)}, zipfile.ZIP_STORED)
+    file = CountingFile(archive)
+    assert sniff_zip_container(file) == EPUB_MIME_TYPE
+    # The tail holding the EOCD, then the directory: nowhere near the 4MB entry
+    assert file.bytes_read < 70 * 1024
+    assert file.tell() == 0
+
+
+def test_sniff_rejects_zip_bombs(monkeypatch):
+    bomb = _zip({**DOCX, "word/media/zeros.bin": b"\0" * (20 * 1024 * 1024)})
+    assert len(bomb) < 100 * 1024
+    with pytest.raises(HTTPException, match="compression ratio"):
+        sniff_zip_container(io.BytesIO(bomb))
+
+    monkeypatch.setattr(settings, "ZIP_MAX_UNCOMPRESSED_SIZE", 1024)
+    with pytest.raises(HTTPException, match="uncompressed size"):
+        sniff_zip_container(io.BytesIO(_zip({**DOCX, "word/big.xml": "x" * 2048})))
+
+    monkeypatch.setattr(settings, "ZIP_MAX_ENTRIES", 2)
+    with pytest.raises(HTTPException, match="more than 2 entries"):
+        sniff_zip_container(io.BytesIO(_zip(DOCX)))
+
+
+def test_sniff_rejects_overlapping_and_corrupt_archives():
+    archive = _zip(EPUB)
+    eocd = archive.rindex(b"PK\x05\x06")
+    entries, directory_size, directory_offset = struct.unpack_from("<2H2L", archive, eocd + 8)[1:]
+    first_header = archive[directory_offset:archive.index(b"PK\x01\x02", directory_offset + 4)]
+    # The first central directory entry twice: two names for one local file
+    overlapping = (
+        archive[:directory_offset] + first_header + archive[directory_offset:eocd]
+        + archive[eocd:eocd + 8]
+        + struct.pack("<2H2L", entries + 1, entries + 1, directory_size + len(first_header), directory_offset)
+        + archive[eocd + 20:]
+    )
+    with pytest.raises(HTTPException, match="overlapping entries"):
+        sniff_zip_container(io.BytesIO(overlapping))
+
+    with pytest.raises(HTTPException, match="end of central directory not found"):
+        sniff_zip_container(io.BytesIO(archive[:eocd]))
+    with pytest.raises(HTTPException, match="out of bounds"):
+        sniff_zip_container(io.BytesIO(archive[directory_offset // 2:]))
+
+
+async def test_validate_file_detects_container_type():
+    info = await validate_file(UploadFile(io.BytesIO(_zip(DOCX)), filename="report.docx"))
+    assert info["mime_type"] == DOCX_MIME_TYPE
+
+    info = await validate_file(UploadFile(io.BytesIO(_zip(EPUB)), filename="book.epub"))
+    assert info["mime_type"] == EPUB_MIME_TYPE
+
+    with pytest.raises(HTTPException, match="does not match file content"):
+        await validate_file(UploadFile(io.BytesIO(_zip(DOCX)), filename="book.epub"))
@@ -0,0 +1,163 @@
+"""Tests for document parsing and the ingestion pipeline"""
+import json
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.document_parser import UnsupportedDocumentError, get_parser
+from app.models import AISummary, Document
+from app.tasks.pipeline import IngestionPipeline, get_pipeline
+from app.tasks.progress import progress_channel, progress_key
+from app.utils.text_processing import chunk_pages
+
+
+def test_markdown_outline(tmp_path):
+    path = tmp_path / "book.md"
+    path.write_text("Intro\n# Chapter 1\nOne\n## 1.1\nSub\n# Chapter 2\nTwo\n", encoding="utf-8")
+
+    parsed = get_parser("md").parse(path)
+    outline = parsed.outline
+    assert outline["text"] == "Intro"
+    assert [c["title"] for c in outline["children"]] == ["Chapter 1", "Chapter 2"]
+    assert outline["children"][0]["children"][0] == {"title": "1.1", "text": "Sub", "children": []}
+
+
+def test_unsupported_file_type():
+    with pytest.raises(UnsupportedDocumentError):
+        get_parser("pdf")
+
+
+def test_chunk_pages_overlap_and_bounds():
+    pages = ["word " * 500, "short page"]
+    chunks = chunk_pages(pages, chunk_size=200, overlap=50)
+    assert chunks[-1]["page"] == 2
+    first, second = chunks[0], chunks[1]
+    assert first["start"] == 0 and first["end"] <= 200
+    assert second["start"] < first["end"]
+    assert all(c["end"] <= len(pages[c["page"] - 1]) for c in chunks)
+
+
+async def add_document(session_maker, user, path, file_type):
+    async with session_maker() as session:
+        session.add(Document(
+            id="doc_1", user_id=user.id, title="Book", file_path=str(path),
+            file_hash="abc", file_size=path.stat().st_size, file_type=file_type,
+        ))
+        await session.commit()
+
+
+async def test_pipeline_completes_and_publishes_progress(tmp_path, session_maker, user, cache):
+    path = tmp_path / "book.txt"
+    path.write_text("Some text. " * 1000, encoding="utf-8")
+    await add_document(session_maker, user, path, "txt")
+
+    pubsub = cache.redis.pubsub()
+    await pubsub.subscribe(progress_channel("doc_1"))
+
+    await IngestionPipeline(session_maker, cache).run("doc_1")
+
+    async with session_maker() as session:
+        document = await session.get(Document, "doc_1")
+    assert document.processing_status == "completed"
+    assert document.parse_version == 1
+    assert document.page_count == len(document.parsed_content["pages"]) > 1
+    assert document.parsed_content["chunks"]
+
+    latest = json.loads(await cache.get(progress_key("doc_1")))
+    assert latest["status"] == "completed"
+
+    stages = []
+    for _ in range(20):
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.01)
+        if message:
+            stages.append(json.loads(message["data"])["stage"])
+    assert "parse" in stages and "chunk" in stages
+    await pubsub.aclose()
+
+
+async def test_pipeline_marks_failures(tmp_path, session_maker, user, cache):
+    path = tmp_path / "book.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    await add_document(session_maker, user, path, "pdf")
+
+    with pytest.raises(UnsupportedDocumentError):
+        await IngestionPipeline(session_maker, cache).run("doc_1")
+
+    async with session_maker() as session:
+        document = await session.get(Document, "doc_1")
+    assert document.processing_status == "failed"
+    assert "No parser available" in document.processing_error
+
+
+class FakeProviders:
+    """OpenAI-compatible and Qdrant endpoints served by an httpx transport"""
+
+    def __init__(self):
+        self.points = {}
+        self.collection = None
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        body = json.loads(request.content) if request.content else {}
+        if path.endswith("/chat/completions"):
+            prompt = body["messages"][0]["content"]
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": f"summary of {len(prompt)} chars"}}],
+            })
+        if path.endswith("/embeddings"):
+            return httpx.Response(200, json={"data": [
+                {"index": i, "embedding": [1.0, 0.0, float(i)]} for i in range(len(body["input"]))
+            ]})
+        if path.endswith("/points/delete"):
+            self.points.clear()
+            return httpx.Response(200, json={"result": {}})
+        if path.endswith("/points"):
+            self.points.update({point["id"]: point for point in body["points"]})
+            return httpx.Response(200, json={"result": {}})
+        if path.endswith("/index"):
+            return httpx.Response(200, json={"result": {}})
+        if request.method == "GET":
+            if self.collection is None:
+                return httpx.Response(404, json={"status": {"error": "Not found"}})
+            return httpx.Response(200, json={"result": self.collection})
+        self.collection = body
+        return httpx.Response(200, json={"result": True})
+
+
+async def test_get_pipeline_runs_all_stages(tmp_path, session_maker, user, cache, monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+    providers = FakeProviders()
+    path = tmp_path / "book.md"
+    path.write_text("# Chapter 1\n" + "One. " * 400 + "\n# Chapter 2\n" + "Two. " * 400, encoding="utf-8")
+    await add_document(session_maker, user, path, "md")
+
+    pubsub = cache.redis.pubsub()
+    await pubsub.subscribe(progress_channel("doc_1"))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(providers.handle)) as client:
+        await get_pipeline(cache, session_maker, http_client=client).run("doc_1")
+
+    async with session_maker() as session:
+        document = await session.get(Document, "doc_1")
+        summary = await session.scalar(select(AISummary).where(AISummary.document_id == "doc_1"))
+    assert document.processing_status == "completed"
+    assert document.is_indexed is True
+    assert providers.collection["vectors"] == {"size": 3, "distance": "Cosine"}
+    assert len(providers.points) == len(document.parsed_content["chunks"])
+    assert summary.summary_type == "full" and summary.text.startswith("summary of")
+
+    stages = set()
+    for _ in range(50):
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.01)
+        if message:
+            stages.add(json.loads(message["data"])["stage"])
+    assert {"parse", "chunk", "embed", "summarize"} <= stages
+    await pubsub.aclose()
+
+
+def test_get_pipeline_requires_provider_key(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "")
+    with pytest.raises(RuntimeError, match="OPENAI_API_KEY"):
+        get_pipeline()
@@ -0,0 +1,150 @@
+"""Tests for the in-process ingestion job runner"""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.base import Base
+from app.models import Document, IngestionJob
+from app.tasks.runner import InProcessJobRunner, _now
+
+
+@pytest.fixture
+async def db_engine(tmp_path):
+    """File-backed database, so concurrent sessions don't share one connection"""
+    # On the shared in-memory connection one session's rollback can undo
+    # another's uncommitted job claim
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+class RecordingPipeline:
+    def __init__(self, block=None):
+        self.runs = []
+        self.block = block
+
+    async def run(self, document_id):
+        self.runs.append(document_id)
+        if self.block is not None:
+            await self.block.wait()
+
+
+@pytest.fixture
+async def document(session_maker, user):
+    async with session_maker() as session:
+        session.add(Document(
+            id="doc_1", user_id=user.id, title="Book", file_path="/tmp/book.txt",
+            file_hash="abc", file_size=1, file_type="txt",
+        ))
+        await session.commit()
+
+
+def make_runner(session_maker, pipeline, **kwargs):
+    runner = InProcessJobRunner(session_maker, workers=2, **kwargs)
+    runner.pipeline = pipeline
+    return runner
+
+
+async def wait_for_status(session_maker, job_id, status):
+    for _ in range(100):
+        async with session_maker() as session:
+            job = await session.get(IngestionJob, job_id)
+            if job.status == status:
+                return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job never reached {status}")
+
+
+async def test_submit_runs_job_and_records_state(session_maker, document):
+    pipeline = RecordingPipeline()
+    runner = make_runner(session_maker, pipeline)
+    await runner.start()
+
+    job_id = await runner.submit("doc_1")
+    job = await wait_for_status(session_maker, job_id, "completed")
+    await runner.stop()
+
+    assert pipeline.runs == ["doc_1"]
+    assert job.attempts == 1
+    assert job.finished_at is not None
+
+
+async def test_recovers_interrupted_jobs(session_maker, document):
+    async with session_maker() as session:
+        session.add_all([
+            IngestionJob(id="job_crashed", document_id="doc_1", status="processing", attempts=1),
+            IngestionJob(id="job_poison", document_id="doc_1", status="processing", attempts=3),
+        ])
+        await session.commit()
+
+    pipeline = RecordingPipeline()
+    runner = make_runner(session_maker, pipeline, max_attempts=3)
+    await runner.start()
+    await wait_for_status(session_maker, "job_crashed", "completed")
+    await runner.stop()
+
+    assert pipeline.runs == ["doc_1"]
+    async with session_maker() as session:
+        poison = await session.get(IngestionJob, "job_poison")
+        doc = await session.get(Document, "doc_1")
+    assert poison.status == "failed"
+    assert doc.processing_status == "failed"
+
+
+async def test_stop_leaves_unfinished_jobs_for_next_start(session_maker, document):
+    pipeline = RecordingPipeline(block=asyncio.Event())
+    runner = make_runner(session_maker, pipeline, drain_timeout=0.05)
+    await runner.start()
+    job_id = await runner.submit("doc_1")
+    await wait_for_status(session_maker, job_id, "processing")
+
+    await runner.stop()
+    with pytest.raises(RuntimeError):
+        await runner.submit("doc_1")
+
+    pipeline.block.set()
+    await runner.start()
+    await wait_for_status(session_maker, job_id, "completed")
+    await runner.stop()
+    assert pipeline.runs == ["doc_1", "doc_1"]
+
+
+async def test_live_leases_are_not_recovered(session_maker, document):
+    async with session_maker() as session:
+        # Running in another process whose heartbeat is still fresh
+        session.add(IngestionJob(
+            id="job_elsewhere", document_id="doc_1", status="processing",
+            attempts=1, heartbeat_at=_now(),
+        ))
+        await session.commit()
+
+    pipeline = RecordingPipeline()
+    runner = make_runner(session_maker, pipeline, lease_seconds=0.2)
+    await runner.start()
+    await asyncio.sleep(0.05)
+    assert pipeline.runs == []
+
+    # That process died: once the lease expires the sweeper takes the job over
+    job = await wait_for_status(session_maker, "job_elsewhere", "completed")
+    await runner.stop()
+    assert pipeline.runs == ["doc_1"]
+    assert job.attempts == 2
+
+
+async def test_queued_job_is_claimed_once(session_maker, document):
+    async with session_maker() as session:
+        session.add(IngestionJob(id="job_1", document_id="doc_1", status="queued"))
+        await session.commit()
+
+    pipeline = RecordingPipeline()
+    # Two processes' runners that both dequeued the same job
+    runners = [make_runner(session_maker, pipeline) for _ in range(2)]
+    await asyncio.gather(*(runner._execute("job_1") for runner in runners))
+
+    assert pipeline.runs == ["doc_1"]
+    async with session_maker() as session:
+        job = await session.get(IngestionJob, "job_1")
+    assert (job.status, job.attempts) == ("completed", 1)
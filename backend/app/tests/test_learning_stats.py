@@ -0,0 +1,115 @@
+"""Tests for incremental learning statistics rollups"""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.db.base import utcnow
+from app.models import Document, ReadingSession, User, UserDailyStats, UserDocumentStats
+from app.services import reading_service
+from app.services.progress_buffer import ProgressBuffer
+from app.services.stats_service import rebuild_user_stats
+
+
+@pytest.fixture
+async def documents(session_maker, user):
+    async with session_maker() as session:
+        for i in range(2):
+            session.add(Document(
+                id=f"doc_{i}", user_id="user_1", title=f"Book {i}", file_path=f"/tmp/{i}.txt",
+                file_hash=str(i) * 64, file_size=1, file_type="txt",
+            ))
+        await session.commit()
+
+
+async def _read(session_maker, document_id, minutes, questions=0):
+    async with session_maker() as db:
+        db.add(ReadingSession(
+            id=f"rs_{document_id}_{minutes}", user_id="user_1", document_id=document_id,
+            start_time=utcnow() - timedelta(minutes=minutes), questions_asked=questions,
+        ))
+        await db.commit()
+        await reading_service.end_session(
+            db, "user_1", f"rs_{document_id}_{minutes}", ProgressBuffer(session_maker)
+        )
+
+
+async def _snapshot(session_maker):
+    async with session_maker() as db:
+        user = await db.get(User, "user_1")
+        daily = [(d.day, d.reading_seconds, d.sessions, d.questions_asked)
+                 for d in await db.scalars(select(UserDailyStats))]
+        docs = {d.document_id: (d.reading_seconds, d.sessions)
+                for d in await db.scalars(select(UserDocumentStats))}
+    return user.total_reading_time, user.documents_read, daily, docs
+
+
+async def test_sessions_roll_up_incrementally(session_maker, documents):
+    await _read(session_maker, "doc_0", 10, questions=2)
+    await _read(session_maker, "doc_0", 5)
+    await _read(session_maker, "doc_1", 1, questions=1)
+
+    total, documents_read, daily, docs = await _snapshot(session_maker)
+    assert total == 16 * 60
+    assert documents_read == 2
+    # Sessions are attributed to their UTC start day (one row unless run around midnight)
+    assert tuple(sum(row[i] for row in daily) for i in (1, 2, 3)) == (16 * 60, 3, 3)
+    assert docs == {"doc_0": (15 * 60, 2), "doc_1": (60, 1)}
+
+    # Rebuilding from history gives the same aggregates
+    before = await _snapshot(session_maker)
+    async with session_maker() as db:
+        assert await rebuild_user_stats(db, "user_1") == 3
+    assert await _snapshot(session_maker) == before
+
+
+async def test_dashboard_endpoint(api_client, session_maker, documents):
+    await _read(session_maker, "doc_1", 3)
+
+    response = await api_client.get("/api/v1/stats/dashboard", params={"days": 7})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_reading_time"] == 180
+    assert data["documents_read"] == 1
+    assert data["daily"][0]["sessions"] == 1
+    assert data["recent_documents"][0]["document_id"] == "doc_1"
+
+
+async def test_concurrent_end_rolls_up_once(session_maker, documents):
+    async with session_maker() as db:
+        db.add(ReadingSession(
+            id="rs_1", user_id="user_1", document_id="doc_0",
+            start_time=utcnow() - timedelta(minutes=4),
+        ))
+        await db.commit()
+
+    class RacingBuffer(ProgressBuffer):
+        async def flush_key(self, user_id, document_id):
+            # Another request ends the session after this one checked end_time
+            async with session_maker() as other:
+                await reading_service.end_session(
+                    other, user_id, "rs_1", ProgressBuffer(session_maker)
+                )
+
+    async with session_maker() as db:
+        session = await reading_service.end_session(
+            db, "user_1", "rs_1", RacingBuffer(session_maker)
+        )
+    assert session.end_time is not None
+
+    total, documents_read, daily, docs = await _snapshot(session_maker)
+    assert total == 4 * 60
+    assert documents_read == 1
+    assert docs == {"doc_0": (4 * 60, 1)}
+
+
+async def test_dashboard_skips_coverage_only_documents(api_client, session_maker, documents):
+    await _read(session_maker, "doc_1", 3)
+    # Pages viewed in a session that hasn't ended: coverage row without last_read_at
+    async with session_maker() as db:
+        db.add(UserDocumentStats(user_id="user_1", document_id="doc_0", page_bitmap=b"\x01", pages_read=1))
+        await db.commit()
+
+    response = await api_client.get("/api/v1/stats/dashboard")
+    assert response.status_code == 200
+    assert [d["document_id"] for d in response.json()["recent_documents"]] == ["doc_1"]
@@ -0,0 +1,148 @@
+"""Tests for the LLM request scheduler"""
+import asyncio
+
+import pytest
+
+from app.core.ai.scheduler import LLMScheduler, Priority, ProviderLimits, TokenBucket
+
+
+class RateLimitedError(Exception):
+    status_code = 429
+
+
+@pytest.fixture
+def scheduler():
+    limits = {"test": ProviderLimits(requests_per_minute=6000, tokens_per_minute=10**6, max_concurrency=1)}
+    return LLMScheduler(limits, max_retries=2, retry_base_delay=0.001, retry_max_delay=0.01)
+
+
+async def test_interactive_requests_jump_the_queue(scheduler):
+    order = []
+    release = asyncio.Event()
+
+    async def blocker():
+        await release.wait()
+
+    def job(name):
+        async def call():
+            order.append(name)
+        return call
+
+    first = asyncio.create_task(scheduler.submit(blocker, provider="test"))
+    await asyncio.sleep(0)
+    background = [
+        asyncio.create_task(scheduler.submit(job(f"bg{i}"), provider="test"))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    chat = asyncio.create_task(
+        scheduler.submit(job("chat"), provider="test", priority=Priority.INTERACTIVE)
+    )
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth("test") == 4
+
+    release.set()
+    await asyncio.gather(first, chat, *background)
+    assert order == ["chat", "bg0", "bg1", "bg2"]
+
+
+async def test_identical_prompts_are_coalesced(scheduler):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "summary"
+
+    results = await asyncio.gather(
+        *(scheduler.submit(call, provider="test", coalesce_key="same") for _ in range(5))
+    )
+    assert results == ["summary"] * 5
+    assert calls == [1]
+
+
+async def test_retries_transient_errors(scheduler):
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitedError()
+        return "ok"
+
+    assert await scheduler.submit(flaky, provider="test") == "ok"
+    assert len(attempts) == 3
+
+
+async def test_gives_up_after_max_retries(scheduler):
+    async def broken():
+        raise RateLimitedError()
+
+    with pytest.raises(RateLimitedError):
+        await scheduler.submit(broken, provider="test")
+
+    async def invalid():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await scheduler.submit(invalid, provider="test")
+
+
+async def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate_per_minute=6000, capacity=10)
+    await bucket.acquire(10)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await bucket.acquire(5)
+    assert loop.time() - started >= 0.04
+
+
+async def test_interactive_requests_jump_the_rate_limit_queue(scheduler):
+    order = []
+
+    def job(name):
+        async def call():
+            order.append(name)
+        return call
+
+    # Out of request budget: everyone waits for the refill (100/s)
+    scheduler._lane("test").requests.tokens = 0
+    background = [
+        asyncio.create_task(scheduler.submit(job(f"bg{i}"), provider="test"))
+        for i in range(2)
+    ]
+    await asyncio.sleep(0)
+    chat = asyncio.create_task(
+        scheduler.submit(job("chat"), provider="test", priority=Priority.INTERACTIVE)
+    )
+    await asyncio.gather(chat, *background)
+    assert order == ["chat", "bg0", "bg1"]
+
+
+async def test_cancelled_leader_does_not_cancel_coalesced_followers(scheduler):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "answer"
+
+    leader = asyncio.create_task(scheduler.submit(call, provider="test", coalesce_key="q"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(scheduler.submit(call, provider="test", coalesce_key="q"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "answer"
+    assert leader.cancelled()
+    assert calls == [1]
+
+    # With no one left waiting, the shared call is cancelled too
+    alone = asyncio.create_task(scheduler.submit(call, provider="test", coalesce_key="r"))
+    await asyncio.sleep(0.005)
+    alone.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await alone
+    await asyncio.sleep(0.01)
+    assert not scheduler._inflight
+    assert calls == [1, 1]
@@ -0,0 +1,71 @@
+"""Query budgets of endpoints using eager-loading profiles"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.db.loading import load_profile
+from app.models import AISummary, Annotation, Document
+
+
+@pytest.fixture
+async def library(session_maker, user):
+    async with session_maker() as session:
+        for i in range(5):
+            session.add(Document(
+                id=f"doc_{i}", user_id="user_1", title=f"Book {i}", file_path=f"/tmp/{i}.txt",
+                file_hash=str(i) * 64, file_size=1, file_type="txt", page_count=10,
+                parsed_content={"pages": ["x" * 1000] * 10},
+            ))
+        for i in range(12):
+            session.add(Annotation(
+                id=f"ann_{i}", user_id="user_1", document_id="doc_0", type="highlight",
+                position={"page": 1}, selected_text="text",
+            ))
+        for kind in ("full", "chapter"):
+            session.add(AISummary(
+                id=f"sum_{kind}", document_id="doc_0", summary_type=kind,
+                content={}, text=f"{kind} summary",
+            ))
+        await session.commit()
+
+
+# endpoint -> queries, including the one get_current_user spends loading the user
+QUERY_BUDGETS = {
+    "/api/v1/documents": 2,
+    "/api/v1/documents/doc_0": 4,
+    "/api/v1/documents/doc_0/status": 2,
+    "/api/v1/users/me": 3,
+}
+
+
+@pytest.mark.parametrize("path", sorted(QUERY_BUDGETS))
+async def test_endpoint_query_budget(api_client, library, query_counter, path):
+    query_counter.reset()
+    response = await api_client.get(path)
+    assert response.status_code == 200, response.text
+    assert query_counter.count == QUERY_BUDGETS[path], query_counter.statements
+    assert not any("parsed_content" in s for s in query_counter.statements)
+
+
+async def test_reader_payload(api_client, library):
+    data = (await api_client.get("/api/v1/documents/doc_0")).json()
+    assert len(data["annotations"]) == 12
+    assert {s["summary_type"] for s in data["ai_summaries"]} == {"full", "chapter"}
+
+    data = (await api_client.get("/api/v1/users/me")).json()
+    assert len(data["documents"]) == 5
+
+
+async def test_profiles_raise_instead_of_lazy_loading(session_maker, library):
+    async with session_maker() as session:
+        document = await session.scalar(
+            select(Document).where(Document.id == "doc_1").options(*load_profile("document_card"))
+        )
+        assert document.title == "Book 1"
+        with pytest.raises(InvalidRequestError):
+            document.parsed_content
+        with pytest.raises(InvalidRequestError):
+            document.annotations
+
+    with pytest.raises(ValueError):
+        load_profile("everything")
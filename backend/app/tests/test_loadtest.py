@@ -0,0 +1,54 @@
+"""Tests for the load-test harness (stub LLM, simulated content, reporting)"""
+import random
+import time
+
+from app.core.document_parser.markdown_parser import MarkdownParser
+from loadtest import Recorder, StubLLM, make_book, percentile
+
+
+def test_percentiles_and_report():
+    values = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([0.2], 95) == 0.2
+    assert percentile([], 50) == 0.0
+
+    recorder = Recorder()
+    for value in values:
+        recorder.record("read_pages", value, 200)
+    recorder.record("read_pages", 0.5, 500, ok=False)
+    recorder.record("processing", 3.0)
+    recorder.finished = recorder.started + 10
+    report = recorder.report()
+
+    pages = report["operations"]["read_pages"]
+    assert (pages["count"], pages["errors"]) == (100, 1)
+    assert pages["p95_ms"] == 95.0
+    assert pages["statuses"] == {200: 100, 500: 1}
+    # Processing is timed end to end, not sent as a request
+    assert report["requests"] == 101
+    assert report["throughput"] == 10.1
+
+
+async def test_stub_llm_paces_completions():
+    llm = StubLLM(latency=0.05, tokens_per_second=200, answer_tokens=10)
+    assert llm.duration(10) == 0.1
+
+    started = time.perf_counter()
+    answer = await llm.complete("prompt")
+    assert time.perf_counter() - started >= 0.09
+    assert len(answer.split()) == 10
+    assert answer == await llm.complete("prompt")
+    assert await llm.embed("Same  question") == await llm.embed("same question")
+
+
+def test_books_are_unique_and_outlined(tmp_path):
+    first = make_book(0, "run", 3, random.Random(0))
+    assert first != make_book(1, "run", 3, random.Random(0))
+
+    path = tmp_path / "book.md"
+    path.write_bytes(first)
+    parsed = MarkdownParser().parse(path)
+    # Headings give the summarizer a chapter outline to map-reduce over
+    [book] = parsed.outline["children"]
+    assert [c["title"] for c in book["children"]] == ["Chapter 1", "Chapter 2", "Chapter 3"]
@@ -0,0 +1,73 @@
+"""Tests for request metrics, Prometheus exposition and event loop lag"""
+import asyncio
+import time
+
+from app.core.metrics import LoopLagMonitor, MetricsRegistry, event_loop_lag_histogram
+from app.core.middleware import UNMATCHED_ROUTE, http_request_duration, http_requests_in_flight
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.counter("jobs", "Jobs run", ["queue"]).labels(queue='a"b').inc(2)
+    registry.gauge("depth", "Queue depth").set(1.5)
+    registry.histogram("latency", "Latency", buckets=(0.1, 1)).observe(0.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP depth Queue depth",
+        "# TYPE depth gauge",
+        "depth 1.5",
+        "# HELP jobs_total Jobs run",
+        "# TYPE jobs_total counter",
+        'jobs_total{queue="a\\"b"} 2',
+        "# HELP latency Latency",
+        "# TYPE latency histogram",
+        'latency_bucket{le="0.1"} 0',
+        'latency_bucket{le="1"} 1',
+        'latency_bucket{le="+Inf"} 1',
+        "latency_sum 0.5",
+        "latency_count 1",
+    ]
+
+
+async def test_requests_are_labelled_by_route_template(api_client, session_maker, user):
+    from app.models import Document
+
+    async with session_maker() as session:
+        session.add(Document(
+            id="doc_1", user_id=user.id, title="T", file_path="/tmp/t.txt",
+            file_hash="0" * 64, file_size=1, file_type="txt",
+        ))
+        await session.commit()
+
+    route = "/api/v1/documents/{document_id}"
+    before = http_request_duration.labels("GET", route, "2xx").count
+    assert (await api_client.get("/api/v1/documents/doc_1")).status_code == 200
+    assert (await api_client.get("/api/v1/documents/doc_1")).status_code == 200
+    assert http_request_duration.labels("GET", route, "2xx").count == before + 2
+
+    unmatched = http_request_duration.labels("GET", UNMATCHED_ROUTE, "4xx").count
+    assert (await api_client.get("/no/such/path/123")).status_code == 404
+    assert http_request_duration.labels("GET", UNMATCHED_ROUTE, "4xx").count == unmatched + 1
+    assert http_requests_in_flight.value == 0
+
+
+async def test_metrics_endpoint(api_client):
+    await api_client.get("/health")
+    response = await api_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'readpilot_http_request_duration_seconds_count{method="GET",route="/health",status="2xx"}' in response.text
+    assert "# TYPE readpilot_http_requests_in_flight gauge" in response.text
+
+
+async def test_loop_lag_monitor_sees_blocking_code():
+    monitor = LoopLagMonitor(interval=0.01)
+    before = event_loop_lag_histogram.sum
+    await monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # block the loop
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+    assert not monitor.running
+    assert event_loop_lag_histogram.sum - before >= 0.05
+
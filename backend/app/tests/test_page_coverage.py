@@ -0,0 +1,62 @@
+"""Tests for page coverage bitmaps"""
+import pytest
+
+from app.models import Document, UserDocumentStats
+from app.services.progress_buffer import ProgressBuffer
+from app.utils.page_bitmap import (
+    bitmap_count,
+    bitmap_or,
+    bitmap_pages,
+    pages_to_bitmap,
+    unread_ranges,
+)
+
+
+def test_bitmap_round_trip_and_union():
+    a = pages_to_bitmap([1, 2, 3, 9])
+    assert a == bytes([0b00000111, 0b00000001])
+    b = pages_to_bitmap([3, 4, 40])
+    merged = bitmap_or(a, b)
+    assert bitmap_pages(merged) == [1, 2, 3, 4, 9, 40]
+    assert bitmap_count(merged) == 6
+    assert len(merged) == 5
+    assert pages_to_bitmap([0, -1]) == b""
+
+
+def test_unread_ranges():
+    bitmap = pages_to_bitmap([1, 2, 3, 9] + list(range(17, 33)))
+    assert unread_ranges(bitmap, 40) == [(4, 8), (10, 16), (33, 40)]
+    assert unread_ranges(b"", 3) == [(1, 3)]
+    assert unread_ranges(pages_to_bitmap(range(1, 11)), 10) == []
+    # Bits beyond the last page are ignored
+    assert unread_ranges(pages_to_bitmap([1, 2, 50]), 3) == [(3, 3)]
+
+
+@pytest.fixture
+async def document(session_maker, user):
+    async with session_maker() as session:
+        session.add(Document(
+            id="doc_1", user_id="user_1", title="Book", file_path="/tmp/book.txt",
+            file_hash="h" * 64, file_size=1, file_type="txt", page_count=20,
+        ))
+        await session.commit()
+
+
+async def test_flushes_or_into_coverage(api_client, session_maker, document):
+    buffer = ProgressBuffer(session_maker)
+    await buffer.record("user_1", "doc_1", 5, pages=[1, 2, 3, 4, 5])
+    await buffer.flush()
+    await buffer.record("user_1", "doc_1", 12, pages=[4, 10, 11, 12])
+    await buffer.flush()
+
+    async with session_maker() as session:
+        stats = await session.get(UserDocumentStats, ("user_1", "doc_1"))
+    assert stats.pages_read == 8
+    assert bitmap_pages(stats.page_bitmap) == [1, 2, 3, 4, 5, 10, 11, 12]
+
+    response = await api_client.get("/api/v1/stats/documents/doc_1/coverage")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pages_read"] == 8
+    assert data["coverage"] == 0.4
+    assert data["unread"] == [[6, 9], [13, 20]]
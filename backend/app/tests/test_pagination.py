@@ -0,0 +1,138 @@
+"""Tests for keyset pagination of annotations and chat history"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text
+
+from app.db.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.models import Annotation, ChatMessage, Document
+from app.services.annotation_service import list_annotations
+from app.services.chat_service import list_chat_history
+
+BASE_TIME = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+async def document(session_maker, user):
+    async with session_maker() as session:
+        document = Document(
+            id="doc_1", user_id=user.id, title="Book", file_path="/tmp/book.txt",
+            file_hash="h" * 64, file_size=1, file_type="txt",
+        )
+        session.add(document)
+        await session.commit()
+    return document
+
+
+async def _add_annotations(session_maker, document, count):
+    async with session_maker() as session:
+        for i in range(count):
+            session.add(Annotation(
+                id=f"ann_{i:03d}", user_id=document.user_id, document_id=document.id,
+                type="highlight", position={"page": i}, selected_text=f"text {i}",
+                # Groups of three share a timestamp so the id tie-breaker matters
+                created_at=BASE_TIME + timedelta(seconds=i // 3),
+            ))
+        await session.commit()
+
+
+async def _collect(fetch):
+    items, cursor, pages = [], None, 0
+    while True:
+        page = await fetch(cursor)
+        items.extend(page.items)
+        pages += 1
+        if not page.has_more:
+            return items, pages
+        cursor = page.next_cursor
+
+
+async def test_annotation_pages_cover_every_row_once(session_maker, document):
+    await _add_annotations(session_maker, document, 25)
+
+    async with session_maker() as session:
+        items, pages = await _collect(
+            lambda cursor: list_annotations(session, "user_1", "doc_1", cursor, limit=7)
+        )
+    assert pages == 4
+    assert [a.id for a in items] == [f"ann_{i:03d}" for i in range(25)]
+
+    async with session_maker() as session:
+        items, _ = await _collect(
+            lambda cursor: list_annotations(session, "user_1", "doc_1", cursor, 7, descending=True)
+        )
+    assert [a.id for a in items] == [f"ann_{i:03d}" for i in reversed(range(25))]
+
+
+async def test_inserts_do_not_shift_later_pages(session_maker, document):
+    await _add_annotations(session_maker, document, 10)
+
+    async with session_maker() as session:
+        first = await list_annotations(session, "user_1", "doc_1", limit=5)
+        # A row sorting before the cursor must not push rows onto the next page
+        session.add(Annotation(
+            id="ann_early", user_id="user_1", document_id="doc_1", type="note",
+            position={}, selected_text="x", created_at=BASE_TIME - timedelta(days=1),
+        ))
+        await session.commit()
+        second = await list_annotations(session, "user_1", "doc_1", first.next_cursor, limit=5)
+
+    assert [a.id for a in second.items] == [f"ann_{i:03d}" for i in range(5, 10)]
+    assert second.next_cursor is None
+
+
+async def test_chat_history_newest_first(session_maker, document):
+    async with session_maker() as session:
+        for i in range(5):
+            session.add(ChatMessage(
+                id=f"msg_{i}", user_id="user_1", document_id="doc_1",
+                role="user" if i % 2 == 0 else "assistant", content=f"m{i}",
+                created_at=BASE_TIME + timedelta(minutes=i),
+            ))
+        await session.commit()
+
+        page = await list_chat_history(session, "doc_1", "user_1", limit=2)
+        assert [m.id for m in page.items] == ["msg_4", "msg_3"]
+        page = await list_chat_history(session, "doc_1", "user_1", page.next_cursor, limit=2)
+        assert [m.id for m in page.items] == ["msg_2", "msg_1"]
+
+
+async def test_annotation_listing_uses_composite_index(session_maker, document):
+    stmt = (
+        select(Annotation)
+        .where(Annotation.user_id == "u", Annotation.document_id == "d")
+        .order_by(Annotation.created_at, Annotation.id)
+    )
+    async with session_maker() as session:
+        compiled = stmt.compile(session.bind, compile_kwargs={"literal_binds": True})
+        plan = (await session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all()
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_annotations_user_document_created" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    values = [BASE_TIME, "ann_001"]
+    assert decode_cursor(encode_cursor(values), 2) == values
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor", 2)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor(["only-one"]), 2)
+
+
+async def test_annotations_endpoint(api_client, session_maker, document):
+    await _add_annotations(session_maker, document, 3)
+
+    response = await api_client.get("/api/v1/annotations", params={"document_id": "doc_1", "limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [a["id"] for a in data["items"]] == ["ann_000", "ann_001"]
+
+    response = await api_client.get(
+        "/api/v1/annotations", params={"document_id": "doc_1", "cursor": data["next_cursor"]}
+    )
+    assert [a["id"] for a in response.json()["items"]] == ["ann_002"]
+    assert response.json()["next_cursor"] is None
+
+    response = await api_client.get("/api/v1/annotations", params={"document_id": "doc_1", "cursor": "!!"})
+    assert response.status_code == 400
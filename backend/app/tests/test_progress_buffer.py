@@ -0,0 +1,184 @@
+"""Tests for the reading progress write-coalescing buffer"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.models import Document, ReadingSession, User, UserDocumentStats
+from app.services import reading_service
+from app.services.progress_buffer import PendingProgress, ProgressBuffer, progress_buffer
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def library(session_maker, user):
+    async with session_maker() as session:
+        session.add(User(id="user_2", email="other@example.com", username="other", hashed_password="x"))
+        for i in range(3):
+            session.add(Document(
+                id=f"doc_{i}", user_id="user_1", title=f"Book {i}", file_path=f"/tmp/{i}.txt",
+                file_hash=str(i) * 64, file_size=1, file_type="txt",
+            ))
+        session.add(ReadingSession(id="rs_1", user_id="user_1", document_id="doc_0", start_time=START))
+        await session.commit()
+
+
+@pytest.fixture
+def statements(db_engine):
+    executed = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE"):
+            executed.append((statement.split()[1], executemany))
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", listener)
+    yield executed
+    event.remove(db_engine.sync_engine, "before_cursor_execute", listener)
+
+
+async def test_updates_are_merged_per_reader_and_document(session_maker, library, statements):
+    buffer = ProgressBuffer(session_maker)
+    for page in range(1, 51):
+        await buffer.record("user_1", "doc_0", page, page / 50, "rs_1", scroll_events=2, pages=[page])
+    for i in range(3):
+        await buffer.record("user_1", f"doc_{i}", 7)
+    assert len(buffer) == 3
+
+    assert await buffer.flush() == 3
+    # One executemany per table for the whole batch
+    assert statements == [("documents", True), ("reading_sessions", False)]
+
+    async with session_maker() as session:
+        document = await session.get(Document, "doc_0")
+        reading = await session.get(ReadingSession, "rs_1")
+        coverage = await session.get(UserDocumentStats, ("user_1", "doc_0"))
+        other = await session.get(Document, "doc_2")
+    assert document.current_page == 7
+    assert document.scroll_position == 1.0
+    assert document.last_read_at is not None
+    assert reading.scroll_events == 100
+    assert coverage.pages_read == 50
+    assert other.current_page == 7
+
+
+async def test_stale_flush_does_not_move_position_back(session_maker, library):
+    buffer = ProgressBuffer(session_maker)
+    await buffer.record("user_1", "doc_0", 30)
+    await buffer.flush()
+
+    # An older update flushed late (e.g. by another worker process)
+    late = PendingProgress("user_1", "doc_0", 5, START - timedelta(days=1))
+    await buffer._write([late])
+
+    async with session_maker() as session:
+        assert (await session.get(Document, "doc_0")).current_page == 30
+
+
+async def test_foreign_documents_are_ignored(session_maker, library):
+    buffer = ProgressBuffer(session_maker)
+    await buffer.record("user_2", "doc_0", 99, session_id="rs_1", scroll_events=5)
+    await buffer.flush()
+
+    async with session_maker() as session:
+        assert (await session.get(Document, "doc_0")).current_page == 1
+        assert (await session.get(ReadingSession, "rs_1")).scroll_events == 0
+
+
+async def test_failed_flush_keeps_updates(session_maker, library):
+    def broken():
+        raise ConnectionError("database down")
+
+    buffer = ProgressBuffer(broken)
+    await buffer.record("user_1", "doc_0", 3, session_id="rs_1", scroll_events=1)
+    with pytest.raises(ConnectionError):
+        await buffer.flush()
+    await buffer.record("user_1", "doc_0", 4, session_id="rs_1", scroll_events=1)
+
+    buffer.session_maker = session_maker
+    await buffer.flush()
+    async with session_maker() as session:
+        assert (await session.get(Document, "doc_0")).current_page == 4
+        assert (await session.get(ReadingSession, "rs_1")).scroll_events == 2
+
+
+async def test_failed_flush_keeps_deltas_of_superseded_session(session_maker, library):
+    async with session_maker() as session:
+        session.add(ReadingSession(id="rs_2", user_id="user_1", document_id="doc_0", start_time=START))
+        await session.commit()
+
+    release = asyncio.Event()
+
+    class SlowBrokenSession:
+        async def __aenter__(self):
+            await release.wait()
+            raise ConnectionError("database down")
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    buffer = ProgressBuffer(SlowBrokenSession)
+    await buffer.record("user_1", "doc_0", 3, session_id="rs_1", scroll_events=2, pages=[3])
+    flushing = asyncio.create_task(buffer.flush())
+    await asyncio.sleep(0)
+    # The reader starts a new session while the failing flush holds the old one
+    await buffer.record("user_1", "doc_0", 5, session_id="rs_2", scroll_events=1, pages=[5])
+    release.set()
+    with pytest.raises(ConnectionError):
+        await flushing
+
+    buffer.session_maker = session_maker
+    await buffer.flush_key("user_1", "doc_0")
+    async with session_maker() as session:
+        assert (await session.get(Document, "doc_0")).current_page == 5
+        assert (await session.get(ReadingSession, "rs_1")).scroll_events == 2
+        assert (await session.get(ReadingSession, "rs_2")).scroll_events == 1
+        stats = await session.get(UserDocumentStats, ("user_1", "doc_0"))
+        assert stats.pages_read == 2
+
+
+async def test_ending_session_writes_final_position(api_client, session_maker, library, monkeypatch):
+    monkeypatch.setattr(progress_buffer, "session_maker", session_maker)
+
+    response = await api_client.post("/api/v1/reading/sessions", json={"document_id": "doc_1"})
+    session_id = response.json()["id"]
+    for page in (2, 3, 4):
+        response = await api_client.post("/api/v1/reading/progress", json={
+            "document_id": "doc_1", "current_page": page, "session_id": session_id, "pages": [page],
+        })
+        assert response.status_code == 202
+
+    response = await api_client.post(f"/api/v1/reading/sessions/{session_id}/end")
+    assert response.status_code == 200
+    assert response.json()["scroll_events"] == 3
+    assert response.json()["end_time"] is not None
+    assert len(progress_buffer) == 0
+
+    async with session_maker() as session:
+        assert (await session.get(Document, "doc_1")).current_page == 4
+
+
+async def test_ending_session_waits_for_in_flight_flush(session_maker, library):
+    buffer = ProgressBuffer(session_maker)
+    release = asyncio.Event()
+    write = buffer._write
+
+    async def slow_write(batch):
+        await release.wait()
+        await write(batch)
+
+    buffer._write = slow_write
+    await buffer.record("user_1", "doc_0", 7, session_id="rs_1", scroll_events=2)
+    flushing = asyncio.create_task(buffer.flush())
+    await asyncio.sleep(0)
+
+    async with session_maker() as db:
+        ending = asyncio.create_task(reading_service.end_session(db, "user_1", "rs_1", buffer))
+        await asyncio.sleep(0.01)
+        # The periodic flush already took the pair: ending must wait for its commit
+        assert not ending.done()
+        release.set()
+        session = await ending
+    assert await flushing == 1
+    assert session.scroll_events == 2
@@ -0,0 +1,96 @@
+"""Tests for the semantic Q&A cache"""
+import pytest
+
+from app.core.ai.qa_cache import SemanticAnswerCache, normalize_question
+
+VECTORS = {
+    "what is the main argument of chapter 3": [1.0, 0.0, 0.0],
+    "what does chapter 3 mainly argue": [0.98, 0.2, 0.0],
+    "who is the author": [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def embed_calls():
+    return []
+
+
+@pytest.fixture
+def qa_cache(cache, embed_calls):
+    async def embed(text):
+        embed_calls.append(text)
+        return VECTORS[text]
+
+    return SemanticAnswerCache(cache, embed, threshold=0.9)
+
+
+def test_normalize_question():
+    assert normalize_question("  What is  the main argument of Chapter 3？ ") == (
+        "what is the main argument of chapter 3"
+    )
+
+
+async def test_similar_question_hits(qa_cache):
+    await qa_cache.store("hash1", 1, "What is the main argument of chapter 3?", "Answer", [{"page": 5}])
+
+    cached = await qa_cache.lookup("hash1", 1, "What does chapter 3 mainly argue?")
+    assert cached is not None
+    assert cached.answer == "Answer"
+    assert cached.sources == [{"page": 5}]
+    assert cached.similarity > 0.9
+
+    assert await qa_cache.lookup("hash1", 1, "Who is the author?") is None
+    assert qa_cache.stats.hits == 1
+    assert qa_cache.stats.misses == 1
+    assert qa_cache.stats.hit_rate == 0.5
+
+
+async def test_exact_match_skips_embedding(qa_cache, embed_calls):
+    await qa_cache.store("hash1", 1, "Who is the author?", "Someone")
+    embed_calls.clear()
+
+    cached = await qa_cache.lookup("hash1", 1, "who is the AUTHOR")
+    assert cached.answer == "Someone"
+    assert embed_calls == []
+
+
+async def test_new_parse_version_invalidates(qa_cache):
+    await qa_cache.store("hash1", 1, "Who is the author?", "Old")
+    await qa_cache.store("hash1", 2, "What is the main argument of chapter 3?", "New")
+
+    assert await qa_cache.lookup("hash1", 1, "Who is the author?") is None
+    assert await qa_cache.lookup("hash1", 2, "Who is the author?") is None
+
+
+async def test_get_or_compute_calls_llm_once(qa_cache, embed_calls):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return "Answer", []
+
+    _, hit = await qa_cache.get_or_compute("hash1", 1, "Who is the author?", compute)
+    assert hit is False
+    answer, hit = await qa_cache.get_or_compute("hash1", 1, "Who is the author?", compute)
+    assert hit is True
+    assert answer.answer == "Answer"
+    assert calls == [1]
+    assert embed_calls == ["who is the author"]
+
+
+async def test_least_recently_used_entries_are_evicted(cache, embed_calls):
+    async def embed(text):
+        return VECTORS[text]
+
+    qa_cache = SemanticAnswerCache(cache, embed, threshold=0.9, max_entries=2)
+    await qa_cache.store("hash1", 1, "Who is the author?", "Someone")
+    await qa_cache.store("hash1", 1, "What is the main argument of chapter 3?", "Argument")
+    # Serving the first entry makes the second the least recently used
+    assert await qa_cache.lookup("hash1", 1, "who is the author") is not None
+    await qa_cache.store("hash1", 1, "What does chapter 3 mainly argue?", "Argument 2")
+
+    assert await cache.redis.hlen("qa:hash1:v1") == 2
+    assert await cache.redis.zcard("qa:hash1:v1:lru") == 2
+    assert (await qa_cache.lookup("hash1", 1, "Who is the author?")).answer == "Someone"
+    cached = await qa_cache.lookup("hash1", 1, "What is the main argument of chapter 3?")
+    assert cached.answer == "Argument 2"  # the evicted exact entry is gone
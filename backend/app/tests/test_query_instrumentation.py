@@ -0,0 +1,51 @@
+"""Tests for SQL statement timing, slow query log and Server-Timing"""
+import logging
+
+from sqlalchemy import text
+
+from app.db.session import (
+    QueryStats,
+    current_query_stats,
+    db_query_duration,
+    instrument_engine,
+    normalize_sql,
+)
+
+
+def test_normalize_sql():
+    assert normalize_sql(
+        "SELECT * FROM documents\n  WHERE user_id = 'u1' AND page > 10 AND id IN (?, ?, ?)"
+    ) == "SELECT * FROM documents WHERE user_id = ? AND page > ? AND id IN (?...)"
+    assert normalize_sql(
+        "INSERT INTO annotations (id, type) VALUES ($1, $2), ($3, $4), ($5, $6)"
+    ) == "INSERT INTO annotations (id, type) VALUES (?...)"
+    assert normalize_sql("UPDATE t SET a=%(a)s WHERE id = :id_1") == "UPDATE t SET a=? WHERE id = ?"
+
+
+async def test_statements_are_timed_and_slow_ones_logged(db_engine, caplog):
+    instrument_engine(db_engine, "test", slow_query_ms=0, slow_query_sample_rate=1.0)
+    before = db_query_duration.labels(pool="test", operation="SELECT").count
+
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+            async with db_engine.connect() as conn:
+                await conn.execute(text("SELECT 1 WHERE 'a' = 'a'"))
+                await conn.execute(text("SELECT 2"))
+    finally:
+        current_query_stats.reset(token)
+
+    assert stats.count == 2
+    assert stats.seconds > 0
+    assert db_query_duration.labels(pool="test", operation="SELECT").count == before + 2
+    assert "SELECT ? WHERE ? = ?" in caplog.text
+
+
+async def test_server_timing_header(api_client, db_engine):
+    instrument_engine(db_engine, "test")
+    response = await api_client.get("/api/v1/documents")
+    assert response.status_code == 200
+    # get_current_user + the listing query
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="2 queries"')
@@ -0,0 +1,77 @@
+"""Tests for the /ready dependency checks"""
+import asyncio
+import time
+
+from app.core.health import (
+    ReadinessProbe,
+    cache_check,
+    database_check,
+    dependency_up,
+    storage_check,
+)
+
+
+async def test_checks_run_concurrently_with_timeouts():
+    async def slow():
+        await asyncio.sleep(0.2)
+
+    async def hung():
+        await asyncio.sleep(10)
+
+    async def broken():
+        raise ConnectionError("refused")
+
+    probe = ReadinessProbe({"a": slow, "b": slow, "c": hung, "d": broken}, timeout=0.3)
+    started = time.perf_counter()
+    readiness = await probe.check()
+
+    assert time.perf_counter() - started < 0.6
+    assert not readiness.ready
+    result = readiness.to_dict()
+    assert result["status"] == "unavailable"
+    assert result["checks"]["a"]["ok"] and result["checks"]["a"]["latency_ms"] >= 200
+    assert not result["checks"]["c"]["ok"]
+    assert result["checks"]["c"]["error"] == "timed out after 0.3s"
+    assert result["checks"]["d"]["error"] == "ConnectionError: refused"
+    assert dependency_up.labels(dependency="d").value == 0
+
+
+async def test_results_are_cached_and_shared():
+    calls = 0
+
+    async def counted():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+
+    probe = ReadinessProbe({"x": counted}, cache_ttl=60)
+    results = await asyncio.gather(*(probe.check() for _ in range(20)))
+    await probe.check()
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+
+    probe.cache_ttl = 0
+    await probe.check()
+    assert calls == 2
+
+
+async def test_ready_endpoint(api_client, db_engine, cache, tmp_path, monkeypatch):
+    import app.main
+
+    probe = ReadinessProbe({
+        "database": database_check(db_engine),
+        "cache": cache_check(cache),
+        "storage": storage_check(str(tmp_path)),
+    }, cache_ttl=0)
+    monkeypatch.setattr(app.main, "readiness_probe", probe)
+
+    response = await api_client.get("/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert set(body["checks"]) == {"database", "cache", "storage"}
+
+    probe.checks["storage"] = storage_check(str(tmp_path / "missing"))
+    response = await api_client.get("/ready")
+    assert response.status_code == 503
+    assert not response.json()["checks"]["storage"]["ok"]
@@ -0,0 +1,110 @@
+"""Tests for boot orchestration, pool warm-up and lazy loading"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.health import ReadinessProbe, job_runner_check
+from app.core.startup import BootSequence, boot_phase_seconds, warm_database
+
+
+async def test_phases_run_concurrently_and_are_timed():
+    async def slow():
+        await asyncio.sleep(0.1)
+
+    boot = BootSequence()
+    started = time.perf_counter()
+    await boot.run_concurrently({"a": slow, "b": slow, "c": slow})
+
+    assert time.perf_counter() - started < 0.25
+    assert set(boot.timings) == {"a", "b", "c"}
+    assert all(seconds >= 0.1 for seconds in boot.timings.values())
+    assert boot_phase_seconds.labels(phase="a").value >= 0.1
+    assert "ready in" in boot.summary()
+
+
+async def test_optional_phases_fail_soft_and_required_ones_raise():
+    async def broken():
+        raise ConnectionError("refused")
+
+    async def hung():
+        await asyncio.sleep(10)
+
+    boot = BootSequence(timeout=0.05)
+    await boot.run_concurrently({"cache": broken, "database": hung})
+    assert boot.failures["cache"] == "ConnectionError: refused"
+    assert "database" in boot.failures
+    assert "(failed)" in boot.summary()
+
+    with pytest.raises(ConnectionError):
+        await boot.run("job_runner", broken)
+
+
+async def test_background_phase_is_cancelled_at_shutdown():
+    started = asyncio.Event()
+
+    async def preload():
+        started.set()
+        await asyncio.sleep(10)
+
+    boot = BootSequence(timeout=60)
+    boot.run_in_background("preload", preload)
+    await started.wait()
+    await boot.cancel_background()
+    assert "preload" in boot.timings
+
+
+async def test_retried_phase_reports_not_ready_until_it_succeeds():
+    attempts = []
+    started = asyncio.Event()
+
+    async def start_runner():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("database down")
+        started.set()
+
+    probe = ReadinessProbe({"job_runner": job_runner_check(started.is_set)}, cache_ttl=0)
+    boot = BootSequence(timeout=1)
+    boot.run_in_background("job_runner", start_runner, retry_interval=0.02)
+    # Boot goes on while the database is down; the worker just isn't ready
+    assert not (await probe.check()).ready
+
+    await asyncio.wait_for(started.wait(), 1)
+    assert len(attempts) == 3
+    assert "job_runner" not in boot.failures
+    assert (await probe.check()).ready
+    await boot.cancel_background()
+
+
+async def test_warm_database_opens_pool_connections(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}", pool_size=5)
+    try:
+        await warm_database(engine, connections=3)
+        assert engine.pool.checkedin() == 3
+        await warm_database(engine, connections=50)
+        assert engine.pool.checkedin() == 5
+    finally:
+        await engine.dispose()
+
+
+def test_import_has_no_side_effects(tmp_path):
+    upload_dir = tmp_path / "uploads"
+    code = (
+        "import sys, app.main; "
+        "print('app.core.document_parser.markdown_parser' in sys.modules, "
+        "'app.tasks.pipeline' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "UPLOAD_DIR": str(upload_dir)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False False"
+    assert not upload_dir.exists()
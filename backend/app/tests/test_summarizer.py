@@ -0,0 +1,97 @@
+"""Tests for the hierarchical map-reduce summarizer"""
+import pytest
+
+from app.core.ai.scheduler import LLMScheduler
+from app.core.ai.summarizer import HierarchicalSummarizer, Section
+
+
+def make_book(section_text="Text of 1.1"):
+    return Section.from_dict({
+        "title": "Book",
+        "children": [
+            {"title": "Chapter 1", "children": [
+                {"title": "1.1", "text": section_text},
+                {"title": "1.2", "text": "Text of 1.2"},
+            ]},
+            {"title": "Chapter 2", "children": [
+                {"title": "2.1", "text": "Text of 2.1"},
+            ]},
+        ],
+    })
+
+
+@pytest.fixture
+def prompts():
+    return []
+
+
+@pytest.fixture
+def summarizer(cache, prompts):
+    async def complete(prompt):
+        prompts.append(prompt)
+        return f"summary #{len(prompts)}"
+
+    return HierarchicalSummarizer(complete, cache, scheduler=LLMScheduler(), reduce_fan_in=2)
+
+
+async def test_full_summary_reuses_chapter_summary(summarizer, prompts):
+    chapter = await summarizer.summarize_document(make_book(), "chapter", "Chapter 1")
+    assert chapter.llm_calls == 3  # two sections + one reduce
+    prompts.clear()
+
+    full = await summarizer.summarize_document(make_book(), "full")
+    # Chapter 1 is cached; Chapter 2 needs its section, then the book reduce
+    assert full.cache_hits == 1
+    assert full.llm_calls == 2
+    assert len(prompts) == 2
+
+
+async def test_edit_only_recomputes_affected_branch(summarizer, prompts):
+    await summarizer.summarize(make_book())
+    prompts.clear()
+
+    result = await summarizer.summarize(make_book("Edited text of 1.1"))
+    # 1.1 leaf, Chapter 1 reduce, Book reduce; 1.2 and Chapter 2 are cached
+    assert result.llm_calls == 3
+    assert result.cache_hits == 2
+    assert "Edited text of 1.1" in prompts[0]
+
+
+async def test_long_sections_are_split_and_reduced(summarizer, prompts):
+    summarizer.max_chunk_chars = 10
+    result = await summarizer.summarize(Section("Long", "abcdefghijklmnopqrstuvwxyz0123456789"[:35]))
+    # Four map prompts reduced pairwise: 4 -> 2 -> 1
+    assert result.llm_calls == 4 + 2 + 1
+
+
+async def test_missing_target_section(summarizer):
+    with pytest.raises(ValueError):
+        await summarizer.summarize_document(make_book(), "chapter", "Chapter 9")
+
+
+async def test_edit_in_long_section_recomputes_only_its_chunk(summarizer, prompts):
+    summarizer.max_chunk_chars = 1000
+    paragraphs = [f"Paragraph {i} says something about topic {i}." * 2 for i in range(80)]
+    await summarizer.summarize(Section("Long", "\n\n".join(paragraphs)))
+    map_prompts = sum(p.startswith("Summarize") for p in prompts)
+    prompts.clear()
+
+    # Lengthening one paragraph must not shift the chunks after it
+    paragraphs[3] += " An inserted sentence that changes the length."
+    await summarizer.summarize(Section("Long", "\n\n".join(paragraphs)))
+    remapped = [p for p in prompts if p.startswith("Summarize")]
+    assert map_prompts > 5
+    # The edited chunk, and at most its neighbour if the edit moved a cut
+    assert 1 <= len(remapped) <= 2
+    assert "An inserted sentence" in remapped[0]
+
+
+async def test_empty_sections_skip_the_llm(summarizer, prompts):
+    book = Section.from_dict({"title": "Book", "children": [
+        {"title": "Part 1", "children": [{"title": "1.1", "text": "Only text"}]},
+        {"title": "Part 2", "text": "  "},
+    ]})
+    result = await summarizer.summarize(book)
+    assert result.llm_calls == 1
+    assert result.text == "summary #1"
+    assert len(prompts) == 1
@@ -0,0 +1,53 @@
+"""Tests for text encoding detection and streaming normalization"""
+from typing import Optional
+
+import pytest
+
+from app.utils.text_encoding import TextEncodingError, TextNormalizer, detect_encoding
+
+TEXT = "第一章 开始\r\n阅读笔记：GBK 与 UTF-8。\rEnd\r\n"
+EXPECTED = TEXT.replace("\r\n", "\n").replace("\r", "\n").encode("utf-8")
+
+
+def _normalize(data: bytes, chunk_size: int, **kwargs) -> tuple[bytes, Optional[str]]:
+    normalizer = TextNormalizer(**kwargs)
+    output = b"".join(normalizer.feed(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size))
+    return output + normalizer.finish(), normalizer.encoding
+
+
+@pytest.mark.parametrize("encoding, detected", [
+    ("utf-8", "utf-8"),
+    ("utf-8-sig", "utf-8"),
+    ("gbk", "gb18030"),
+    ("gb18030", "gb18030"),
+    ("utf-16", "utf-16"),
+])
+def test_normalizes_to_utf8_with_lf(encoding, detected):
+    data = ("ASCII preface\r\n" * 3 + TEXT * 20).encode(encoding)
+    for chunk_size in (1, 2, 7, 4096):
+        output, found = _normalize(data, chunk_size, sample_size=16)
+        assert output == b"ASCII preface\n" * 3 + EXPECTED * 20
+        assert found == detected
+
+
+def test_ascii_and_empty_files():
+    assert _normalize(b"plain\r\ntext\r", 3) == (b"plain\ntext\n", "ascii")
+    assert _normalize(b"", 3) == (b"", "ascii")
+
+
+def test_rejects_binary_and_late_corruption():
+    with pytest.raises(TextEncodingError, match="binary"):
+        _normalize(b"abc\x00def", 4)
+    # Valid UTF-8 for the whole sample, broken far beyond it
+    data = TEXT.encode("utf-8") * 100 + b"\xff\xfe" + TEXT.encode("utf-8")
+    with pytest.raises(TextEncodingError, match=f"at byte {len(TEXT.encode('utf-8')) * 100}"):
+        _normalize(data, 1000, sample_size=64)
+
+
+def test_detect_encoding_on_samples():
+    assert detect_encoding(b"just ascii") is None
+    # A sample may end in the middle of a character
+    assert detect_encoding(TEXT.encode("utf-8")[:-2] + "中".encode("utf-8")[:2]) == "utf-8"
+    assert detect_encoding(TEXT.encode("gbk")) == "gb18030"
+    with pytest.raises(TextEncodingError):
+        detect_encoding(b"\x00\x01\x02binary")
@@ -1,18 +1,29 @@
 """File Storage Utility"""
+import asyncio
 import hashlib
+import os
+import tempfile
 from pathlib import Path
-from typing import BinaryIO
+from typing import IO, Optional
 
 from fastapi import UploadFile
 
 from app.core.config import settings
+from app.utils.text_encoding import TextNormalizer
+
+# Bytes read from an upload and written to disk at a time
+CHUNK_SIZE = 1024 * 1024
 
 
 class FileStorage:
     """File storage manager for handling document uploads"""
 
     def __init__(self, base_path: str = settings.UPLOAD_DIR):
+        # No filesystem access here: the global instance is created at import
         self.base_path = Path(base_path)
+
+    def ensure_base_path(self) -> None:
+        """Create the storage directory if missing (called once at startup)"""
         self.base_path.mkdir(parents=True, exist_ok=True)
 
     def _compute_hash(self, content: bytes) -> str:
@@ -40,16 +51,32 @@ class FileStorage:
         """
         # Use first 2 characters of hash for directory sharding
         shard_dir = self.base_path / file_hash[:2]
-        shard_dir.mkdir(exist_ok=True)
+        shard_dir.mkdir(parents=True, exist_ok=True)
 
         return shard_dir / f"{file_hash}{extension}"
 
-    async def save_file(self, file: UploadFile) -> dict:
+    def _store(self, temp_path: str, file_hash: str, extension: str) -> Path:
+        """Move a written upload to its hash path, or drop it if already stored"""
+        file_path = self._get_file_path(file_hash, extension)
+        if file_path.exists():
+            os.unlink(temp_path)
+        else:
+            os.replace(temp_path, file_path)
+        return file_path
+
+    async def save_file(self, file: UploadFile, normalizer: Optional[TextNormalizer] = None) -> dict:
         """
         Save uploaded file to local storage.
 
+        The upload is streamed CHUNK_SIZE bytes at a time: hashed as it is
+        written to a temporary file (disk writes run in a thread), which is
+        then renamed to its hash path, so memory use does not grow with the
+        file size.
+
         Args:
             file: FastAPI UploadFile object
+            normalizer: Transcodes text uploads to canonical UTF-8 on the way;
+                the hash and size are those of the stored (normalized) bytes
 
         Returns:
             Dictionary with file information:
@@ -57,34 +84,48 @@ class FileStorage:
                 "file_hash": str,
                 "file_path": str,
                 "file_size": int,
-                "file_name": str
+                "file_name": str,
+                "encoding": Optional[str]  # source encoding of text uploads
             }
-        """
-        # Read file content
-        content = await file.read()
-        file_size = len(content)
 
-        # Compute hash
-        file_hash = self._compute_hash(content)
-
-        # Get file extension
+        Raises:
+            TextEncodingError: If the normalizer rejects the content
+        """
         file_name = file.filename or "document"
         extension = Path(file_name).suffix or ".bin"
-
-        # Get storage path
-        file_path = self._get_file_path(file_hash, extension)
-
-        # Check if file already exists (deduplication)
-        if not file_path.exists():
-            # Write file to disk
-            with open(file_path, "wb") as f:
-                f.write(content)
+        digest = hashlib.sha256()
+        file_size = 0
+
+        await asyncio.to_thread(self.ensure_base_path)
+        # In the storage directory, so the final rename stays on one filesystem
+        handle: IO[bytes] = await asyncio.to_thread(
+            tempfile.NamedTemporaryFile, dir=self.base_path, prefix=".upload-", delete=False
+        )
+        try:
+            with handle:
+                while True:
+                    chunk = await file.read(CHUNK_SIZE)
+                    last = not chunk
+                    if normalizer is not None:
+                        chunk = normalizer.finish() if last else normalizer.feed(chunk)
+                    if chunk:
+                        digest.update(chunk)
+                        file_size += len(chunk)
+                        await asyncio.to_thread(handle.write, chunk)
+                    if last:
+                        break
+            file_hash = digest.hexdigest()
+            file_path = await asyncio.to_thread(self._store, handle.name, file_hash, extension)
+        except BaseException:
+            await asyncio.to_thread(Path(handle.name).unlink, missing_ok=True)
+            raise
 
         return {
             "file_hash": file_hash,
             "file_path": str(file_path),
             "file_size": file_size,
             "file_name": file_name,
+            "encoding": normalizer.encoding if normalizer is not None else None,
         }
 
     def get_file_path(self, file_hash: str, extension: str = "") -> Path:
@@ -163,6 +204,8 @@ class FileStorage:
         """
         total_files = 0
         total_size = 0
+        if not self.base_path.exists():
+            return {"total_files": 0, "total_size": 0, "shard_count": 0}
 
         for shard_dir in self.base_path.iterdir():
             if shard_dir.is_dir():
@@ -1,10 +1,13 @@
 """File Validation Utility"""
+import asyncio
+import struct
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from fastapi import HTTPException, UploadFile
 
 from app.core.config import settings
+from app.utils.text_encoding import TextEncodingError, detect_encoding
 
 # MIME type mapping for allowed file types
 MIME_TYPE_MAPPING = {
@@ -18,6 +21,166 @@ MIME_TYPE_MAPPING = {
 # Reverse mapping: extension -> MIME type
 EXTENSION_MIME_MAPPING = {v: k for k, v in MIME_TYPE_MAPPING.items()}
 
+# Text uploads, transcoded to UTF-8 while stored (see TextNormalizer)
+TEXT_EXTENSIONS = (".txt", ".md")
+
+EPUB_MIME_TYPE = "application/epub+zip"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# ZIP records (APPNOTE.TXT 4.3): end of central directory, its ZIP64 variant
+# and locator, and central directory file headers
+_EOCD = struct.Struct("<4s4H2LH")
+_EOCD_SIGNATURE = b"PK\x05\x06"
+_EOCD_MAX_COMMENT = 0xFFFF
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+_ZIP64_EOCD = struct.Struct("<4sQ2H2L4Q")
+_ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_CENTRAL_HEADER_SIGNATURE = b"PK\x01\x02"
+_ZIP64_EXTRA_ID = 0x0001
+_UTF8_FLAG = 0x800
+
+# Below this declared size, ratios are not checked: small, highly repetitive
+# XML parts compress far better than any bomb threshold worth having
+_RATIO_CHECK_MIN_SIZE = 10 * 1024 * 1024
+
+
+def _zip_error(detail: str) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"Invalid document archive: {detail}")
+
+
+def _read_at(file: BinaryIO, offset: int, size: int) -> bytes:
+    file.seek(offset)
+    data = file.read(size)
+    if len(data) != size:
+        raise _zip_error("truncated archive")
+    return data
+
+
+def _zip64_uncompressed_size(extra: bytes) -> int:
+    """Uncompressed size of an entry from its ZIP64 extra field (its first value)"""
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<2H", extra, position)
+        if header_id == _ZIP64_EXTRA_ID and length >= 8:
+            return int(struct.unpack_from("<Q", extra, position + 4)[0])
+        position += 4 + length
+    raise _zip_error("ZIP64 entry without sizes")
+
+
+def _central_directory(file: BinaryIO, archive_size: int) -> tuple[int, int, int]:
+    """
+    Locate the central directory from the end of central directory record.
+
+    Returns:
+        (entry count, directory size, directory offset)
+    """
+    tail_size = min(archive_size, _EOCD.size + _EOCD_MAX_COMMENT)
+    tail = _read_at(file, archive_size - tail_size, tail_size)
+    position = tail.rfind(_EOCD_SIGNATURE)
+    if position < 0 or position + _EOCD.size > len(tail):
+        raise _zip_error("end of central directory not found")
+    eocd_offset = archive_size - tail_size + position
+    _, disk, directory_disk, _, entries, directory_size, directory_offset, _ = _EOCD.unpack_from(tail, position)
+    if disk != 0 or directory_disk != 0:
+        raise _zip_error("multi-volume archives are not supported")
+
+    if entries == 0xFFFF or directory_size == 0xFFFFFFFF or directory_offset == 0xFFFFFFFF:
+        locator_offset = eocd_offset - _ZIP64_LOCATOR.size
+        if locator_offset < 0:
+            raise _zip_error("ZIP64 locator not found")
+        signature, _, zip64_offset, _ = _ZIP64_LOCATOR.unpack(
+            _read_at(file, locator_offset, _ZIP64_LOCATOR.size)
+        )
+        if signature != _ZIP64_LOCATOR_SIGNATURE or zip64_offset + _ZIP64_EOCD.size > locator_offset:
+            raise _zip_error("ZIP64 locator not found")
+        record = _ZIP64_EOCD.unpack(_read_at(file, zip64_offset, _ZIP64_EOCD.size))
+        if record[0] != _ZIP64_EOCD_SIGNATURE:
+            raise _zip_error("ZIP64 end of central directory not found")
+        entries, directory_size, directory_offset = record[7], record[8], record[9]
+        eocd_offset = zip64_offset
+
+    if directory_offset + directory_size > eocd_offset:
+        raise _zip_error("central directory out of bounds")
+    return entries, directory_size, directory_offset
+
+
+def sniff_zip_container(file: BinaryIO) -> str:
+    """
+    Identify an EPUB or DOCX from its ZIP central directory alone.
+
+    Reads the end of central directory record and the central directory
+    (a few KB for a typical book), never the entries themselves, so the cost
+    does not grow with the file size and nothing is decompressed. Archives
+    whose declared sizes add up to a zip bomb, and archives with several
+    entries sharing one local header (overlapping-entry bombs), are rejected.
+    Declared sizes are enforced again by zipfile when parsers extract.
+
+    Args:
+        file: Seekable binary file positioned anywhere (left at offset 0)
+
+    Returns:
+        EPUB_MIME_TYPE (has a "mimetype" entry) or DOCX_MIME_TYPE (has
+        "[Content_Types].xml" and a "word/" part)
+
+    Raises:
+        HTTPException: If the archive is corrupt, too large once extracted,
+            or neither an EPUB nor a DOCX
+    """
+    try:
+        archive_size = file.seek(0, 2)
+        entries, directory_size, directory_offset = _central_directory(file, archive_size)
+        if entries > settings.ZIP_MAX_ENTRIES:
+            raise _zip_error(f"more than {settings.ZIP_MAX_ENTRIES} entries")
+        directory = _read_at(file, directory_offset, directory_size)
+    finally:
+        file.seek(0)
+
+    names: set[str] = set()
+    local_offsets: set[int] = set()
+    total_uncompressed = 0
+    position = 0
+    for _ in range(entries):
+        if position + _CENTRAL_HEADER.size > len(directory):
+            raise _zip_error("truncated central directory")
+        (
+            signature, _, _, flags, _, _, _, _, _, uncompressed,
+            name_length, extra_length, comment_length, _, _, _, local_offset,
+        ) = _CENTRAL_HEADER.unpack_from(directory, position)
+        if signature != _CENTRAL_HEADER_SIGNATURE:
+            raise _zip_error("corrupt central directory")
+        position += _CENTRAL_HEADER.size
+        raw_name = directory[position:position + name_length]
+        extra = directory[position + name_length:position + name_length + extra_length]
+        position += name_length + extra_length + comment_length
+
+        if uncompressed == 0xFFFFFFFF:
+            uncompressed = _zip64_uncompressed_size(extra)
+        if local_offset != 0xFFFFFFFF:
+            if local_offset in local_offsets:
+                raise _zip_error("overlapping entries")
+            local_offsets.add(local_offset)
+        total_uncompressed += uncompressed
+        if total_uncompressed > settings.ZIP_MAX_UNCOMPRESSED_SIZE:
+            raise _zip_error("uncompressed size exceeds the limit")
+        names.add(raw_name.decode("utf-8" if flags & _UTF8_FLAG else "cp437", errors="replace"))
+
+    if (
+        total_uncompressed > _RATIO_CHECK_MIN_SIZE
+        and total_uncompressed > archive_size * settings.ZIP_MAX_COMPRESSION_RATIO
+    ):
+        raise _zip_error("compression ratio exceeds the limit")
+
+    if "mimetype" in names:
+        return EPUB_MIME_TYPE
+    if "[Content_Types].xml" in names and any(name.startswith("word/") for name in names):
+        return DOCX_MIME_TYPE
+    raise HTTPException(
+        status_code=400,
+        detail="Archive is neither an EPUB nor a DOCX document"
+    )
+
 
 def validate_file_size(file: UploadFile, max_size: int = settings.MAX_UPLOAD_SIZE) -> None:
     """
@@ -77,13 +240,17 @@ def validate_file_extension(filename: str) -> str:
     return extension
 
 
-def validate_mime_type(content: bytes, extension: str) -> str:
+def validate_mime_type(content: bytes, extension: str, file: Optional[BinaryIO] = None) -> str:
     """
     Validate file MIME type using magic bytes.
 
+    ZIP-based formats (EPUB, DOCX) share their magic bytes and are told
+    apart by sniff_zip_container, which needs the whole (seekable) file.
+
     Args:
         content: First bytes of the file (at least 2048 bytes recommended)
         extension: Expected file extension
+        file: The file itself, required for ZIP containers
 
     Returns:
         Detected MIME type
@@ -99,32 +266,29 @@ def validate_mime_type(content: bytes, extension: str) -> str:
         detected_type = "application/pdf"
         expected_ext = ".pdf"
 
-    # EPUB: PK (ZIP archive)
-    elif magic_bytes[:2] == b"PK":
-        # EPUB is a ZIP file, need deeper inspection
-        detected_type = "application/epub+zip"
-        expected_ext = ".epub"
-
-    # DOCX: PK (ZIP archive)
-    elif magic_bytes[:2] == b"PK" and extension == ".docx":
-        detected_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        expected_ext = ".docx"
+    # EPUB / DOCX: PK (ZIP archive, starting with a local file header)
+    elif magic_bytes[:4] == b"PK\x03\x04":
+        if file is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Unable to inspect document archive"
+            )
+        detected_type = sniff_zip_container(file)
+        expected_ext = MIME_TYPE_MAPPING[detected_type]
 
     # Plain text files (TXT, MD) - no specific magic bytes
-    elif extension in [".txt", ".md"]:
-        # Check if content is valid UTF-8 text
+    elif extension in TEXT_EXTENSIONS:
+        # Check the sample is text in a supported encoding; the rest is
+        # checked while it is transcoded on upload
         try:
-            content[:1024].decode("utf-8")
-            if extension == ".txt":
-                detected_type = "text/plain"
-            else:
-                detected_type = "text/markdown"
-            expected_ext = extension
-        except UnicodeDecodeError:
+            detect_encoding(content)
+        except TextEncodingError as error:
             raise HTTPException(
                 status_code=400,
-                detail=f"File content is not valid text for {extension} file"
+                detail=f"{error} ({extension} file)"
             )
+        detected_type = EXTENSION_MIME_MAPPING[extension]
+        expected_ext = extension
 
     else:
         raise HTTPException(
@@ -175,11 +339,13 @@ async def validate_file(file: UploadFile) -> dict:
     content = await file.read(8192)  # Read first 8KB
     await file.seek(0)  # Reset file pointer
 
-    # Validate MIME type using magic bytes
-    mime_type = validate_mime_type(content, extension)
+    # Validate MIME type using magic bytes (and the central directory of ZIPs).
+    # Sniffing a ZIP seeks and reads the spooled upload, which may be on disk;
+    # keep that blocking I/O off the event loop
+    mime_type = await asyncio.to_thread(validate_mime_type, content, extension, file.file)
 
     # Get actual file size
-    await file.seek(0, 2)  # Seek to end
+    file.file.seek(0, 2)  # Seek to end (UploadFile.seek() has no whence argument)
     file_size = file.file.tell()
     await file.seek(0)  # Reset to beginning
 
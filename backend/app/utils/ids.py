@@ -0,0 +1,15 @@
+"""ID Generation Utility"""
+import uuid
+
+
+def generate_id(prefix: str) -> str:
+    """
+    Generate a prefixed primary key (e.g. "doc_3f2a...").
+
+    Args:
+        prefix: Short entity prefix (doc, ann, msg, sum, rs, ...)
+
+    Returns:
+        ID string that fits the String(50) primary key columns
+    """
+    return f"{prefix}_{uuid.uuid4().hex}"
@@ -0,0 +1,98 @@
+"""Page Coverage Bitmaps"""
+from typing import Iterable
+
+# Highest page number tracked (16 KiB bitmap)
+MAX_TRACKED_PAGE = 1 << 17
+
+
+def pages_to_bitmap(pages: Iterable[int]) -> bytes:
+    """
+    Encode a set of 1-based page numbers as a bitmap.
+
+    Page p is bit (p - 1) % 8 of byte (p - 1) // 8; trailing zero bytes are
+    dropped, so a bitmap is at most ceil(highest page / 8) bytes.
+
+    Args:
+        pages: Page numbers (out of range values are ignored)
+
+    Returns:
+        Bitmap bytes
+    """
+    value = 0
+    for page in pages:
+        if 1 <= page <= MAX_TRACKED_PAGE:
+            value |= 1 << (page - 1)
+    return _to_bytes(value)
+
+
+def _to_int(bitmap: bytes) -> int:
+    return int.from_bytes(bitmap or b"", "little")
+
+
+def _to_bytes(value: int) -> bytes:
+    return value.to_bytes((value.bit_length() + 7) // 8, "little")
+
+
+def bitmap_or(*bitmaps: bytes) -> bytes:
+    """Union of page bitmaps"""
+    value = 0
+    for bitmap in bitmaps:
+        value |= _to_int(bitmap)
+    return _to_bytes(value)
+
+
+def bitmap_count(bitmap: bytes) -> int:
+    """Number of pages set in a bitmap"""
+    return _to_int(bitmap).bit_count()
+
+
+def bitmap_pages(bitmap: bytes) -> list[int]:
+    """Page numbers set in a bitmap, ascending"""
+    value = _to_int(bitmap)
+    pages = []
+    while value:
+        low = value & -value
+        pages.append(low.bit_length())
+        value ^= low
+    return pages
+
+
+def unread_ranges(bitmap: bytes, page_count: int) -> list[tuple[int, int]]:
+    """
+    Pages of a document not set in a bitmap, as inclusive ranges.
+
+    Args:
+        bitmap: Pages read
+        page_count: Number of pages in the document
+
+    Returns:
+        [(first, last), ...] ranges of unread pages
+    """
+    size = (page_count + 7) // 8
+    data = (bitmap or b"")[:size].ljust(size, b"\0")
+    ranges: list[tuple[int, int]] = []
+    start = None
+    for index, byte in enumerate(data):
+        base = index * 8
+        # Whole bytes of read / unread pages are handled without looking at bits
+        if byte == 0xFF:
+            if start is not None:
+                ranges.append((start, base))
+                start = None
+            continue
+        if byte == 0:
+            if start is None:
+                start = base + 1
+            continue
+        for bit in range(8):
+            page = base + bit + 1
+            if (byte >> bit) & 1:
+                if start is not None:
+                    ranges.append((start, page - 1))
+                    start = None
+            elif start is None:
+                start = page
+    if start is not None:
+        ranges.append((start, page_count))
+    # Bits past the last page are not pages
+    return [(first, min(last, page_count)) for first, last in ranges if first <= page_count]
@@ -0,0 +1,44 @@
+"""Security Utility (JWT access tokens)"""
+import time
+from typing import Any, Optional
+
+import jwt
+
+from app.core.config import settings
+
+
+def create_access_token(user_id: str, expires_minutes: Optional[int] = None) -> str:
+    """
+    Create a signed JWT access token.
+
+    Args:
+        user_id: ID of the authenticated user
+        expires_minutes: Token lifetime (default: ACCESS_TOKEN_EXPIRE_MINUTES)
+
+    Returns:
+        Encoded JWT
+    """
+    lifetime = expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    payload = {"user_id": user_id, "exp": int(time.time()) + lifetime * 60}
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_access_token(token: str) -> Optional[dict[str, Any]]:
+    """
+    Verify and decode a JWT access token.
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        Token payload, or None if the token is malformed, forged or expired
+    """
+    try:
+        return jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"require": ["exp"]},
+        )
+    except jwt.PyJWTError:
+        return None
@@ -0,0 +1,162 @@
+"""Text Encoding Detection and Normalization"""
+import codecs
+import re
+from typing import Optional
+
+# Non-ASCII bytes examined before committing to an encoding
+DETECTION_SAMPLE_SIZE = 8192
+
+# Tried in order on the sample: strict UTF-8 rarely decodes anything else by
+# accident, while GB18030 (a superset of GBK and GB2312) decodes most byte
+# strings and so comes last
+CANDIDATE_ENCODINGS = ("utf-8", "gb18030")
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_MAX_BOM = 3
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+class TextEncodingError(ValueError):
+    """Content is not text in a supported encoding"""
+
+
+def _decodes(data: bytes, encoding: str, final: bool) -> bool:
+    try:
+        text = codecs.getincrementaldecoder(encoding)("strict").decode(data, final)
+    except UnicodeDecodeError:
+        return False
+    return "\x00" not in text
+
+
+def detect_encoding(sample: bytes, final: bool = False) -> Optional[str]:
+    """
+    Detect the encoding of the start of a text file.
+
+    Args:
+        sample: First bytes of the file (may end mid-character)
+        final: Whether the sample is the whole file
+
+    Returns:
+        Codec name, or None while the sample is plain ASCII (compatible with
+        every candidate, so the decision can wait)
+
+    Raises:
+        TextEncodingError: If no supported encoding decodes the sample
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    if sample.isascii():
+        if b"\x00" in sample:
+            raise TextEncodingError("File content is binary, not text")
+        return None
+    for encoding in CANDIDATE_ENCODINGS:
+        if _decodes(sample, encoding, final):
+            return encoding
+    raise TextEncodingError("File content is not valid UTF-8 or GB18030 text")
+
+
+class TextNormalizer:
+    """
+    Transcode a text stream to canonical UTF-8 as it is read.
+
+    Leading ASCII is passed through while the encoding is undecided; the
+    encoding is then detected from the first sample_size bytes from the
+    first non-ASCII byte on, and the rest is decoded chunk by chunk, so only
+    one chunk and the sample are ever held. Output is UTF-8 without BOM and
+    with LF line endings: the same text uploaded as GBK or UTF-8, with CRLF
+    or LF, becomes the same bytes (and so the same file hash).
+    """
+
+    def __init__(self, encoding: Optional[str] = None, sample_size: int = DETECTION_SAMPLE_SIZE):
+        self.encoding = encoding
+        self.sample_size = sample_size
+        self._decoder: Optional[codecs.IncrementalDecoder] = None
+        self._pending = b""  # bytes held while the encoding is undecided
+        self._offset = 0  # source bytes consumed, for error messages
+        self._carriage_return = False  # "\r" held back from the last chunk
+
+    def _decode(self, decoder: codecs.IncrementalDecoder, data: bytes, final: bool) -> str:
+        try:
+            text: str = decoder.decode(data, final)
+        except UnicodeDecodeError as error:
+            raise TextEncodingError(
+                f"File content is not valid {self.encoding} text at byte {self._offset + error.start}"
+            )
+        if "\x00" in text:
+            raise TextEncodingError("File content is binary, not text")
+        self._offset += len(data)
+        return text
+
+    def _normalize(self, text: str, final: bool) -> bytes:
+        if self._carriage_return:
+            text = "\r" + text
+        # A chunk ending in "\r" may continue with "\n"
+        self._carriage_return = not final and text.endswith("\r")
+        if self._carriage_return:
+            text = text[:-1]
+        return text.replace("\r\n", "\n").replace("\r", "\n").encode("utf-8")
+
+    def _pass_ascii(self, final: bool) -> bytes:
+        """Emit the ASCII prefix of the pending bytes"""
+        data = self._pending
+        match = _NON_ASCII.search(data)
+        ascii_end = match.start() if match else len(data)
+        head, self._pending = data[:ascii_end], data[ascii_end:]
+        if b"\x00" in head:
+            raise TextEncodingError("File content is binary, not text")
+        self._offset += len(head)
+        return self._normalize(head.decode("ascii"), final and not self._pending)
+
+    def feed(self, chunk: bytes, final: bool = False) -> bytes:
+        """
+        Transcode the next chunk.
+
+        Args:
+            chunk: Raw bytes in the source encoding
+            final: Whether this is the last chunk
+
+        Returns:
+            Normalized UTF-8 bytes (possibly empty while detecting)
+
+        Raises:
+            TextEncodingError: If the content is not text in the detected encoding
+        """
+        if self._decoder is not None:
+            return self._normalize(self._decode(self._decoder, chunk, final), final)
+
+        self._pending += chunk
+        output = b""
+        if self.encoding is None:
+            if self._offset == 0:
+                if len(self._pending) < _MAX_BOM and not final:
+                    return b""  # wait for a possible BOM
+                self.encoding = next(
+                    (encoding for bom, encoding in _BOMS if self._pending.startswith(bom)), None
+                )
+            if self.encoding is None:
+                output = self._pass_ascii(final)
+                if not self._pending or (len(self._pending) < self.sample_size and not final):
+                    return output
+                sample = self._pending[:self.sample_size]
+                self.encoding = detect_encoding(sample, final and len(sample) == len(self._pending))
+
+        # Pending bytes start with a non-ASCII byte here, so detection has
+        # decided; the fallback only satisfies the type
+        encoding = self.encoding = self.encoding or CANDIDATE_ENCODINGS[0]
+        # utf-8-sig drops a BOM
+        codec = "utf-8-sig" if codecs.lookup(encoding).name == "utf-8" else encoding
+        decoder = self._decoder = codecs.getincrementaldecoder(codec)("strict")
+        data, self._pending = self._pending, b""
+        return output + self._normalize(self._decode(decoder, data, final), final)
+
+    def finish(self) -> bytes:
+        """Flush what is left at the end of the stream"""
+        output = self.feed(b"", final=True)
+        if self.encoding is None:
+            self.encoding = "ascii"
+        return output
@@ -0,0 +1,43 @@
+"""Text Processing Utility"""
+from app.core.config import settings
+
+
+def chunk_pages(
+    pages: list[str],
+    chunk_size: int = settings.INGESTION_CHUNK_SIZE,
+    overlap: int = settings.INGESTION_CHUNK_OVERLAP,
+) -> list[dict]:
+    """
+    Split pages into overlapping chunks for embedding and retrieval.
+
+    Chunks never cross page boundaries and prefer to end on whitespace.
+    Only character spans are returned; chunk text is pages[page - 1][start:end].
+
+    Args:
+        pages: Page texts
+        chunk_size: Target chunk size in characters
+        overlap: Characters shared between consecutive chunks of a page
+
+    Returns:
+        List of chunk spans:
+        [{"index": int, "page": int, "start": int, "end": int}, ...]
+    """
+    overlap = min(overlap, chunk_size // 2)
+    chunks: list[dict] = []
+
+    for page_number, text in enumerate(pages, start=1):
+        start = 0
+        length = len(text)
+        while start < length:
+            end = min(start + chunk_size, length)
+            if end < length:
+                space = text.rfind(" ", start + chunk_size // 2, end)
+                if space > 0:
+                    end = space
+            if text[start:end].strip():
+                chunks.append({"index": len(chunks), "page": page_number, "start": start, "end": end})
+            if end >= length:
+                break
+            start = max(end - overlap, start + 1)
+
+    return chunks
@@ -0,0 +1 @@
+"""Micro-benchmarks of storage, validation and cache hot paths"""
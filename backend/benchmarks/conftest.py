@@ -0,0 +1,109 @@
+"""
+Benchmark fixtures and reporting
+
+Run with `poetry run bench` (or `pytest benchmarks`). Results are written as
+JSON to --bench-json and compared with the baseline at --bench-baseline; a
+benchmark whose median is more than --bench-tolerance times its baseline
+fails the run. Save a baseline on the machine you compare on with
+--bench-save-baseline.
+"""
+from pathlib import Path
+
+import pytest
+
+from benchmarks.harness import (
+    DEFAULT_TOLERANCE,
+    MAX_TIME,
+    Benchmark,
+    BenchmarkStats,
+    compare,
+    format_table,
+    load_results,
+    machine_info,
+    write_results,
+)
+
+_results = pytest.StashKey[dict[str, BenchmarkStats]]()
+_report = pytest.StashKey[list[tuple[str, bool]]]()  # (line, is an error)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-json", default=".benchmarks/latest.json", help="Where to write results as JSON")
+    group.addoption(
+        "--bench-baseline", default=".benchmarks/baseline.json", help="Results to compare with (if present)"
+    )
+    group.addoption("--bench-save-baseline", action="store_true", help="Also save the results as the baseline")
+    group.addoption(
+        "--bench-tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="Fail when a median exceeds this multiple of its baseline",
+    )
+    group.addoption("--bench-max-time", type=float, default=MAX_TIME, help="Seconds spent on each benchmark")
+    group.addoption("--bench-slow", action="store_true", help="Include slow benchmarks (100k-file storage)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: slow benchmark, only run with --bench-slow")
+    config.stash[_results] = {}
+    config.stash[_report] = []
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--bench-slow"):
+        return
+    skip = pytest.mark.skip(reason="slow benchmark (run with --bench-slow)")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def benchmark(request):
+    """Time a callable; results are named after the test"""
+    name = request.node.nodeid.removeprefix("benchmarks/")
+    return Benchmark(name, request.config.stash[_results], request.config.getoption("--bench-max-time"))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = config.stash[_results]
+    if not results:
+        return
+    report = config.stash[_report]
+
+    output = Path(config.getoption("--bench-json"))
+    write_results(output, results)
+    report.append((f"Results written to {output}", False))
+
+    baseline_path = Path(config.getoption("--bench-baseline"))
+    tolerance = config.getoption("--bench-tolerance")
+    if baseline_path.exists():
+        baseline, machine = load_results(baseline_path)
+        comparisons, regressions = compare(results, baseline, tolerance)
+        report.insert(0, (format_table(comparisons, tolerance), False))
+        if machine != machine_info():
+            report.append((f"Warning: baseline measured on another machine ({machine['platform']})", False))
+        if regressions:
+            report.append((
+                f"{len(regressions)} benchmark(s) regressed by more than {tolerance}x "
+                f"against {baseline_path}: " + ", ".join(c.name for c in regressions),
+                True,
+            ))
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    else:
+        report.insert(0, (format_table(compare(results, {})[0], tolerance), False))
+        report.append((f"No baseline at {baseline_path}; nothing to compare with", False))
+
+    if config.getoption("--bench-save-baseline"):
+        write_results(baseline_path, results)
+        report.append((f"Baseline saved to {baseline_path}", False))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    report = config.stash[_report]
+    if report:
+        terminalreporter.section("benchmarks")
+        machine = machine_info()
+        terminalreporter.write_line(f"machine: {machine['platform']}, Python {machine['python']}")
+        for line, error in report:
+            terminalreporter.write_line(line, red=error, bold=error)
@@ -0,0 +1,188 @@
+"""Benchmark Timing, Results and Baseline Comparison"""
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+# Each round runs enough iterations to last at least this long, so timer
+# resolution and call overhead don't dominate fast operations
+MIN_ROUND_TIME = 0.002
+# Rounds stop after this long (or MAX_ROUNDS), whichever comes first
+MAX_TIME = 0.5
+MIN_ROUNDS = 5
+MAX_ROUNDS = 1_000
+
+# Median slowdown against the baseline that fails the run
+DEFAULT_TOLERANCE = 1.5
+
+
+@dataclass
+class BenchmarkStats:
+    """Per-iteration timings of one benchmark, in seconds"""
+
+    name: str
+    median: float
+    mean: float
+    min: float
+    max: float
+    stddev: float
+    rounds: int
+    iterations: int
+
+    @property
+    def ops(self) -> float:
+        """Operations per second at the median"""
+        return 1 / self.median if self.median else float("inf")
+
+
+def _stats(name: str, rounds: list[float], iterations: int) -> BenchmarkStats:
+    per_iteration = [r / iterations for r in rounds]
+    return BenchmarkStats(
+        name=name,
+        median=statistics.median(per_iteration),
+        mean=statistics.fmean(per_iteration),
+        min=min(per_iteration),
+        max=max(per_iteration),
+        stddev=statistics.stdev(per_iteration) if len(per_iteration) > 1 else 0.0,
+        rounds=len(per_iteration),
+        iterations=iterations,
+    )
+
+
+class Benchmark:
+    """
+    Time a callable, pytest-benchmark style.
+
+    `benchmark(fn, *args)` times a function; `await benchmark.run_async(fn,
+    *args)` times a coroutine function on the running event loop. Either
+    returns the function's last result so tests can assert on it.
+    """
+
+    def __init__(self, name: str, results: dict[str, BenchmarkStats], max_time: float = MAX_TIME):
+        self.name = name
+        self.results = results
+        self.max_time = max_time
+
+    def _record(self, rounds: list[float], iterations: int) -> None:
+        self.results[self.name] = _stats(self.name, rounds, iterations)
+
+    def __call__(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        result = fn(*args, **kwargs)  # warm-up, also calibrates the iterations
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        iterations = max(1, int(MIN_ROUND_TIME / max(time.perf_counter() - started, 1e-9)))
+
+        rounds: list[float] = []
+        deadline = time.perf_counter() + self.max_time
+        while len(rounds) < MIN_ROUNDS or (len(rounds) < MAX_ROUNDS and time.perf_counter() < deadline):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                result = fn(*args, **kwargs)
+            rounds.append(time.perf_counter() - started)
+        self._record(rounds, iterations)
+        return result
+
+    async def run_async(self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Benchmark a coroutine function (each call awaited in turn)"""
+        result = await fn(*args, **kwargs)
+        started = time.perf_counter()
+        result = await fn(*args, **kwargs)
+        iterations = max(1, int(MIN_ROUND_TIME / max(time.perf_counter() - started, 1e-9)))
+
+        rounds: list[float] = []
+        deadline = time.perf_counter() + self.max_time
+        while len(rounds) < MIN_ROUNDS or (len(rounds) < MAX_ROUNDS and time.perf_counter() < deadline):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                result = await fn(*args, **kwargs)
+            rounds.append(time.perf_counter() - started)
+        self._record(rounds, iterations)
+        return result
+
+
+def machine_info() -> dict[str, str]:
+    """Where results were measured (baselines only compare on like machines)"""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def write_results(path: Path, results: dict[str, BenchmarkStats]) -> None:
+    """Write results as JSON"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "machine": machine_info(),
+        "benchmarks": {name: asdict(stats) for name, stats in sorted(results.items())},
+    }, indent=2) + "\n")
+
+
+def load_results(path: Path) -> tuple[dict[str, BenchmarkStats], dict[str, str]]:
+    """Read results written by write_results, with the machine they came from"""
+    data = json.loads(path.read_text())
+    return {name: BenchmarkStats(**stats) for name, stats in data["benchmarks"].items()}, data["machine"]
+
+
+@dataclass
+class Comparison:
+    """One benchmark against its baseline"""
+
+    name: str
+    current: BenchmarkStats
+    baseline: Optional[BenchmarkStats]
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """Current median / baseline median (above 1 is slower)"""
+        if self.baseline is None or not self.baseline.median:
+            return None
+        return self.current.median / self.baseline.median
+
+
+def compare(
+    results: dict[str, BenchmarkStats],
+    baseline: dict[str, BenchmarkStats],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> tuple[list[Comparison], list[Comparison]]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        (all comparisons, regressions slower than tolerance x baseline)
+    """
+    comparisons = [Comparison(name, stats, baseline.get(name)) for name, stats in sorted(results.items())]
+    regressions = [c for c in comparisons if c.ratio is not None and c.ratio > tolerance]
+    return comparisons, regressions
+
+
+def _duration(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def format_table(comparisons: list[Comparison], tolerance: float) -> str:
+    """Human-readable results, with the change against the baseline"""
+    width = max((len(c.name) for c in comparisons), default=10)
+    lines = [f"{'benchmark':<{width}}  {'median':>10}  {'min':>10}  {'ops/s':>12}  {'rounds':>6}  vs baseline"]
+    for c in comparisons:
+        ratio = c.ratio
+        if ratio is None:
+            change = "(new)"
+        else:
+            change = f"{ratio:.2f}x" + ("  REGRESSION" if ratio > tolerance else "")
+        lines.append(
+            f"{c.name:<{width}}  {_duration(c.current.median):>10}  {_duration(c.current.min):>10}"
+            f"  {c.current.ops:>12,.0f}  {c.current.rounds:>6}  {change}"
+        )
+    return "\n".join(lines)
+
@@ -0,0 +1,56 @@
+"""CacheManager benchmarks against an in-memory Redis (fakeredis)"""
+import pytest
+
+from app.core.cache import CacheManager
+
+DOCUMENT = {
+    "id": "doc_1",
+    "title": "A Book",
+    "status": "completed",
+    "pages": [{"page": page, "summary": "x" * 200} for page in range(20)],
+}
+
+
+@pytest.fixture
+async def cache():
+    fakeredis = pytest.importorskip("fakeredis")
+
+    manager = CacheManager()
+    manager._redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    await manager.set("bench:key", "value")
+    await manager.set_json("bench:json", DOCUMENT)
+    await manager.set_many({f"bench:many:{i}": str(i) for i in range(100)})
+    yield manager
+    await manager.close()
+
+
+async def test_get(benchmark, cache):
+    assert await benchmark.run_async(cache.get, "bench:key") == "value"
+
+
+async def test_set(benchmark, cache):
+    assert await benchmark.run_async(cache.set, "bench:key", "value", 60)
+
+
+async def test_get_json(benchmark, cache):
+    assert await benchmark.run_async(cache.get_json, "bench:json") == DOCUMENT
+
+
+async def test_set_json(benchmark, cache):
+    assert await benchmark.run_async(cache.set_json, "bench:json", DOCUMENT, 60)
+
+
+async def test_get_many_100(benchmark, cache):
+    keys = [f"bench:many:{i}" for i in range(100)]
+    values = await benchmark.run_async(cache.get_many, keys)
+    assert values["bench:many:99"] == "99"
+
+
+async def test_set_many_100(benchmark, cache):
+    mapping = {f"bench:many:{i}": str(i) for i in range(100)}
+    await benchmark.run_async(cache.set_many, mapping, 60)
+    assert await cache.get("bench:many:0") == "0"
+
+
+async def test_increment(benchmark, cache):
+    assert await benchmark.run_async(cache.increment, "bench:counter") > 0
@@ -0,0 +1,85 @@
+"""FileStorage benchmarks on populated stores"""
+import io
+import itertools
+import os
+
+import pytest
+from fastapi import UploadFile
+
+from app.utils.file_storage import FileStorage
+from app.utils.text_encoding import TextNormalizer
+
+STORED_FILE_SIZE = 1024
+
+
+def _populate(storage: FileStorage, count: int) -> list[str]:
+    """Write count files across the 256 shards; returns their hashes"""
+    hashes = [f"{i:064x}"[::-1] for i in range(count)]  # spread over shards
+    payload = b"x" * STORED_FILE_SIZE
+    for file_hash in hashes:
+        path = storage.base_path / file_hash[:2] / f"{file_hash}.pdf"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+    return hashes
+
+
+@pytest.fixture(
+    scope="module",
+    params=[1_000, pytest.param(100_000, marks=pytest.mark.slow)],
+    ids=["1k", "100k"],
+)
+def populated(request, tmp_path_factory):
+    storage = FileStorage(str(tmp_path_factory.mktemp("uploads")))
+    return storage, _populate(storage, request.param)
+
+
+def test_get_file_path_with_extension(benchmark, populated):
+    storage, hashes = populated
+    lookups = itertools.cycle(hashes[::7])
+    path = benchmark(lambda: storage.get_file_path(next(lookups), ".pdf"))
+    assert path.suffix == ".pdf"
+
+
+def test_get_file_path_search(benchmark, populated):
+    storage, hashes = populated
+    lookups = itertools.cycle(hashes[::7])
+    path = benchmark(lambda: storage.get_file_path(next(lookups)))
+    assert path.suffix == ".pdf"
+
+
+def test_get_storage_stats(benchmark, populated):
+    storage, hashes = populated
+    stats = benchmark(storage.get_storage_stats)
+    assert stats["total_files"] == len(hashes)
+
+
+@pytest.fixture
+def empty_storage(tmp_path):
+    return FileStorage(str(tmp_path / "uploads"))
+
+
+async def test_save_binary_file(benchmark, empty_storage):
+    # Unique content per call, so every save is written rather than deduplicated
+    counter = itertools.count()
+    payload = os.urandom(256 * 1024)
+
+    async def save():
+        content = next(counter).to_bytes(8, "big") + payload
+        return await empty_storage.save_file(UploadFile(io.BytesIO(content), filename="doc.pdf"))
+
+    info = await benchmark.run_async(save)
+    assert info["file_size"] == len(payload) + 8
+
+
+async def test_save_text_file_normalized(benchmark, empty_storage):
+    counter = itertools.count()
+    payload = ("第一章 开始\r\n" * 40_000).encode("gb18030")  # ~0.6MB of GBK text
+
+    async def save():
+        content = f"{next(counter)}\r\n".encode() + payload
+        return await empty_storage.save_file(
+            UploadFile(io.BytesIO(content), filename="book.txt"), normalizer=TextNormalizer()
+        )
+
+    info = await benchmark.run_async(save)
+    assert info["encoding"] == "gb18030"
@@ -0,0 +1,47 @@
+"""validate_file benchmarks across formats and sizes"""
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi import UploadFile
+
+from app.utils.file_validation import validate_file
+
+SIZES = {"1KB": 1024, "1MB": 1024 * 1024, "20MB": 20 * 1024 * 1024}
+
+
+def _pdf(size: int) -> bytes:
+    return b"%PDF-1.7\n" + os.urandom(size)
+
+
+def _text(size: int) -> bytes:
+    line = "Chapter one. 第一章。\n".encode()
+    return line * (size // len(line) + 1)
+
+
+def _epub(size: int) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        archive.writestr("META-INF/container.xml", "<container/>")
+        # Many chapters: the sniffer reads one central directory entry each
+        for chapter in range(max(1, size // (64 * 1024))):
+            archive.writestr(f"OEBPS/ch{chapter}.xhtml", os.urandom(64 * 1024), zipfile.ZIP_STORED)
+    return buffer.getvalue()
+
+
+FORMATS = {".pdf": _pdf, ".txt": _text, ".epub": _epub}
+
+
+@pytest.mark.parametrize("size", SIZES, ids=list(SIZES))
+@pytest.mark.parametrize("extension", FORMATS, ids=[e.lstrip(".") for e in FORMATS])
+async def test_validate_file(benchmark, extension, size):
+    content = FORMATS[extension](SIZES[size])
+    upload = UploadFile(io.BytesIO(content), filename=f"document{extension}")
+
+    async def validate():
+        return await validate_file(upload)
+
+    info = await benchmark.run_async(validate)
+    assert info["size"] == len(content)
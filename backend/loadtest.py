@@ -0,0 +1,651 @@
+"""
+End-to-end load test with simulated reading sessions
+
+Starts the API in a child process on a local database (SQLite by default,
+or Postgres) and a local Redis, with the LLM replaced by a stub of
+configurable latency and token rate, then runs concurrent simulated
+readers against it over HTTP. Each reader uploads a book, polls until it is
+processed, and then reads: page reads, progress updates, annotation
+writes and chat questions, with think time in between. Reports throughput
+and p50/p95/p99 latency per operation.
+
+Usage:
+    poetry run loadtest --users 50 --duration 120
+    poetry run loadtest --database-url postgresql+asyncpg://localhost/readpilot_load \\
+        --llm-latency 1.5 --llm-tokens-per-second 40 --json load.json
+
+Redis data is written to --redis-url (database 15 by default); point it at
+a Redis you don't mind filling.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+# Environment variables configuring the LLM stub in the server process
+LLM_LATENCY_ENV = "LOADTEST_LLM_LATENCY"
+LLM_TOKENS_PER_SECOND_ENV = "LOADTEST_LLM_TOKENS_PER_SECOND"
+LLM_ANSWER_TOKENS_ENV = "LOADTEST_LLM_ANSWER_TOKENS"
+
+# Relative frequency of reader actions once a document is processed
+ACTION_WEIGHTS = {
+    "read_pages": 45,
+    "progress": 25,
+    "open_document": 8,
+    "annotate": 10,
+    "chat": 7,
+    "chat_history": 5,
+}
+
+# Asked with repeats across readers, as real questions are, so the answer
+# cache sees a realistic mix of hits and misses
+QUESTIONS = [
+    "What is the main argument of this chapter?",
+    "Summarize this page in two sentences.",
+    "What does the author mean by the second principle?",
+    "How does this section relate to the introduction?",
+    "What evidence supports this conclusion?",
+    "Explain the key term defined on this page.",
+    "What are the counterarguments mentioned here?",
+    "Which examples illustrate the main idea?",
+]
+
+_WORDS = (
+    "reading attention memory argument evidence chapter principle system "
+    "model theory practice history language method result question answer "
+    "structure meaning context example detail summary insight"
+).split()
+
+
+class StubLLM:
+    """
+    Local stand-in for the LLM provider.
+
+    A completion takes latency seconds (time to first token) plus one
+    token's worth of time per generated token, so the cost of long answers
+    and slow providers can be dialed in without calling anyone.
+    """
+
+    def __init__(self, latency: float = 0.5, tokens_per_second: float = 50.0, answer_tokens: int = 150):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.answer_tokens = answer_tokens
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls) -> "StubLLM":
+        return cls(
+            latency=float(os.environ.get(LLM_LATENCY_ENV, 0.5)),
+            tokens_per_second=float(os.environ.get(LLM_TOKENS_PER_SECOND_ENV, 50.0)),
+            answer_tokens=int(os.environ.get(LLM_ANSWER_TOKENS_ENV, 150)),
+        )
+
+    def duration(self, tokens: int) -> float:
+        """Seconds a completion of this many tokens takes"""
+        return self.latency + (tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0)
+
+    async def complete(self, prompt: str) -> str:
+        """Return answer_tokens words after the simulated generation time"""
+        self.calls += 1
+        await asyncio.sleep(self.duration(self.answer_tokens))
+        seed = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:8], "big")
+        rng = random.Random(seed)
+        return " ".join(rng.choice(_WORDS) for _ in range(self.answer_tokens))
+
+    async def embed(self, text: str) -> list[float]:
+        """Deterministic 64-dimension embedding of the normalized text"""
+        digest = hashlib.sha512(" ".join(text.lower().split()).encode("utf-8")).digest()
+        return [byte / 255 - 0.5 for byte in digest]
+
+
+# ---------------------------------------------------------------------------
+# Server side (runs in the child process started by the harness)
+# ---------------------------------------------------------------------------
+
+def create_app():
+    """
+    Build the API app for a load test (uvicorn --factory).
+
+    Ingestion runs in-process with the stub LLM as the summarizer, and
+    POST /loadtest/chat answers questions through the Q&A path (answer cache,
+    context builder, LLM scheduler, chat history).
+    """
+    from fastapi import APIRouter, Depends
+    from pydantic import BaseModel, Field
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.api.deps import get_current_user
+    from app.api.v1.documents import get_owned_document
+    from app.core.ai.context_builder import ContextBuilder, ContextChunk
+    from app.core.ai.qa_cache import SemanticAnswerCache
+    from app.core.ai.scheduler import Priority, llm_scheduler, prompt_key
+    from app.core.ai.summarizer import HierarchicalSummarizer
+    from app.core.cache import CacheManager, cache_manager, get_cache
+    from app.core.config import settings
+    from app.db.session import get_db
+    from app.main import app
+    from app.models import ChatMessage, Document, User
+    from app.services.chat_service import list_chat_history
+    from app.tasks.pipeline import IngestionPipeline
+    from app.tasks.runner import job_runner
+    from app.utils.ids import generate_id
+
+    llm = StubLLM.from_env()
+    job_runner.pipeline = IngestionPipeline(
+        job_runner.session_maker,
+        cache=cache_manager,
+        summarizer=HierarchicalSummarizer(llm.complete, cache_manager),
+    )
+    context_builder = ContextBuilder()
+
+    class ChatQuestion(BaseModel):
+        document_id: str
+        question: str = Field(min_length=1)
+        page: int = Field(default=1, ge=1)
+
+    router = APIRouter()
+
+    @router.post("/chat")
+    async def ask(
+        request: ChatQuestion,
+        user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db),
+        cache: CacheManager = Depends(get_cache),
+    ):
+        """Answer a question about the pages around the reader's position"""
+        await get_owned_document(db, request.document_id, user)
+        file_hash, parse_version, content = (await db.execute(
+            select(Document.file_hash, Document.parse_version, Document.parsed_content)
+            .where(Document.id == request.document_id)
+        )).one()
+        pages = (content or {}).get("pages") or []
+        history = (await list_chat_history(db, request.document_id, user.id, limit=10)).items
+
+        async def compute() -> tuple[str, list[dict]]:
+            # No vector store here: chunks near the reader's page stand in
+            # for retrieval, scored by word overlap with the question
+            words = set(request.question.lower().split())
+            chunks = []
+            for span in (content or {}).get("chunks") or []:
+                distance = abs(span["page"] - request.page)
+                if distance > 1:
+                    continue
+                text = pages[span["page"] - 1][span["start"]:span["end"]]
+                overlap = len(words & set(text.lower().split()))
+                chunks.append(ContextChunk(
+                    id=f"chunk_{span['index']}", text=text, score=overlap + 1 / (1 + distance),
+                    page=span["page"], start=span["start"], end=span["end"],
+                ))
+            context = context_builder.build(request.question, chunks, list(reversed(history)))
+            prompt = f"{context.render_sources()}\n\nQuestion: {request.question}\nAnswer:"
+            answer = await llm_scheduler.submit(
+                lambda: llm.complete(prompt),
+                priority=Priority.INTERACTIVE,
+                estimated_tokens=context.tokens_used + llm.answer_tokens,
+                coalesce_key=prompt_key(settings.LLM_MODEL, prompt),
+            )
+            sources = [{"page": c.page, "start": c.start, "end": c.end} for c in context.chunks]
+            return answer, sources
+
+        qa_cache = SemanticAnswerCache(cache, llm.embed)
+        answer, cache_hit = await qa_cache.get_or_compute(
+            file_hash, parse_version or 0, request.question, compute
+        )
+
+        question = ChatMessage(
+            id=generate_id("msg"), user_id=user.id, document_id=request.document_id,
+            role="user", content=request.question,
+        )
+        db.add(question)
+        db.add(ChatMessage(
+            id=generate_id("msg"), user_id=user.id, document_id=request.document_id,
+            role="assistant", content=answer.answer, sources=answer.sources, parent_id=question.id,
+        ))
+        await db.commit()
+        return {"answer": answer.answer, "sources": answer.sources, "cache_hit": cache_hit}
+
+    app.include_router(router, prefix="/loadtest", tags=["loadtest"])
+    return app
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100) of sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class OperationStats:
+    """Latencies (seconds) and failures of one operation"""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    def summary(self, duration: float) -> dict[str, Any]:
+        """Counts, throughput and latency percentiles (milliseconds)"""
+        values = sorted(self.latencies)
+        return {
+            "count": len(values),
+            "errors": self.errors,
+            "throughput": len(values) / duration if duration else 0.0,
+            "mean_ms": statistics.fmean(values) * 1000 if values else 0.0,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000 if values else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+class Recorder:
+    """Per-operation results of a run"""
+
+    def __init__(self):
+        self.operations: dict[str, OperationStats] = defaultdict(OperationStats)
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, operation: str, latency: float, status: Optional[int] = None, ok: bool = True) -> None:
+        stats = self.operations[operation]
+        if ok:
+            stats.latencies.append(latency)
+        else:
+            stats.errors += 1
+        if status is not None:
+            stats.statuses[status] += 1
+
+    def report(self) -> dict[str, Any]:
+        duration = (self.finished or time.perf_counter()) - self.started
+        operations = {name: stats.summary(duration) for name, stats in sorted(self.operations.items())}
+        requests = sum(stats["count"] + stats["errors"] for name, stats in operations.items() if name != "processing")
+        return {
+            "duration": duration,
+            "requests": requests,
+            "throughput": requests / duration if duration else 0.0,
+            "operations": operations,
+        }
+
+
+def format_report(report: dict[str, Any], config: dict[str, Any]) -> str:
+    """Render a report as a table"""
+    lines = [
+        f"{config['users']} readers for {report['duration']:.0f}s on {config['database']}, "
+        f"LLM stub {config['llm_latency']}s + {config['llm_answer_tokens']} tokens "
+        f"at {config['llm_tokens_per_second']}/s",
+        "",
+        f"{'operation':<14} {'count':>7} {'errors':>6} {'ops/s':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    for name, stats in report["operations"].items():
+        lines.append(
+            f"{name:<14} {stats['count']:>7} {stats['errors']:>6} {stats['throughput']:>8.2f} "
+            f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}"
+        )
+    lines.append("")
+    lines.append(f"total: {report['requests']} requests, {report['throughput']:.1f} requests/s")
+    lines.append("(processing = upload accepted -> status completed, not an HTTP request)")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Simulated readers
+# ---------------------------------------------------------------------------
+
+def make_book(reader: int, run_id: str, chapters: int, rng: random.Random) -> bytes:
+    """Markdown book unique to a reader (so uploads are not deduplicated)"""
+    parts = [f"# Load Test Book {reader}\n\n<!-- run {run_id} reader {reader} -->\n"]
+    for chapter in range(1, chapters + 1):
+        parts.append(f"\n## Chapter {chapter}\n")
+        for section in range(1, 4):
+            parts.append(f"\n### Section {chapter}.{section}\n\n")
+            for _ in range(6):
+                sentence = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(12, 24)))
+                parts.append(sentence.capitalize() + ". ")
+            parts.append("\n")
+    return "".join(parts).encode("utf-8")
+
+
+class Reader:
+    """One simulated reader: upload, wait for processing, then read until the deadline"""
+
+    def __init__(
+        self,
+        index: int,
+        client: httpx.AsyncClient,
+        token: str,
+        recorder: Recorder,
+        options: argparse.Namespace,
+        run_id: str,
+        deadline: float,
+    ):
+        self.index = index
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.recorder = recorder
+        self.options = options
+        self.run_id = run_id
+        self.deadline = deadline
+        self.rng = random.Random(f"{options.seed}-{index}")
+        self.document_id: Optional[str] = None
+        self.page_count = 1
+        self.page = 1
+        self.session_id: Optional[str] = None
+        self.annotations: list[str] = []
+
+    async def request(self, operation: str, method: str, url: str, **kwargs: Any) -> Optional[httpx.Response]:
+        """Send a request, recording its latency (or its failure) under operation"""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(operation, time.perf_counter() - started, ok=False)
+            return None
+        ok = response.status_code < 400
+        self.recorder.record(operation, time.perf_counter() - started, response.status_code, ok)
+        return response if ok else None
+
+    async def think(self) -> None:
+        if self.options.think_time > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.options.think_time))
+
+    async def upload(self) -> bool:
+        content = make_book(self.index, self.run_id, self.options.chapters, self.rng)
+        response = await self.request(
+            "upload", "POST", "/api/v1/documents",
+            files={"file": (f"book-{self.index}.md", content, "text/markdown")},
+        )
+        if response is None:
+            return False
+        self.document_id = response.json()["document_id"]
+        accepted = time.perf_counter()
+
+        while time.perf_counter() < self.deadline:
+            await asyncio.sleep(self.options.poll_interval)
+            response = await self.request("poll_status", "GET", f"/api/v1/documents/{self.document_id}/status")
+            if response is None:
+                continue
+            status = response.json()
+            if status["status"] == "completed":
+                self.recorder.record("processing", time.perf_counter() - accepted)
+                self.page_count = max(1, status["page_count"] or 1)
+                return True
+            if status["status"] == "failed":
+                self.recorder.record("processing", time.perf_counter() - accepted, ok=False)
+                return False
+        return False
+
+    async def read_pages(self) -> None:
+        limit = 5
+        start = max(1, min(self.page, self.page_count - limit + 1))
+        await self.request(
+            "read_pages", "GET", f"/api/v1/documents/{self.document_id}/pages",
+            params={"start": start, "limit": limit},
+        )
+
+    async def progress(self) -> None:
+        # Mostly forward, sometimes back
+        self.page = max(1, min(self.page_count, self.page + self.rng.choice((1, 1, 1, 2, -1))))
+        await self.request("progress", "POST", "/api/v1/reading/progress", json={
+            "document_id": self.document_id,
+            "current_page": self.page,
+            "scroll_position": round(self.rng.random(), 3),
+            "session_id": self.session_id,
+            "pages": [self.page],
+        })
+
+    async def open_document(self) -> None:
+        await self.request("open_document", "GET", f"/api/v1/documents/{self.document_id}")
+
+    async def annotate(self) -> None:
+        if self.annotations and self.rng.random() < 0.3:
+            await self.request(
+                "annotate", "PATCH", f"/api/v1/annotations/{self.rng.choice(self.annotations)}",
+                json={"color": self.rng.choice(("yellow", "red", "green", "blue"))},
+            )
+            return
+        response = await self.request("annotate", "POST", "/api/v1/annotations", json={
+            "document_id": self.document_id,
+            "type": self.rng.choice(("highlight", "note", "important")),
+            "position": {"page": self.page, "start": self.rng.randint(0, 1000)},
+            "selected_text": " ".join(self.rng.choice(_WORDS) for _ in range(6)),
+            "note_content": "Load test note",
+        })
+        if response is not None:
+            self.annotations.append(response.json()["id"])
+
+    async def chat(self) -> None:
+        await self.request("chat", "POST", "/loadtest/chat", json={
+            "document_id": self.document_id,
+            "question": self.rng.choice(QUESTIONS),
+            "page": self.page,
+        }, timeout=self.options.chat_timeout)
+
+    async def chat_history(self) -> None:
+        await self.request(
+            "chat_history", "GET", "/api/v1/chat/history",
+            params={"document_id": self.document_id, "limit": 20},
+        )
+
+    async def run(self) -> None:
+        if not await self.upload():
+            return
+        response = await self.request(
+            "session_start", "POST", "/api/v1/reading/sessions", json={"document_id": self.document_id}
+        )
+        self.session_id = response.json()["id"] if response is not None else None
+
+        actions = list(ACTION_WEIGHTS)
+        weights = list(ACTION_WEIGHTS.values())
+        while time.perf_counter() < self.deadline:
+            action = self.rng.choices(actions, weights)[0]
+            await getattr(self, action)()
+            await self.think()
+
+        if self.session_id:
+            await self.request("session_end", "POST", f"/api/v1/reading/sessions/{self.session_id}/end")
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def prepare_database(database_url: str, users: int) -> list[str]:
+    """Create the tables and the readers' accounts; returns their user IDs"""
+    from sqlalchemy import delete, insert
+
+    from app.db.base import Base
+    from app.db.session import create_engine
+    from app.models import User
+
+    user_ids = [f"loadtest_{i}" for i in range(users)]
+    engine = create_engine(database_url, pool_name="loadtest")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(delete(User).where(User.id.in_(user_ids)))
+            await conn.execute(insert(User), [
+                {
+                    "id": user_id, "email": f"{user_id}@loadtest.local", "username": user_id,
+                    "hashed_password": "!", "is_active": True,
+                }
+                for user_id in user_ids
+            ])
+    finally:
+        await engine.dispose()
+    return user_ids
+
+
+async def check_redis(redis_url: str) -> None:
+    import redis.asyncio as redis
+
+    client = redis.from_url(redis_url)
+    try:
+        await client.ping()
+    finally:
+        await client.aclose()
+
+
+def start_server(options: argparse.Namespace, port: int, log_path: Path) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": options.database_url,
+        "REDIS_URL": options.redis_url,
+        "UPLOAD_DIR": str(options.workdir / "documents"),
+        "TASK_BACKEND": "inprocess",
+        "DB_CREATE_TABLES": "false",
+        LLM_LATENCY_ENV: str(options.llm_latency),
+        LLM_TOKENS_PER_SECOND_ENV: str(options.llm_tokens_per_second),
+        LLM_ANSWER_TOKENS_ENV: str(options.llm_answer_tokens),
+    }
+    command = [
+        sys.executable, "-m", "uvicorn", "loadtest:create_app", "--factory",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(options.server_workers), "--log-level", "warning",
+    ]
+    log = log_path.open("w")
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+async def wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError(f"Server not ready after {timeout:.0f}s")
+
+
+async def run(options: argparse.Namespace) -> dict[str, Any]:
+    from app.utils.security import create_access_token
+
+    await check_redis(options.redis_url)
+    user_ids = await prepare_database(options.database_url, options.users)
+
+    port = options.port or _free_port()
+    log_path = options.workdir / "server.log"
+    server = start_server(options, port, log_path)
+    limits = httpx.Limits(max_connections=options.users + 10, max_keepalive_connections=options.users + 10)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=options.timeout
+        ) as client:
+            await wait_until_ready(client, server, options.startup_timeout)
+            print(f"Server ready on port {port} (log: {log_path}); running {options.users} readers "
+                  f"for {options.duration:.0f}s")
+
+            recorder = Recorder()
+            deadline = time.perf_counter() + options.duration
+            run_id = f"{time.time():.0f}"
+            readers = [
+                Reader(index, client, create_access_token(user_id), recorder, options, run_id, deadline)
+                for index, user_id in enumerate(user_ids)
+            ]
+
+            async def start(reader: Reader) -> None:
+                # Readers arrive spread over the ramp-up period
+                await asyncio.sleep(options.ramp_up * reader.index / max(1, options.users))
+                await reader.run()
+
+            await asyncio.gather(*(start(reader) for reader in readers))
+            recorder.finished = time.perf_counter()
+            return recorder.report()
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the API with simulated reading sessions")
+    parser.add_argument("--users", type=int, default=20, help="concurrent readers")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of load")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="seconds over which readers arrive")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean seconds between a reader's actions")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="seconds between status polls")
+    parser.add_argument("--chapters", type=int, default=8, help="chapters per uploaded book")
+    parser.add_argument("--database-url", help="default: SQLite file in --workdir")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--workdir", type=Path, help="uploads, database and server log (default: temp dir)")
+    parser.add_argument("--port", type=int, default=0, help="server port (default: any free port)")
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="stub LLM seconds to first token")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=50.0, help="stub LLM generation rate")
+    parser.add_argument("--llm-answer-tokens", type=int, default=150, help="tokens per stub completion")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTP timeout in seconds")
+    parser.add_argument("--chat-timeout", type=float, default=120.0, help="HTTP timeout of chat questions")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    options = parser.parse_args(argv)
+
+    options.workdir = (options.workdir or Path(tempfile.mkdtemp(prefix="readpilot-load-"))).resolve()
+    options.workdir.mkdir(parents=True, exist_ok=True)
+    if options.database_url is None:
+        options.database_url = f"sqlite+aiosqlite:///{options.workdir / 'loadtest.db'}"
+    return options
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Entry point (poetry run loadtest)"""
+    options = parse_args(argv)
+    report = asyncio.run(run(options))
+    config = {
+        "users": options.users,
+        "duration": options.duration,
+        "think_time": options.think_time,
+        "database": re.sub(r"//[^@/]*@", "//", options.database_url),  # drop credentials
+        "server_workers": options.server_workers,
+        "llm_latency": options.llm_latency,
+        "llm_tokens_per_second": options.llm_tokens_per_second,
+        "llm_answer_tokens": options.llm_answer_tokens,
+    }
+    print()
+    print(format_report(report, config))
+    if options.json:
+        options.json.write_text(json.dumps({"config": config, **report}, indent=2) + "\n")
+        print(f"Report written to {options.json}")
+    if not any(stats["count"] for stats in report["operations"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
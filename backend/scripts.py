@@ -3,7 +3,10 @@ Scripts for Poetry command shortcuts
 使用方法:
     poetry run dev      # 开发模式 (热重载)
     poetry run prod     # 生产模式
+    poetry run worker   # 文档处理 Worker
     poetry run test     # 运行测试
+    poetry run bench    # 运行性能基准测试
+    poetry run loadtest # 端到端压测 (见 loadtest.py)
     poetry run lint     # 代码检查
     poetry run format   # 代码格式化
 """
@@ -31,11 +34,27 @@ def prod():
     ])
 
 
+def worker():
+    """启动文档处理 Worker (Celery)"""
+    subprocess.run([
+        "celery", "-A", "app.tasks.celery_app",
+        "worker",
+        "-Q", "ingestion",
+        "--loglevel", "info"
+    ])
+
+
 def test():
     """运行测试"""
     subprocess.run(["pytest", "app/tests/", "-v"])
 
 
+def bench():
+    """运行性能基准测试 (与基线对比, 性能回退时失败)"""
+    result = subprocess.run(["pytest", "benchmarks/", "-q", "-p", "no:warnings", *sys.argv[1:]])
+    sys.exit(result.returncode)
+
+
 def lint():
     """代码检查"""
     print("🔍 Running Ruff linter...")